@@ -1,31 +1,78 @@
-import json
 import uuid
-import email
+import random
+import logging
 import datetime
 from uuid import UUID
-from typing import Union
+from itertools import groupby
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Union, Dict, List, Tuple
 
 import pandas
-import pandas as pd
 from django.conf import settings
-from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.db import transaction, connection, IntegrityError
+from django.db.models.query import QuerySet, RawQuerySet
+from django.db.models.functions import Cast
+from django.db.models import F, Q, Exists, OuterRef, Case, When, Value, FloatField
 
 from utils.django.regex import validate_email_by_regex
 from utils.data_manipulation.encryption import SecretEncryption
+from embermail.domain.users.models import EmailOutboxData
+from embermail.domain.templates.models import WARMUP_EMAIL_NAME_PLACEHOLDER, DOMAIN_EMAIL_NAME_PLACEHOLDER
 from embermail.application.users.services import UserAppServices
+from embermail.infrastructure.logger.models import AttributeLogger
+from embermail.infrastructure.logger.records import read_records, read_new_records, compact_closed_record_files
+from embermail.application.templates.services import TemplateAppServices
 from utils.data_manipulation.type_conversion import encode_by_base64
-from embermail.infrastructure.mailer_sevices.services import sendgrid_mail
-from embermail.domain.text_choices import CampaignActionRequiredChoices
-from embermail.infrastructure.mailer_sevices.smtp.services import SMTPServices
+from embermail.domain.text_choices import CampaignActionRequiredChoices, WarmupSendStatusChoices, \
+    WarmupSendDirectionChoices
+from embermail.infrastructure.mailer_sevices.smtp.services import SMTPServices, AsyncSMTPSendWorker
 from embermail.infrastructure.mailer_sevices.imap.services import IMAPServices
 from embermail.domain.campaigns.models import Campaign, CampaignData, CampaignType, CampaignReport, CampaignReportData, \
-    DomainList, DomainListData
+    DomainList, DomainListData, WarmupSend, WarmupSendData, SendLedgerData, RecordLogCheckpointData, \
+    MailboxCheckpointData
 from embermail.domain.campaigns.services import CampaignServices, CampaignTypeServices, CampaignReportServices, \
-    DomainListServices
+    DomainListServices, WarmupSendServices, SendLedgerServices, RecordLogCheckpointServices, \
+    MailboxCheckpointServices
 from utils.django.exceptions import CampaignDataValidation, CampaignDoesNotExist, InvalidCredentialsException, \
     ValidationException, \
     CampaignAlreadyExist, CampaignCreationException, CampaignTypeDoesNotExist, \
-    ActionRequiredException, CampaignReportDoesNotExist, DomainListDoesNotExist, DomainEmailCreationException
+    ActionRequiredException, CampaignReportDoesNotExist, DomainListDoesNotExist, DomainEmailCreationException, \
+    WarmupSendDoesNotExist, CampaignReportRefreshException, MailPlacementScanException, ThreadDoesNotExist
+
+record_log = AttributeLogger(logging.getLogger("record_logger"))
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WarmupTemplate:
+    """
+    Template of a WarmupCorpus with the (ID, updated_at) of its Threads in Order, Bodies are Read by the Send Worker
+    """
+    id: UUID
+    subject: str
+    threads: Tuple[Tuple[UUID, datetime.datetime], ...]
+
+    @property
+    def total_threads(self) -> int:
+        return len(self.threads)
+
+
+@dataclass(frozen=True)
+class WarmupCorpus:
+    """
+    Run-scoped Snapshot of Active Receivers and Templates shared by every Campaign Planned in a Run
+    """
+    receivers: Tuple[dict, ...]
+    general_templates: Tuple[WarmupTemplate, ...]
+    templates_by_warmup_email: Dict[str, Tuple[WarmupTemplate, ...]]
+
+    def get_templates_by_warmup_email(self, warmup_email: str) -> Tuple[WarmupTemplate, ...]:
+        """
+        Templates of the Warmup Email, General Templates if it has none
+        """
+        return self.templates_by_warmup_email.get(warmup_email) or self.general_templates
 
 
 class CampaignAppServices:
@@ -33,6 +80,10 @@ class CampaignAppServices:
     campaign_type_services = CampaignTypeServices()
     campaign_report_services = CampaignReportServices()
     domain_list_services = DomainListServices()
+    warmup_send_services = WarmupSendServices()
+    send_ledger_services = SendLedgerServices()
+    record_log_checkpoint_services = RecordLogCheckpointServices()
+    mailbox_checkpoint_services = MailboxCheckpointServices()
 
     # =====================================================================================
     # CAMPAIGN
@@ -114,9 +165,37 @@ class CampaignAppServices:
         """
         app_password = None
         if encrypted_app_password:
-            app_password = SecretEncryption().decrypt_secret_string(encrypted_string=encrypted_app_password)
+            app_password = SecretEncryption().decrypt_many(encrypted_strings=[encrypted_app_password])[0]
         return app_password
 
+    def decrypt_app_passwords(self, queryset: QuerySet[Union[Campaign, DomainList]],
+                              max_workers: int = None) -> Dict[UUID, Union[str, None]]:
+        """
+        Decrypt App Passwords of Campaigns or Domain Lists in one pass and Returns Mapping of ID to App Password
+        """
+        encrypted_app_passwords = list(queryset.values_list('id', 'app_password'))
+        app_passwords = SecretEncryption().decrypt_many(
+            encrypted_strings=[app_password for _, app_password in encrypted_app_passwords], max_workers=max_workers)
+        return {id: app_password for (id, _), app_password in zip(encrypted_app_passwords, app_passwords)}
+
+    def rotate_app_passwords(self) -> int:
+        """
+        Re-encrypt App Passwords of Campaigns and Domain Lists with the current Passcode
+        """
+        secret_encryption = SecretEncryption()
+        repos = [self.campaign_services.get_campaign_repo(), self.domain_list_services.get_domain_list_repo()]
+        total_rotated_app_passwords = 0
+        with transaction.atomic():
+            for repo in repos:
+                instances = list(repo.exclude(app_password__isnull=True).exclude(app_password="").only('id',
+                                                                                                    'app_password'))
+                for instance in instances:
+                    instance.app_password = secret_encryption.rotate_secret_string(
+                        encrypted_string=instance.app_password)
+                repo.bulk_update(instances, ['app_password'], batch_size=500)
+                total_rotated_app_passwords += len(instances)
+        return total_rotated_app_passwords
+
     def check_validation_of_email_and_app_password(self, email_provider: str, email: str, app_password: str) -> bool:
         """
         Check Email Provider, Email and App Password Validation by Authenticating SMTP Login
@@ -239,8 +318,9 @@ class CampaignAppServices:
                 'master_user_username': master_user_username,
                 'invitation_link': invitation_link
             }
-            sendgrid_mail(to_email=warmup_email, TEMPLATE_KEY=sendgrid_invitation_link_template_id,
-                          dynamic_data_for_template=template_data)
+            UserAppServices().enqueue_email(to_email=warmup_email, template_id=sendgrid_invitation_link_template_id,
+                                            dynamic_template_data=template_data,
+                                            idempotency_key=f"invitation:{encoded_invitation_token}")
         except Exception as e:
             raise e
 
@@ -336,6 +416,13 @@ class CampaignAppServices:
         except Exception as e:
             raise e
 
+    def list_user_first_names_by_warmup_emails(self, warmup_emails: List[str]) -> Dict[str, str]:
+        """
+        Get Users' FirstNames by Warmup Emails of Campaigns in one Query, Users without a FirstName are Skipped
+        """
+        return dict(UserAppServices().list_users().filter(email__in=warmup_emails).exclude(
+            first_name__isnull=True).exclude(first_name="").values_list('email', 'first_name'))
+
     # =====================================================================================
     # CAMPAIGN TYPES
     # =====================================================================================
@@ -431,207 +518,331 @@ class CampaignAppServices:
                                                                     campaign_id=campaign_id).exists()
         return campaign_report_exist
 
-    def read_record_file_to_list_of_dict(self, file_date: str) -> pandas.DataFrame:
-        """
-        Read Record Log File and Convert it to a List of Dicts
-        """
-        data_list = list()
-        with open(f'logs/records/{file_date}_records.log') as file:
-            log_datas = file.readlines()
-            for data_line in log_datas:
-                log_data = json.loads(data_line)
-                data_dict = dict()
-                data_dict['sender_name'] = log_data.get('sender').get("name")
-                data_dict['sender_email'] = log_data.get('sender').get("email")
-                data_dict['sender_email_provider'] = log_data.get('sender').get("email_provider")
-                data_dict['sender_send_max_emails_per_day'] = log_data.get('sender').get("send_max_emails_per_day")
-                data_dict['sender_total_sent_mails'] = log_data.get('sender').get("total_number_of_sent_mails")
-                data_dict['receiver_name'] = log_data.get('receiver').get("name")
-                data_dict['receiver_email'] = log_data.get('receiver').get("email")
-                data_dict['receiver_email_provider'] = log_data.get('receiver').get("email_provider")
-                data_dict['mail_sent_status'] = log_data.get("mail_sent_status")
-                data_dict['subject'] = log_data.get("template_subject")
-                data_dict['message_id'] = log_data.get("message_id")
-                data_dict['thread_number'] = log_data.get("thread_number")
-                data_dict['date'] = log_data.get("date")
-                data_dict['time'] = log_data.get("time")
-                data_dict['datetime'] = log_data.get("datetime")
-                data_dict['msg'] = log_data.get("msg")
-                data_dict['body'] = log_data.get("body")
-                data_list.append(data_dict)
-        df = pd.DataFrame(data_list)
-
-        # Filling None values to 0 if it is Integer or Float Field
-        df[['sender_send_max_emails_per_day', 'sender_total_sent_mails', 'thread_number']] = df[
-            ['sender_send_max_emails_per_day', 'sender_total_sent_mails', 'thread_number']].fillna(value=0)
-
-        # Filling None values to "" if it is String Field
-        df[['sender_name', 'sender_email', 'sender_email_provider', 'receiver_name', 'receiver_email',
-            'receiver_email_provider', 'mail_sent_status', 'subject', 'message_id', 'date', 'time', 'datetime', 'msg',
-            'body']] = df[['sender_name', 'sender_email', 'sender_email_provider', 'receiver_name', 'receiver_email',
-                           'receiver_email_provider', 'mail_sent_status', 'subject', 'message_id', 'date', 'time',
-                           'datetime', 'msg', 'body']].fillna(value="")
-        return df
+    def read_record_file_to_list_of_dict(self, file_date: str, columns: list = None,
+                                         filters: dict = None) -> pandas.DataFrame:
+        """
+        Read Record Log File to a DataFrame of the Projected Columns, Streamed line by line
+        """
+        return read_records(file_date=file_date, columns=columns, filters=filters)
 
-    def calculate_total_sent_mails_by_sender_email(self, file_date: str, sender_email: str) -> int:
+    def compact_closed_record_files(self, delete_record_files: bool = False) -> list:
         """
-        Calculates Total Number of Sent Mails by Warmup Emails
+        Compact Record Log Files of Closed Days to Columnar Files
         """
-        try:
-            dataframe = self.read_record_file_to_list_of_dict(file_date=file_date)
-            if not dataframe.empty:
-                filtered_dataframe = dataframe[dataframe['sender_email'] == sender_email]
-                total_number_of_sent_mails = int(len(filtered_dataframe))
-                if sender_email == "vipul.citrusbug@gmail.com":
-                    print(filtered_dataframe)
-                return total_number_of_sent_mails
-            return 0
-        except Exception as e:
-            print(e)
-            return 0
+        return compact_closed_record_files(delete_record_files=delete_record_files)
 
-    def calculate_inbox_and_reputation_ratio_with_email_alerts(self, report_date: datetime.date) -> bool:
+    def calculate_total_sent_mails_by_sender_email(self, file_date: str, sender_email: str) -> int:
         """
-        Calculates and Updates Inbox Ratio and Reputation Ratio and Send Email if Reputation goes Down to Threshold Limit
+        Calculates Total Number of Sent Mails by Warmup Emails from the Send Ledger
         """
-        campaign_reports = CampaignAppServices().list_campaign_reports().filter(report_date=report_date)
-        for campaign_report_instance in campaign_reports:
-            total_sent_mails = int(campaign_report_instance.total_emails_sent)
-            inbox_count = int(campaign_report_instance.inbox_count)
-            category_count = int(campaign_report_instance.category_count)
-            campaign_report_instance.inbox_ratio = float(inbox_count / total_sent_mails * 100)
-            reputation_ratio = campaign_report_instance.reputation_ratio = float(
-                (inbox_count + category_count) / total_sent_mails * 100)
-            # TODO : Remove below 2 lines
-            if campaign_report_instance.email == 'vipul.citrusbug@gmail.com':
-                reputation_ratio = 19.0
-            campaign_report_instance.save()
-            # Sending Mail for Reputation Alert if < 30
-            if reputation_ratio < 30:
-                sendgrid_reputation_alert_template_id = getattr(settings, "SENDGRID_REPUTATION_ALERT_TEMPLATE_KEY",
-                                                                None)
-                base_url = getattr(settings, "BASE_URL",None)
-                # Sending Mail to User
-                user = UserAppServices().get_user_by_id(id=campaign_report_instance.user_id)
-                username = user.first_name if user.first_name else user.email.split('@')[0]
-                template_data = {
-                    'username': username,
-                    'date_time': report_date.strftime("%Y-%m-%d"),
-                    'email': campaign_report_instance.email,
-                    'login_link': f"{base_url}/onboarding/"
-                }
-                sendgrid_mail(to_email=campaign_report_instance.email,
-                              TEMPLATE_KEY=sendgrid_reputation_alert_template_id,
-                              dynamic_data_for_template=template_data)
-                # Sending Mail to Master User
-                if not user.is_master_user:
-                    users_master_id = user.users_master_id
-                    user = UserAppServices().get_user_by_id(id=users_master_id)
-                    username = user.first_name if user.first_name else user.email.split('@')[0]
-                    template_data = {
-                        'username': username,
-                        'date_time': report_date.strftime("%Y-%m-%d"),
-                        'email': campaign_report_instance.email,
-                        'login_link': f"{base_url}/onboarding/"
-                    }
-                    sendgrid_mail(to_email=user.email,
-                                  TEMPLATE_KEY=sendgrid_reputation_alert_template_id,
-                                  dynamic_data_for_template=template_data)
-        return True
+        total_sent_mails = self.send_ledger_services.get_send_ledger_repo().filter(
+            sender_email=sender_email, send_date=file_date).values_list('total_sent_mails', flat=True).first()
+        return int(total_sent_mails or 0)
 
-    def create_campaign_reports_by_log_records(self) -> bool:
+    def reserve_sent_mail_by_sender_email(self, sender_email: str, send_date: datetime.date,
+                                          max_sent_mails: int) -> Union[int, None]:
         """
-        Creates Campaign Reports
+        Count a Mail in the Send Ledger of the Warmup Email if it is under Max Sent Mails of the day
+        Returns Total Number of Sent Mails including this Mail, None if the Limit is Reached
         """
-        report_date = (datetime.datetime.now() - datetime.timedelta(days=1)).date()
-        # report_date = (datetime.datetime.now()).date()
-        file_date = report_date.strftime("%Y-%m-%d")
-        # file_date = "2023-09-12"
-        raw_df = self.read_record_file_to_list_of_dict(file_date=file_date)
-        # TODO : Remove Below 1 line
-        # raw_df.to_excel(f"utils/embermail_data_excels/raw_df.xlsx", index=False)
-        domain_emails_list = self.list_domain_lists_by_is_active()
+        send_ledger_repo = self.send_ledger_services.get_send_ledger_repo()
+        send_ledgers = send_ledger_repo.filter(sender_email=sender_email, send_date=send_date)
+        if not send_ledgers.exists():
+            try:
+                with transaction.atomic():
+                    self.send_ledger_services.get_send_ledger_factory().get_entity_with_get_or_create(
+                        send_ledger_data=SendLedgerData(sender_email=sender_email, send_date=send_date))
+            except IntegrityError:
+                # Created by a Concurrent Send
+                pass
+        # Conditional Increment keeps Concurrent Sends of the same Warmup Email under the Limit
+        if not send_ledgers.filter(total_sent_mails__lt=max_sent_mails).update(
+                total_sent_mails=F('total_sent_mails') + 1):
+            return None
+        return int(send_ledgers.values_list('total_sent_mails', flat=True).first())
+
+    def release_sent_mail_by_sender_email(self, sender_email: str, send_date: datetime.date) -> None:
+        """
+        Uncount a Reserved Mail which was not Sent from the Send Ledger of the Warmup Email
+        """
+        self.send_ledger_services.get_send_ledger_repo().filter(
+            sender_email=sender_email, send_date=send_date, total_sent_mails__gt=0).update(
+            total_sent_mails=F('total_sent_mails') - 1)
+
+    def update_campaign_report_ratios(self, report_date: datetime.date) -> int:
+        """
+        Updates Inbox Ratio and Reputation Ratio of all Campaign Reports of Report Date by one UPDATE Statement
+        Returns Total Updated Campaign Reports
+        """
+        total_emails_sent = Cast(F('total_emails_sent'), FloatField())
+        return self.list_campaign_reports().filter(report_date=report_date).update(
+            inbox_ratio=Case(When(total_emails_sent=0, then=Value(0.0)),
+                             default=Cast(F('inbox_count'), FloatField()) * 100 / total_emails_sent,
+                             output_field=FloatField()),
+            reputation_ratio=Case(When(total_emails_sent=0, then=Value(0.0)),
+                                  default=Cast(F('inbox_count') + F('category_count'), FloatField()) * 100 /
+                                  total_emails_sent,
+                                  output_field=FloatField()))
+
+    def list_campaign_reports_below_reputation_ratio(self, report_date: datetime.date,
+                                                     reputation_ratio: float) -> RawQuerySet:
+        """
+        List Campaign Reports of Report Date below Reputation Ratio with their User and Master User by one Query
+        Reports are Annotated with user_email, user_first_name, master_user_email and master_user_first_name
+        """
+        quote_name = connection.ops.quote_name
+        campaign_report_table = quote_name(CampaignReport._meta.db_table)
+        user_table = quote_name(UserAppServices.user_services.get_user_repo().model._meta.db_table)
+        # Master User is Joined only for Users which are not Master Users themselves
+        return self.campaign_report_services.get_campaign_report_repo().raw(
+            f"SELECT report.*, report_user.email AS user_email, report_user.first_name AS user_first_name, "
+            f"master_user.email AS master_user_email, master_user.first_name AS master_user_first_name "
+            f"FROM {campaign_report_table} report "
+            f"LEFT JOIN {user_table} report_user ON report_user.id = report.user_id "
+            f"LEFT JOIN {user_table} master_user ON master_user.id = report_user.users_master_id "
+            f"AND NOT report_user.is_master_user "
+            f"WHERE report.report_date = %s AND report.total_emails_sent > 0 AND report.reputation_ratio < %s "
+            f"ORDER BY report.email", [report_date, reputation_ratio])
 
-        for domain_email in domain_emails_list:
-            receiver_email = domain_email.email
-            email_service_provider = domain_email.email_service_provider
-            app_password = CampaignAppServices().decrypt_app_password(
-                encrypted_app_password=domain_email.app_password)
-            imap = IMAPServices(email_provider=email_service_provider, username=receiver_email,
-                                app_password=app_password).get_connection_with_imap()
-
-            for campaign in CampaignAppServices().list_campaigns().filter(is_active=True, is_stopped=False):
-                filtered_df = raw_df[
-                    (raw_df['receiver_email'] == receiver_email) & (raw_df['sender_email'] == campaign.email)]
-                if not filtered_df.empty:
-                    total_sent_mails = len(filtered_df)
-                    start_date = datetime.datetime(2023, 9, 12).strftime('%d-%b-%Y')
-                    end_date = datetime.datetime(2023, 9, 13).strftime('%d-%b-%Y')
-                    inbox_count = 0
-                    category_count = 0
-                    spam_count = 0
-                    if email_service_provider == 'gmail':
-                        imap.select('"[Gmail]/All Mail"')
-                        search_criteria = f'(SINCE {start_date} BEFORE {end_date} FROM {campaign.email})'
-                        result, email_ids = imap.search(None, search_criteria)
-                        if result:
-                            filtered_email_ids = str(email.message_from_bytes(email_ids[0])).strip().split(
-                                " ") if b"" not in email_ids else list()
-                            if filtered_email_ids:
-                                for email_id in filtered_email_ids:
-                                    tmp, data = imap.fetch(f'{email_id}', '(X-GM-LABELS)')
-                                    label_list = data[0].decode('utf-8').split('X-GM-LABELS (')[1].split(")")[
-                                        0].replace("\\", "").replace('"', '').strip().split(" ")
-                                    if 'Inbox' in label_list:
-                                        inbox_count += 1
-                                    else:
-                                        category_count += 1
-                        imap.select('[Gmail]/Spam')
-                        search_criteria = f'(SINCE {start_date} BEFORE {end_date} FROM {campaign.email})'
-                        result, email_ids = imap.search(None, search_criteria)
-                        if result == "OK":
-                            filtered_email_ids = str(email.message_from_bytes(email_ids[0])).strip().split(
-                                " ") if b"" not in email_ids else list()
-                            if filtered_email_ids:
-                                spam_count += len(filtered_email_ids)
-
-                    if email_service_provider == 'outlook':
-                        imap.select('Inbox')
-                        search_criteria = f'(SINCE {start_date} BEFORE {end_date} FROM {campaign.email})'
-                        result, email_ids = imap.search(None, search_criteria)
-                        if result == 'OK':
-                            filtered_email_ids = str(email.message_from_bytes(email_ids[0])).strip().split(
-                                " ") if b"" not in email_ids else list()
-                            if filtered_email_ids:
-                                inbox_count += len(filtered_email_ids)
-                        imap.select('Junk')
-                        search_criteria = f'(SINCE {start_date} BEFORE {end_date} FROM {campaign.email})'
-                        result, email_ids = imap.search(None, search_criteria)
-                        if result == "OK":
-                            filtered_email_ids = str(email.message_from_bytes(email_ids[0])).strip().split(
-                                " ") if b"" not in email_ids else list()
-                            if filtered_email_ids:
-                                spam_count += len(filtered_email_ids)
-                        category_count += total_sent_mails - inbox_count - spam_count
-
-                    # Creating or Updating Campaign Reports
-                    campaign_report_data = CampaignReportData(email=campaign.email, report_date=report_date,
-                                                              inbox_count=inbox_count,
-                                                              total_emails_sent=total_sent_mails,
-                                                              category_count=category_count, spam_count=spam_count,
-                                                              campaign_id=campaign.id, user_id=campaign.user_id,
-                                                              master_user_id=campaign.master_user_id)
-                    campaign_report_instance, created = self.campaign_report_services.get_campaign_report_factory().get_entity_with_get_or_create(
-                        campaign_report_data=campaign_report_data)
-                    if not created:
-                        campaign_report_instance.total_emails_sent += total_sent_mails
-                        campaign_report_instance.inbox_count += inbox_count
-                        campaign_report_instance.category_count += category_count
-                        campaign_report_instance.spam_count += spam_count
-                        campaign_report_instance.save()
+    def calculate_inbox_and_reputation_ratio_with_email_alerts(self, report_date: datetime.date) -> bool:
+        """
+        Calculates and Updates Inbox Ratio and Reputation Ratio and Send Email if Reputation goes Down to Threshold Limit
+        Alerts are Grouped by Recipient, a Master User gets one Digest of all its Degraded Emails
+        """
+        self.update_campaign_report_ratios(report_date=report_date)
+
+        alerts_by_recipient = dict()
+        for campaign_report_instance in self.list_campaign_reports_below_reputation_ratio(
+                report_date=report_date,
+                reputation_ratio=float(getattr(settings, "REPUTATION_ALERT_THRESHOLD", 30))):
+            user_email = campaign_report_instance.user_email or campaign_report_instance.email
+            recipients = [(campaign_report_instance.email,
+                           campaign_report_instance.user_first_name or user_email.split('@')[0])]
+            if campaign_report_instance.master_user_email:
+                recipients.append((campaign_report_instance.master_user_email,
+                                   campaign_report_instance.master_user_first_name or
+                                   campaign_report_instance.master_user_email.split('@')[0]))
+            for recipient_email, username in recipients:
+                alert = alerts_by_recipient.setdefault(recipient_email, {'username': username, 'emails': list()})
+                if campaign_report_instance.email not in alert['emails']:
+                    alert['emails'].append(campaign_report_instance.email)
+
+        # Sending Mail for Reputation Alert, one per Recipient and Report Date
+        sendgrid_reputation_alert_template_id = getattr(settings, "SENDGRID_REPUTATION_ALERT_TEMPLATE_KEY", None)
+        base_url = getattr(settings, "BASE_URL", None)
+        emails_data = list()
+        for recipient_email, alert in alerts_by_recipient.items():
+            template_data = {
+                'username': alert['username'],
+                'date_time': report_date.strftime("%Y-%m-%d"),
+                'email': ", ".join(alert['emails']),
+                'emails': alert['emails'],
+                'login_link': f"{base_url}/onboarding/"
+            }
+            emails_data.append(EmailOutboxData(
+                idempotency_key=f"reputation-alert:{report_date.strftime('%Y-%m-%d')}:{recipient_email}",
+                to_email=recipient_email, template_id=sendgrid_reputation_alert_template_id,
+                dynamic_template_data=template_data))
+        UserAppServices().enqueue_emails(emails_data=emails_data)
+        return True
 
+    def list_sent_mails_by_receiver(self, report_date: datetime.date) -> Dict[str, Dict[str, int]]:
+        """
+        Count Sent Mails of Report Date by Receiver Email and Campaign Email from the Record Log
+        """
+        raw_df = self.read_record_file_to_list_of_dict(file_date=report_date.strftime("%Y-%m-%d"),
+                                                       columns=['sender_email', 'receiver_email'])
+        return self.__count_sent_mails_by_receiver(raw_df=raw_df)
+
+    def __count_sent_mails_by_receiver(self, raw_df: pandas.DataFrame) -> Dict[str, Dict[str, int]]:
+        # Sent Mails of every (Receiver, Sender) Pair which Exchanged Mails, by one Pass over the Records
+        sent_mails_by_pair = raw_df.groupby(['receiver_email', 'sender_email'], observed=True).size()
+        campaign_emails = set(self.list_campaigns().filter(is_active=True, is_stopped=False).values_list('email',
+                                                                                                          flat=True))
+        receiver_emails = set(self.list_domain_lists_by_is_active().values_list('email', flat=True))
+        sent_mails_by_receiver = defaultdict(dict)
+        for (receiver_email, sender_email), total_sent_mails in sent_mails_by_pair.items():
+            if receiver_email in receiver_emails and sender_email in campaign_emails:
+                sent_mails_by_receiver[receiver_email][sender_email] = int(total_sent_mails)
+        return dict(sent_mails_by_receiver)
+
+    def scan_mail_placements_by_receiver(self, receiver_email: str, sent_mails_by_sender: Dict[str, int],
+                                         report_date: datetime.date) -> List[dict]:
+        """
+        Scan Inbox, Category and Spam Placements of Mails which a Receiver got from Campaign Emails
+        Raises MailPlacementScanException when the Mailbox of the Receiver could not be Scanned
+        """
+        domain_email = self.get_email_domain_by_email(email=receiver_email)
+        app_password = self.decrypt_app_password(encrypted_app_password=domain_email.app_password)
+        # Placements of all Senders of the Receiver by a few UID SEARCH and FETCH Commands
+        placements_by_sender = IMAPServices(
+            email_provider=domain_email.email_service_provider, username=receiver_email,
+            app_password=app_password).count_mail_placements_by_senders(
+            sender_emails=list(sent_mails_by_sender), since=report_date,
+            before=report_date + datetime.timedelta(days=1))
+        if placements_by_sender is None:
+            # Sent Mails would be Reported without any Placement
+            raise MailPlacementScanException(message="Mailbox of the Receiver could not be Scanned.",
+                                             item={'receiver_email': receiver_email,
+                                                   'report_date': report_date.strftime("%Y-%m-%d")})
+        return self.__build_mail_placements(email_service_provider=domain_email.email_service_provider,
+                                            sent_mails_by_sender=sent_mails_by_sender,
+                                            placements_by_sender=placements_by_sender)
+
+    @staticmethod
+    def __build_mail_placements(email_service_provider: str, sent_mails_by_sender: Dict[str, int],
+                                placements_by_sender: Dict[str, dict]) -> List[dict]:
+        mail_placements = list()
+        for sender_email in dict.fromkeys(list(sent_mails_by_sender) + list(placements_by_sender)):
+            total_sent_mails = sent_mails_by_sender.get(sender_email, 0)
+            placements = placements_by_sender.get(sender_email, dict())
+            inbox_count = placements.get('inbox_count', 0)
+            category_count = placements.get('category_count', 0)
+            spam_count = placements.get('spam_count', 0)
+            if not (total_sent_mails or inbox_count or category_count or spam_count):
+                continue
+            if email_service_provider == 'outlook':
+                category_count += total_sent_mails - inbox_count - spam_count
+            mail_placements.append({'sender_email': sender_email, 'total_emails_sent': total_sent_mails,
+                                    'inbox_count': inbox_count, 'category_count': category_count,
+                                    'spam_count': spam_count})
+        return mail_placements
+
+    @staticmethod
+    def calculate_campaign_report_ratios(total_emails_sent: int, inbox_count: int, category_count: int) -> \
+            Tuple[float, float]:
+        """
+        Calculates Inbox Ratio and Reputation Ratio in Percent
+        """
+        if not total_emails_sent:
+            return 0.0, 0.0
+        inbox_ratio = float(inbox_count / total_emails_sent * 100)
+        reputation_ratio = float((inbox_count + category_count) / total_emails_sent * 100)
+        return inbox_ratio, reputation_ratio
+
+    def save_campaign_reports(self, report_date: datetime.date, mail_placements: List[dict],
+                              accumulate: bool = False) -> int:
+        """
+        Merge Mail Placements of all Receivers by Campaign Email and Upsert Campaign Reports with their Ratios
+        in one Query, counts are Added to the Saved Reports of the day when accumulate is True
+        Returns Total Saved Campaign Reports
+        """
+        if not accumulate and self.is_refreshed_report_date(report_date=report_date):
+            # Overwritten Counts would be Added again by the next Refresh from its Checkpoints
+            raise CampaignReportRefreshException(
+                message="Campaign Reports of the day are Refreshed Incrementally.",
+                item={'report_date': report_date.strftime("%Y-%m-%d")})
+        count_fields = ('total_emails_sent', 'inbox_count', 'category_count', 'spam_count')
+        counts_by_sender = defaultdict(lambda: dict.fromkeys(count_fields, 0))
+        for mail_placement in mail_placements:
+            for count_field in count_fields:
+                counts_by_sender[mail_placement['sender_email']][count_field] += mail_placement[count_field]
+
+        with transaction.atomic():
+            if accumulate:
+                saved_campaign_reports = self.list_campaign_reports().select_for_update().filter(
+                    report_date=report_date, email__in=list(counts_by_sender)).values('email', *count_fields)
+                for saved_campaign_report in saved_campaign_reports:
+                    for count_field in count_fields:
+                        counts_by_sender[saved_campaign_report['email']][count_field] += saved_campaign_report[
+                            count_field]
+
+            campaign_reports_data = list()
+            for campaign in self.list_campaigns().filter(is_active=True, is_stopped=False,
+                                                         email__in=list(counts_by_sender)):
+                counts = counts_by_sender[campaign.email]
+                inbox_ratio, reputation_ratio = self.calculate_campaign_report_ratios(
+                    total_emails_sent=counts['total_emails_sent'], inbox_count=counts['inbox_count'],
+                    category_count=counts['category_count'])
+                campaign_reports_data.append(
+                    CampaignReportData(email=campaign.email, report_date=report_date, campaign_id=campaign.id,
+                                       user_id=campaign.user_id, master_user_id=campaign.master_user_id,
+                                       inbox_ratio=inbox_ratio, reputation_ratio=reputation_ratio, **counts))
+            self.campaign_report_services.get_campaign_report_factory().bulk_upsert_entities(
+                campaign_reports_data=campaign_reports_data)
+        return len(campaign_reports_data)
+
+    @staticmethod
+    def is_refreshed_report_date(report_date: datetime.date) -> bool:
+        """
+        Campaign Reports of today are Owned by refresh_campaign_reports and its Checkpoints
+        """
+        return report_date >= datetime.datetime.now().date()
+
+    def create_campaign_reports_by_log_records(self, report_date: datetime.date) -> bool:
+        """
+        Creates Campaign Reports, Receivers are Scanned one after another
+        Reports of today are Refreshed from the Checkpoints instead of being Overwritten
+        Receivers whose Mailbox could not be Scanned are Left out of the Reports
+        """
+        if self.is_refreshed_report_date(report_date=report_date):
+            self.refresh_campaign_reports(report_date=report_date)
+            return True
+        mail_placements = list()
+        for receiver_email, sent_mails_by_sender in self.list_sent_mails_by_receiver(report_date=report_date).items():
+            try:
+                mail_placements.extend(self.scan_mail_placements_by_receiver(
+                    receiver_email=receiver_email, sent_mails_by_sender=sent_mails_by_sender,
+                    report_date=report_date))
+            except MailPlacementScanException:
+                logger.exception("Mail Placements of %s Left out of Campaign Reports", receiver_email)
+        self.save_campaign_reports(report_date=report_date, mail_placements=mail_placements)
         return True
 
+    def refresh_campaign_reports(self, report_date: datetime.date) -> int:
+        """
+        Refresh Campaign Reports of Report Date by the Records and Mails added since the Last Refresh
+        Mailboxes are Scanned before the Checkpoint is Locked, the Refresh is Dropped when another one Moved the
+        Checkpoint meanwhile and its Records and Mails are Counted by the next Refresh
+        Returns Total Refreshed Campaign Reports
+        """
+        campaign_emails = list(set(self.list_campaigns().filter(is_active=True, is_stopped=False).values_list(
+            'email', flat=True)))
+        record_log_checkpoint, _ = self.record_log_checkpoint_services.get_record_log_checkpoint_factory().get_entity_with_get_or_create(
+            record_log_checkpoint_data=RecordLogCheckpointData(file_date=report_date))
+        raw_df, offset = read_new_records(file_date=report_date.strftime("%Y-%m-%d"),
+                                          offset=record_log_checkpoint.offset,
+                                          columns=['sender_email', 'receiver_email'])
+        sent_mails_by_receiver = self.__count_sent_mails_by_receiver(raw_df=raw_df)
+
+        # Receivers which got Mails today are Scanned on every Refresh, as Mails may Arrive late
+        mailbox_checkpoints = {mailbox_checkpoint.receiver_email: mailbox_checkpoint for mailbox_checkpoint in
+                               self.mailbox_checkpoint_services.get_mailbox_checkpoint_repo().filter(
+                                   report_date=report_date)}
+        domain_emails_list = self.list_domain_lists_by_is_active().filter(
+            email__in=set(sent_mails_by_receiver) | set(mailbox_checkpoints))
+        domain_app_passwords = self.decrypt_app_passwords(queryset=domain_emails_list)
+
+        mail_placements = list()
+        scanned_mailbox_uids = dict()
+        for domain_email in domain_emails_list:
+            mailbox_checkpoint = mailbox_checkpoints.get(domain_email.email)
+            placements_by_sender, scanned_mailbox_uids[domain_email.email] = IMAPServices(
+                email_provider=domain_email.email_service_provider, username=domain_email.email,
+                app_password=domain_app_passwords.get(domain_email.id)).count_new_mail_placements_by_senders(
+                sender_emails=campaign_emails, since=report_date, before=report_date + datetime.timedelta(days=1),
+                mailbox_uids=mailbox_checkpoint.mailbox_uids if mailbox_checkpoint else dict())
+            mail_placements.extend(self.__build_mail_placements(
+                email_service_provider=domain_email.email_service_provider,
+                sent_mails_by_sender=sent_mails_by_receiver.get(domain_email.email, dict()),
+                placements_by_sender=placements_by_sender))
+
+        with transaction.atomic():
+            # Refreshes of the same day wait for each other, so no Record or Mail is Counted twice
+            locked_record_log_checkpoint = self.record_log_checkpoint_services.get_record_log_checkpoint_repo(
+            ).select_for_update().get(id=record_log_checkpoint.id)
+            if locked_record_log_checkpoint.updated_at != record_log_checkpoint.updated_at:
+                return 0
+            for receiver_email, mailbox_uids in scanned_mailbox_uids.items():
+                self.mailbox_checkpoint_services.get_mailbox_checkpoint_repo().update_or_create(
+                    receiver_email=receiver_email, report_date=report_date, defaults={'mailbox_uids': mailbox_uids})
+            total_refreshed_campaign_reports = self.save_campaign_reports(
+                report_date=report_date, mail_placements=mail_placements, accumulate=True)
+            # Saved even when no Record was Added, so a Refresh which Scanned meanwhile is Dropped
+            locked_record_log_checkpoint.offset = offset
+            locked_record_log_checkpoint.save()
+        return total_refreshed_campaign_reports
+
     # =====================================================================================
     # DOMAIN LIST
     # =====================================================================================
@@ -682,3 +893,478 @@ class CampaignAppServices:
         except Exception as e:
             raise DomainEmailCreationException(message="Something went wrong in creating Domain Email.",
                                                item={'error': e.args})
+
+    # =====================================================================================
+    # WARMUP SEND
+    # =====================================================================================
+
+    def get_warmup_send_by_id(self, id: UUID) -> WarmupSend:
+        """
+        Get WarmupSend instance by id
+        """
+        try:
+            return self.warmup_send_services.get_warmup_send_repo().get(id=id)
+        except Exception as e:
+            raise WarmupSendDoesNotExist(message="WarmupSend does not exist.", item={'error': e.args})
+
+    def list_warmup_sends(self) -> QuerySet[WarmupSend]:
+        """
+        List all Warmup Sends
+        """
+        return self.warmup_send_services.get_warmup_send_repo().all()
+
+    def list_warmup_sends_by_thread_key(self, thread_key: UUID) -> QuerySet[WarmupSend]:
+        """
+        List Warmup Sends of a Warmup Thread ordered by Thread Index
+        """
+        return self.list_warmup_sends().filter(thread_key=thread_key).order_by('thread_index')
+
+    def list_campaigns_to_warmup(self) -> QuerySet[Campaign]:
+        """
+        List Campaigns which are Running and have no Action Required
+        """
+        return self.list_campaigns().filter(is_stopped=False, app_password__isnull=False,
+                                            action_required=CampaignActionRequiredChoices.NONE)
+
+    def load_warmup_corpus(self, warmup_emails: List[str]) -> WarmupCorpus:
+        """
+        Load Active Receivers, General Templates and Templates of the Warmup Emails with their Threads in three
+        Queries
+        """
+        template_app_services = TemplateAppServices()
+        receivers = tuple(self.list_domain_lists_by_is_active().values('id', 'email'))
+        # Templates without Threads can not be Sent
+        templates = list(template_app_services.list_templates().filter(
+            Q(is_general=True) | Q(warmup_email__in=warmup_emails), thread_count__gt=0).values(
+            'id', 'subject', 'warmup_email', 'is_general'))
+        threads_by_template_id = defaultdict(list)
+        for template_id, thread_id, updated_at in template_app_services.list_threads().filter(
+                template_id__in=[template.get('id') for template in templates]).order_by(
+                'template_id', 'thread_ordering_number').values_list('template_id', 'id', 'updated_at'):
+            threads_by_template_id[template_id].append((thread_id, updated_at))
+
+        warmup_emails = set(warmup_emails)
+        general_templates = list()
+        templates_by_warmup_email = dict()
+        for template in templates:
+            if not threads_by_template_id.get(template.get('id')):
+                continue
+            warmup_template = WarmupTemplate(id=template.get('id'), subject=template.get('subject'),
+                                             threads=tuple(threads_by_template_id[template.get('id')]))
+            if template.get('warmup_email') in warmup_emails:
+                templates_by_warmup_email.setdefault(template.get('warmup_email'), []).append(warmup_template)
+            if template.get('is_general'):
+                general_templates.append(warmup_template)
+        return WarmupCorpus(receivers=receivers, general_templates=tuple(general_templates),
+                            templates_by_warmup_email={warmup_email: tuple(warmup_templates) for
+                                                       warmup_email, warmup_templates in
+                                                       templates_by_warmup_email.items()})
+
+    def plan_warmup_sends_for_campaign(self, campaign: Campaign, planned_at: datetime.datetime,
+                                       warmup_corpus: WarmupCorpus, warmup_email_name: str = None) -> List[WarmupSend]:
+        """
+        Plan Warmup Threads of a Campaign for today and Build a WarmupSend for every Mail of the Threads
+        """
+        warmup_email_name = warmup_email_name or campaign.email.split("@")[0]
+        # Get Total mails to be sent and update it by step up
+        total_mails_to_send = campaign.mails_to_be_sent
+        if int(campaign.mails_to_be_sent) < int(campaign.max_email_per_day):
+            total_mails_to_send = int(campaign.mails_to_be_sent) + int(campaign.email_step_up)
+            campaign.mails_to_be_sent = total_mails_to_send
+            campaign.save()
+
+        receivers_list = warmup_corpus.receivers
+        templates_list = warmup_corpus.get_templates_by_warmup_email(warmup_email=campaign.email)
+        if not (templates_list and receivers_list):
+            return list()
+        random_templates = random.sample(templates_list, len(templates_list))
+
+        # Pick Templates until their Threads cover the Mails of the Warmup Email and its Replies
+        total_threads = 0
+        finalized_templates = []
+        template_number = 0
+        while total_threads < (2 * total_mails_to_send) and total_threads - (2 * total_mails_to_send) <= -2:
+            finalized_templates.append(random_templates[template_number])
+            total_threads += random_templates[template_number].total_threads
+            template_number = (template_number + 1) % len(random_templates)
+
+        if len(receivers_list) < len(finalized_templates):
+            finalized_templates = finalized_templates[:len(receivers_list)]
+        finalized_receivers = random.sample(receivers_list, len(finalized_templates))
+        max_threads_in_template = max(template.total_threads for template in finalized_templates)
+
+        max_time_to_complete_all_process = int(getattr(settings, "MAX_TIME_TO_COMPLETE_ALGORITHM", "72000"))
+        time_to_be_sent_one_mail = int(max_time_to_complete_all_process / max_threads_in_template * 0.98)
+        warmup_send_factory = self.warmup_send_services.get_warmup_send_factory()
+        warmup_sends = list()
+        for template, receiver in zip(finalized_templates, finalized_receivers):
+            thread_key = uuid.uuid4()
+            send_at = planned_at + datetime.timedelta(seconds=random.randint(1, time_to_be_sent_one_mail))
+            parent_message_id = None
+            for thread_index, (thread_id, thread_updated_at) in enumerate(template.threads):
+                # Warmup Email Starts the Thread and the Receiver Replies to every Mail of it
+                if thread_index % 2 == 0:
+                    direction = WarmupSendDirectionChoices.TO_RECEIVER
+                    from_email, to_email = campaign.email, receiver.get('email')
+                else:
+                    direction = WarmupSendDirectionChoices.TO_WARMUP_EMAIL
+                    from_email, to_email = receiver.get('email'), campaign.email
+                message_id = SMTPServices.generate_message_id(thread_key=thread_key.hex, thread_index=thread_index,
+                                                              sender_email=from_email)
+                warmup_send_data = WarmupSendData(campaign_id=campaign.id, domain_list_id=receiver.get('id'),
+                                                  thread_key=thread_key, template_id=template.id,
+                                                  thread_index=thread_index, direction=direction,
+                                                  from_email=from_email, to_email=to_email,
+                                                  template_subject=template.subject,
+                                                  total_mails_to_send=int(total_mails_to_send),
+                                                  message_id=message_id, parent_message_id=parent_message_id,
+                                                  warmup_email_name=warmup_email_name, thread_id=thread_id,
+                                                  thread_updated_at=thread_updated_at, send_at=send_at)
+                warmup_sends.append(warmup_send_factory.build_entity_with_id(warmup_send_data=warmup_send_data))
+                parent_message_id = message_id
+                send_at += datetime.timedelta(
+                    seconds=random.randint(int(time_to_be_sent_one_mail * 3 / 4), time_to_be_sent_one_mail))
+        return warmup_sends
+
+    def list_campaign_ids_to_warmup(self) -> List[UUID]:
+        """
+        List IDs of Campaigns which are Running and have no Action Required
+        """
+        return list(self.list_campaigns_to_warmup().order_by('id').values_list('id', flat=True))
+
+    def plan_warmup_sends(self, campaign_ids: List[UUID] = None, planned_at: datetime.datetime = None) -> int:
+        """
+        Plan Warmup Sends of Running Campaigns, all of them or only given Campaign IDs
+        Returns Total Planned Warmup Sends
+        """
+        planned_at = planned_at or timezone.now()
+        campaigns = self.list_campaigns_to_warmup()
+        if campaign_ids is not None:
+            campaigns = campaigns.filter(id__in=campaign_ids)
+        campaign_app_passwords = self.decrypt_app_passwords(queryset=campaigns)
+        campaigns = list(campaigns)
+        warmup_corpus = self.load_warmup_corpus(warmup_emails=[campaign.email for campaign in campaigns])
+        warmup_email_names = self.list_user_first_names_by_warmup_emails(
+            warmup_emails=[campaign.email for campaign in campaigns])
+        total_planned_warmup_sends = 0
+        for campaign in campaigns:
+            # Checking App Password, Plan ID, Email Service Provider are available
+            if campaign.plan_id and campaign_app_passwords.get(campaign.id) and campaign.email_service_provider in [
+                    'gmail', 'outlook']:
+                try:
+                    warmup_sends = self.plan_warmup_sends_for_campaign(
+                        campaign=campaign, planned_at=planned_at, warmup_corpus=warmup_corpus,
+                        warmup_email_name=warmup_email_names.get(campaign.email))
+                    self.warmup_send_services.get_warmup_send_repo().bulk_create(warmup_sends, batch_size=1000)
+                    total_planned_warmup_sends += len(warmup_sends)
+                except Exception:
+                    logger.exception("Error in Planning Warmup Sends of %s", campaign.email)
+        return total_planned_warmup_sends
+
+    def dispatch_due_warmup_sends(self, batch_size: int) -> List[UUID]:
+        """
+        Claim Due Warmup Sends whose Previous Mail of the Thread is Sent and Mark them Dispatched
+        Rows locked by another Dispatcher are Skipped
+        """
+        now = timezone.now()
+        warmup_send_repo = self.warmup_send_services.get_warmup_send_repo()
+        previous_mail_sent = warmup_send_repo.filter(thread_key=OuterRef('thread_key'),
+                                                     thread_index=OuterRef('thread_index') - 1,
+                                                     status=WarmupSendStatusChoices.SENT)
+        with transaction.atomic():
+            warmup_send_ids = list(
+                warmup_send_repo.select_for_update(skip_locked=True).filter(
+                    status=WarmupSendStatusChoices.PENDING, send_at__lte=now).filter(
+                    Q(thread_index=0) | Q(Exists(previous_mail_sent))).order_by('send_at').values_list(
+                    'id', flat=True)[:batch_size])
+            warmup_send_repo.filter(id__in=warmup_send_ids).update(status=WarmupSendStatusChoices.DISPATCHED,
+                                                                   dispatched_at=now, attempts=F('attempts') + 1)
+        return warmup_send_ids
+
+    def dispatch_due_warmup_sends_by_sender(self, batch_size: int) -> List[List[UUID]]:
+        """
+        Claim Due Warmup Sends like dispatch_due_warmup_sends and Group their IDs by Sender Email
+        Groups keep the Order of Send Time, so each can be Sent over one SMTP Session
+        """
+        warmup_send_ids = self.dispatch_due_warmup_sends(batch_size=batch_size)
+        from_emails = dict(self.warmup_send_services.get_warmup_send_repo().filter(id__in=warmup_send_ids).values_list(
+            'id', 'from_email'))
+        warmup_send_ids_by_sender = defaultdict(list)
+        for warmup_send_id in warmup_send_ids:
+            warmup_send_ids_by_sender[from_emails.get(warmup_send_id)].append(warmup_send_id)
+        return list(warmup_send_ids_by_sender.values())
+
+    def requeue_stale_warmup_sends(self, dispatch_timeout: int, max_attempts: int) -> int:
+        """
+        Requeue Warmup Sends which were Dispatched but never Picked by a Send Worker
+        Sends which were being Sent are Failed, as the Mail may already be Delivered
+        """
+        stale_before = timezone.now() - datetime.timedelta(seconds=dispatch_timeout)
+        warmup_send_repo = self.warmup_send_services.get_warmup_send_repo()
+        stale_warmup_sends = warmup_send_repo.filter(dispatched_at__lt=stale_before)
+        failed_warmup_sends = list(stale_warmup_sends.filter(
+            Q(status=WarmupSendStatusChoices.SENDING) | Q(status=WarmupSendStatusChoices.DISPATCHED,
+                                                          attempts__gte=max_attempts)).values_list('id', 'thread_key',
+                                                                                                   'thread_index'))
+        for warmup_send_id, thread_key, thread_index in failed_warmup_sends:
+            self.finish_warmup_send(warmup_send_id=warmup_send_id, thread_key=thread_key, thread_index=thread_index,
+                                    status=WarmupSendStatusChoices.FAILED, error="Send Worker did not Complete.")
+        return stale_warmup_sends.filter(status=WarmupSendStatusChoices.DISPATCHED).update(
+            status=WarmupSendStatusChoices.PENDING)
+
+    def finish_warmup_send(self, warmup_send_id: UUID, thread_key: UUID, thread_index: int, status: str,
+                           error: str = None) -> None:
+        """
+        Update Final Status of a Warmup Send, the Rest of the Thread is Skipped if it was not Sent
+        """
+        warmup_send_repo = self.warmup_send_services.get_warmup_send_repo()
+        with transaction.atomic():
+            warmup_send_repo.filter(id=warmup_send_id).update(
+                status=status, error=error, sent_at=timezone.now() if status == WarmupSendStatusChoices.SENT else None)
+            if status != WarmupSendStatusChoices.SENT:
+                warmup_send_repo.filter(thread_key=thread_key, thread_index__gt=thread_index,
+                                        status=WarmupSendStatusChoices.PENDING).update(
+                    status=WarmupSendStatusChoices.SKIPPED)
+
+    @staticmethod
+    def build_thread_body_values(warmup_email_name: str, domain_email_name: str) -> Dict[str, str]:
+        """
+        Values of the Thread Body Placeholders, Names are Shown in Bold
+        """
+        return {WARMUP_EMAIL_NAME_PLACEHOLDER: f"<b>{warmup_email_name}</b>",
+                DOMAIN_EMAIL_NAME_PLACEHOLDER: f"<b>{domain_email_name}</b>"}
+
+    def __prepare_warmup_send(self, warmup_send_id: UUID, send_date: datetime.date) -> Union[dict, str]:
+        """
+        Claim a Dispatched Warmup Send, Count it in the Send Ledger and Render its Mail
+        Returns the Prepared Send with the Decrypted App Password of its Sender, or why it is not Sent
+        """
+        warmup_send_repo = self.warmup_send_services.get_warmup_send_repo()
+        if not getattr(settings, "ENABLE_SEND_MAILS_FOR_WARMUP", None):
+            # Left Pending with its Attempt Given back, it is Sent once Sending is Enabled again
+            warmup_send_repo.filter(id=warmup_send_id, status=WarmupSendStatusChoices.DISPATCHED).update(
+                status=WarmupSendStatusChoices.PENDING, attempts=F('attempts') - 1)
+            return "Enable 'ENABLE_SEND_MAILS_FOR_WARMUP' in settings.py"
+        # Claim the Warmup Send, so a Redelivered Dispatch does not Send the Mail twice
+        if not warmup_send_repo.filter(id=warmup_send_id, status=WarmupSendStatusChoices.DISPATCHED).update(
+                status=WarmupSendStatusChoices.SENDING):
+            return "Warmup Send is not Dispatched."
+        warmup_send = self.get_warmup_send_by_id(id=warmup_send_id)
+        mail_reserved = False
+        try:
+            campaign = self.get_campaign_by_id(id=warmup_send.campaign_id)
+            domain_email = self.get_email_domain_by_id(id=warmup_send.domain_list_id)
+            warmup_email_name = warmup_send.warmup_email_name
+            if not warmup_email_name:
+                # Warmup Sends Planned before Names were Resolved by the Planner
+                try:
+                    warmup_email_name = self.get_user_first_name_by_warmup_email(warmup_email=campaign.email)
+                except Exception:
+                    warmup_email_name = campaign.email.split("@")[0]
+            domain_email_name = domain_email.email.split("@")[0]
+            if warmup_send.direction == WarmupSendDirectionChoices.TO_RECEIVER:
+                sender, sender_name, receiver_name = campaign, warmup_email_name, domain_email_name
+                receiver_email_provider = domain_email.email_service_provider
+            else:
+                sender, sender_name, receiver_name = domain_email, domain_email_name, warmup_email_name
+                receiver_email_provider = campaign.email_service_provider
+
+            sender_data = {
+                "name": sender_name,
+                "email": warmup_send.from_email,
+                "email_provider": sender.email_service_provider
+            }
+            receiver_data = {
+                "name": receiver_name,
+                "email": warmup_send.to_email,
+                "email_provider": receiver_email_provider
+            }
+            if warmup_send.direction == WarmupSendDirectionChoices.TO_RECEIVER:
+                # Checking Warmup Email has not Reached its Mails to be Sent for today
+                total_number_of_sent_mail = self.reserve_sent_mail_by_sender_email(
+                    sender_email=warmup_send.from_email, send_date=send_date,
+                    max_sent_mails=warmup_send.total_mails_to_send)
+                if total_number_of_sent_mail is None:
+                    self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                            thread_index=warmup_send.thread_index,
+                                            status=WarmupSendStatusChoices.SKIPPED)
+                    return "Mails to be Sent Reached."
+                mail_reserved = True
+                sender_data["send_max_emails_per_day"] = warmup_send.total_mails_to_send
+                sender_data["total_number_of_sent_mails"] = total_number_of_sent_mail
+                log_message = "Mail Sent Successfully from Warmup Email to User."
+            else:
+                log_message = "Mail Sent Successfully from User to Warmup Email."
+
+            template_app_services = TemplateAppServices()
+            if warmup_send.thread_id:
+                try:
+                    # Body as of Planning, Compiled once per Process without Reading the Threads
+                    thread_body_template = template_app_services.compile_thread_body(
+                        thread_id=warmup_send.thread_id, updated_at=warmup_send.thread_updated_at)
+                except ThreadDoesNotExist:
+                    try:
+                        # Thread was Updated after Planning, its Current Body is Sent
+                        thread_body_template = template_app_services.get_current_thread_body_template(
+                            thread_id=warmup_send.thread_id)
+                    except ThreadDoesNotExist:
+                        # Thread was Deleted after Planning, the Rest of the Thread is Skipped
+                        if mail_reserved:
+                            self.release_sent_mail_by_sender_email(sender_email=warmup_send.from_email,
+                                                                   send_date=send_date)
+                        self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                                thread_index=warmup_send.thread_index,
+                                                status=WarmupSendStatusChoices.SKIPPED)
+                        return "Thread of the Warmup Send was Deleted."
+            else:
+                # Warmup Sends Planned before Threads were Resolved by the Planner
+                thread_body_template = template_app_services.get_thread_body_template(
+                    template_id=warmup_send.template_id, thread_index=warmup_send.thread_index)
+            updated_body = thread_body_template.render(values=self.build_thread_body_values(
+                warmup_email_name=warmup_email_name, domain_email_name=domain_email_name))
+            subject = warmup_send.template_subject
+            if warmup_send.thread_index:
+                subject = f"Re: {subject}"
+            return {
+                "warmup_send": warmup_send,
+                "mail_reserved": mail_reserved,
+                "email_provider": sender.email_service_provider,
+                "app_password": self.decrypt_app_password(encrypted_app_password=sender.app_password),
+                "sender_data": sender_data,
+                "receiver_data": receiver_data,
+                "log_message": log_message,
+                "subject": subject,
+                "body": updated_body,
+            }
+        except Exception as e:
+            if mail_reserved:
+                self.release_sent_mail_by_sender_email(sender_email=warmup_send.from_email, send_date=send_date)
+            self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                    thread_index=warmup_send.thread_index, status=WarmupSendStatusChoices.FAILED,
+                                    error=str(e))
+            raise e
+
+    def __complete_warmup_send(self, prepared_send: dict, send_date: datetime.date, mail_sent_successfully: bool,
+                               error: str = None) -> str:
+        """
+        Create the Record Log of a Prepared Send and Update its Final Status
+        """
+        warmup_send = prepared_send["warmup_send"]
+        try:
+            attributes_log = record_log.with_attributes(sender=prepared_send["sender_data"],
+                                                        receiver=prepared_send["receiver_data"],
+                                                        mail_sent_status=mail_sent_successfully,
+                                                        template_subject=prepared_send["subject"],
+                                                        message_id=warmup_send.parent_message_id,
+                                                        thread_number=int(warmup_send.thread_index) + 1,
+                                                        body=prepared_send["body"])
+            attributes_log.fatal(prepared_send["log_message"])
+        except Exception as e:
+            if prepared_send["mail_reserved"]:
+                self.release_sent_mail_by_sender_email(sender_email=warmup_send.from_email, send_date=send_date)
+            self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                    thread_index=warmup_send.thread_index, status=WarmupSendStatusChoices.FAILED,
+                                    error=str(e))
+            raise e
+
+        if mail_sent_successfully:
+            self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                    thread_index=warmup_send.thread_index, status=WarmupSendStatusChoices.SENT)
+            return "Mail Sent"
+        if prepared_send["mail_reserved"]:
+            self.release_sent_mail_by_sender_email(sender_email=warmup_send.from_email, send_date=send_date)
+        self.finish_warmup_send(warmup_send_id=warmup_send.id, thread_key=warmup_send.thread_key,
+                                thread_index=warmup_send.thread_index, status=WarmupSendStatusChoices.FAILED,
+                                error=error or "Mail was not Sent.")
+        return "Mail not Sent"
+
+    def __prepare_warmup_sends(self, warmup_send_ids: List[UUID], send_date: datetime.date) -> \
+            Tuple[List[dict], Dict[UUID, str]]:
+        """
+        Prepare many Warmup Sends, Returns the Prepared Sends and why the others are not Sent by ID
+        """
+        prepared_sends = list()
+        send_results = dict()
+        for warmup_send_id in warmup_send_ids:
+            try:
+                prepared_send = self.__prepare_warmup_send(warmup_send_id=warmup_send_id, send_date=send_date)
+            except Exception as e:
+                send_results[warmup_send_id] = str(e)
+                continue
+            if isinstance(prepared_send, str):
+                send_results[warmup_send_id] = prepared_send
+            else:
+                prepared_sends.append(prepared_send)
+        return prepared_sends, send_results
+
+    @staticmethod
+    def __build_mail_message(prepared_send: dict) -> dict:
+        warmup_send = prepared_send["warmup_send"]
+        return {"to": warmup_send.to_email, "subject": prepared_send["subject"], "body": prepared_send["body"],
+                "message_id": warmup_send.parent_message_id, "new_message_id": warmup_send.message_id}
+
+    def send_warmup_send(self, warmup_send_id: UUID) -> str:
+        """
+        Send a Dispatched Warmup Send with Credentials Resolved from the Database and Create its Record Log
+        """
+        send_date = datetime.date.today()
+        prepared_send = self.__prepare_warmup_send(warmup_send_id=warmup_send_id, send_date=send_date)
+        if isinstance(prepared_send, str):
+            return prepared_send
+        warmup_send = prepared_send["warmup_send"]
+        refused_recipients = SMTPServices(
+            email_provider=prepared_send["email_provider"], username=warmup_send.from_email,
+            app_password=prepared_send["app_password"]).send_mail(**self.__build_mail_message(
+            prepared_send=prepared_send))
+        return self.__complete_warmup_send(
+            prepared_send=prepared_send, send_date=send_date,
+            mail_sent_successfully=refused_recipients is not None and warmup_send.to_email not in refused_recipients)
+
+    def send_warmup_sends(self, warmup_send_ids: List[UUID]) -> Dict[UUID, str]:
+        """
+        Send Dispatched Warmup Sends, Mails of the same Sender share one SMTP Session by send_many
+        Returns the Result of every Warmup Send by ID
+        """
+        send_date = datetime.date.today()
+        prepared_sends, send_results = self.__prepare_warmup_sends(warmup_send_ids=warmup_send_ids,
+                                                                   send_date=send_date)
+
+        def sender_key(prepared_send: dict) -> tuple:
+            return prepared_send["email_provider"], prepared_send["warmup_send"].from_email
+
+        for (email_provider, from_email), sender_sends in groupby(sorted(prepared_sends, key=sender_key),
+                                                                  key=sender_key):
+            sender_sends = list(sender_sends)
+            mail_statuses = SMTPServices(email_provider=email_provider, username=from_email,
+                                         app_password=sender_sends[0]["app_password"]).send_many(
+                messages=[self.__build_mail_message(prepared_send=prepared_send) for prepared_send in sender_sends])
+            for prepared_send, mail_status in zip(sender_sends, mail_statuses):
+                try:
+                    send_results[prepared_send["warmup_send"].id] = self.__complete_warmup_send(
+                        prepared_send=prepared_send, send_date=send_date,
+                        mail_sent_successfully=mail_status.get("sent"), error=mail_status.get("error"))
+                except Exception as e:
+                    send_results[prepared_send["warmup_send"].id] = str(e)
+        return send_results
+
+    def send_warmup_sends_concurrently(self, warmup_send_ids: List[UUID], max_concurrency: int = 1000) -> \
+            Dict[UUID, str]:
+        """
+        Send Dispatched Warmup Sends of many Senders Concurrently over asyncio SMTP Conversations
+        Credentials are Resolved and Decrypted in the Worker, Returns the Result of every Warmup Send by ID
+        """
+        send_date = datetime.date.today()
+        prepared_sends, send_results = self.__prepare_warmup_sends(warmup_send_ids=warmup_send_ids,
+                                                                   send_date=send_date)
+        mail_statuses = AsyncSMTPSendWorker(max_concurrency=max_concurrency).run(sends=[
+            {"email_provider": prepared_send["email_provider"], "username": prepared_send["warmup_send"].from_email,
+             "app_password": prepared_send["app_password"], **self.__build_mail_message(prepared_send=prepared_send)}
+            for prepared_send in prepared_sends])
+        for prepared_send, mail_status in zip(prepared_sends, mail_statuses):
+            try:
+                send_results[prepared_send["warmup_send"].id] = self.__complete_warmup_send(
+                    prepared_send=prepared_send, send_date=send_date, mail_sent_successfully=mail_status.get("sent"),
+                    error=mail_status.get("error"))
+            except Exception as e:
+                send_results[prepared_send["warmup_send"].id] = str(e)
+        return send_results
@@ -0,0 +1,173 @@
+import os
+import datetime
+
+import ujson
+import pytest
+
+from embermail.application.campaigns.services import CampaignAppServices
+from embermail.domain.campaigns.models import Campaign, CampaignReport, DomainList, RecordLogCheckpoint, \
+    MailboxCheckpoint
+from embermail.domain.users.models import EmailOutbox
+from embermail.interface.campaigns import tasks
+from embermail.infrastructure.logger.records import get_record_file_path
+from embermail.infrastructure.mailer_sevices.imap.services import IMAPServices
+from utils.django.exceptions import CampaignReportRefreshException, MailPlacementScanException
+
+CAMPAIGN_EMAIL = "campaign@gmail.com"
+RECEIVER_EMAIL = "receiver@outlook.com"
+
+
+class FakeMailbox:
+    """
+    Inbox of the Receiver, Mails from the Campaign Email get UIDs 1, 2, 3...
+    """
+
+    def __init__(self):
+        self.uids = list()
+        self.on_scan = None
+
+    def deliver(self, mails: int):
+        self.uids.extend(range(len(self.uids) + 1, len(self.uids) + 1 + mails))
+
+    def count_new_mail_placements_by_senders(self, sender_emails, since, before, mailbox_uids):
+        if self.on_scan:
+            self.on_scan()
+        last_uid = mailbox_uids.get("Inbox", [1, 0])[1]
+        new_uids = [uid for uid in self.uids if uid > last_uid]
+        placements = {CAMPAIGN_EMAIL: {"inbox_count": len(new_uids)}} if new_uids else dict()
+        return placements, {"Inbox": [1, max(self.uids, default=last_uid)]}
+
+
+@pytest.fixture
+def mailbox(tmp_path, monkeypatch):
+    # Record Paths are Relative to the Working Directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("logs/records")
+    Campaign.objects.create(email=CAMPAIGN_EMAIL, email_service_provider="gmail", is_stopped=False)
+    DomainList.objects.create(email=RECEIVER_EMAIL, app_password="encrypted", email_service_provider="gmail")
+    monkeypatch.setattr(CampaignAppServices, "decrypt_app_passwords",
+                        lambda self, queryset, max_workers=None: {id: "app password" for id in
+                                                                  queryset.values_list("id", flat=True)})
+    fake_mailbox = FakeMailbox()
+    monkeypatch.setattr(IMAPServices, "count_new_mail_placements_by_senders",
+                        fake_mailbox.count_new_mail_placements_by_senders)
+    return fake_mailbox
+
+
+def send_mails(mailbox: FakeMailbox, mails: int, delivered: bool = True, send_date: datetime.date = None):
+    send_date = send_date or datetime.date.today()
+    with open(get_record_file_path(file_date=send_date.strftime("%Y-%m-%d")), "a") as file:
+        for _ in range(mails):
+            file.write(ujson.dumps({"sender": {"email": CAMPAIGN_EMAIL}, "receiver": {"email": RECEIVER_EMAIL}}) +
+                       "\n")
+    if delivered:
+        mailbox.deliver(mails=mails)
+
+
+def get_report_counts() -> tuple:
+    campaign_report = CampaignReport.objects.get(email=CAMPAIGN_EMAIL, report_date=datetime.date.today())
+    return campaign_report.total_emails_sent, campaign_report.inbox_count
+
+
+@pytest.mark.django_db
+def test_refresh_campaign_reports_counts_new_records_and_mails_once(mailbox):
+    campaign_app_services = CampaignAppServices()
+    send_mails(mailbox=mailbox, mails=2)
+    assert campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today()) == 1
+    send_mails(mailbox=mailbox, mails=1)
+    campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+    campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+
+    assert get_report_counts() == (3, 3)
+    assert MailboxCheckpoint.objects.get(receiver_email=RECEIVER_EMAIL).mailbox_uids == {"Inbox": [1, 3]}
+
+
+@pytest.mark.django_db
+def test_full_pass_of_today_does_not_double_refreshed_counts(mailbox):
+    campaign_app_services = CampaignAppServices()
+    send_mails(mailbox=mailbox, mails=1)
+    campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+    send_mails(mailbox=mailbox, mails=1)
+    campaign_app_services.create_campaign_reports_by_log_records(report_date=datetime.date.today())
+    send_mails(mailbox=mailbox, mails=1)
+    campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+
+    assert get_report_counts() == (3, 3)
+
+
+@pytest.mark.django_db
+def test_save_campaign_reports_refuses_to_overwrite_refreshed_reports(mailbox):
+    with pytest.raises(CampaignReportRefreshException):
+        CampaignAppServices().save_campaign_reports(report_date=datetime.date.today(), mail_placements=list())
+
+
+@pytest.mark.django_db
+def test_refresh_is_dropped_when_checkpoint_moves_during_mailbox_scan(mailbox):
+    campaign_app_services = CampaignAppServices()
+    send_mails(mailbox=mailbox, mails=2)
+
+    def refresh_meanwhile():
+        mailbox.on_scan = None
+        campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+
+    mailbox.on_scan = refresh_meanwhile
+    assert campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today()) == 0
+    campaign_app_services.refresh_campaign_reports(report_date=datetime.date.today())
+
+    assert get_report_counts() == (2, 2)
+    assert RecordLogCheckpoint.objects.get(file_date=datetime.date.today()).offset > 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("refresh_task", [tasks.refresh_campaign_reports, tasks.create_campaign_reports_by_log_records])
+def test_refresh_of_today_queues_reputation_alerts_once(mailbox, monkeypatch, refresh_task):
+    monkeypatch.setattr(refresh_task.app.conf, "task_always_eager", True)
+    # Mails which never Arrived drop the Reputation of the Campaign Email below the Alert Threshold
+    send_mails(mailbox=mailbox, mails=2, delivered=False)
+    refresh_task()
+    send_mails(mailbox=mailbox, mails=1, delivered=False)
+    refresh_task()
+
+    assert CampaignReport.objects.get(email=CAMPAIGN_EMAIL, report_date=datetime.date.today()).reputation_ratio == 0
+    assert list(EmailOutbox.objects.values_list("idempotency_key", "to_email")) == [
+        (f"reputation-alert:{datetime.date.today().strftime('%Y-%m-%d')}:{CAMPAIGN_EMAIL}", CAMPAIGN_EMAIL)]
+
+
+@pytest.mark.django_db
+def test_receiver_whose_mailbox_can_not_be_scanned_is_left_out_of_campaign_reports(mailbox, monkeypatch):
+    campaign_app_services = CampaignAppServices()
+    yesterday = datetime.date.today() - datetime.timedelta(days=1)
+    monkeypatch.setattr(CampaignAppServices, "decrypt_app_password", lambda self, encrypted_app_password: "secret")
+    monkeypatch.setattr(IMAPServices, "count_mail_placements_by_senders",
+                        lambda self, sender_emails, since, before: None)
+    send_mails(mailbox=mailbox, mails=2, send_date=yesterday)
+
+    with pytest.raises(MailPlacementScanException):
+        campaign_app_services.scan_mail_placements_by_receiver(
+            receiver_email=RECEIVER_EMAIL, sent_mails_by_sender={CAMPAIGN_EMAIL: 2}, report_date=yesterday)
+    campaign_app_services.create_campaign_reports_by_log_records(report_date=yesterday)
+
+    assert not CampaignReport.objects.filter(report_date=yesterday).exists()
+
+
+@pytest.mark.django_db
+def test_scan_task_retries_and_leaves_out_receiver_whose_mailbox_can_not_be_scanned(mailbox, monkeypatch):
+    monkeypatch.setattr(tasks.save_campaign_reports.app.conf, "task_always_eager", True)
+    monkeypatch.setattr(CampaignAppServices, "decrypt_app_password", lambda self, encrypted_app_password: "secret")
+    scans = list()
+    monkeypatch.setattr(IMAPServices, "count_mail_placements_by_senders",
+                        lambda self, sender_emails, since, before: scans.append(sender_emails))
+    yesterday_string = (datetime.date.today() - datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+
+    # Eager Retries run right away
+    receiver_mail_placements = tasks.scan_mail_placements_by_receiver.apply(kwargs={
+        "receiver_email": RECEIVER_EMAIL, "sent_mails_by_sender": {CAMPAIGN_EMAIL: 2},
+        "report_date_string": yesterday_string}).get()
+    assert receiver_mail_placements is None
+    assert len(scans) == tasks.scan_mail_placements_by_receiver.max_retries + 1
+    tasks.save_campaign_reports(receiver_mail_placements=[receiver_mail_placements, [
+        {"sender_email": CAMPAIGN_EMAIL, "total_emails_sent": 1, "inbox_count": 1, "category_count": 0,
+         "spam_count": 0}]], report_date_string=yesterday_string)
+
+    campaign_report = CampaignReport.objects.get(email=CAMPAIGN_EMAIL, report_date=yesterday_string)
+    assert (campaign_report.total_emails_sent, campaign_report.inbox_count, campaign_report.inbox_ratio) == (1, 1, 100)
@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+
+from embermail.application.campaigns.services import CampaignAppServices
+from embermail.domain.campaigns.models import SendLedger
+
+SENDER_EMAIL = "warmup@gmail.com"
+SEND_DATE = datetime.date(2023, 8, 1)
+
+
+@pytest.mark.django_db
+def test_reserve_sent_mail_by_sender_email_counts_mails_up_to_the_limit():
+    campaign_app_services = CampaignAppServices()
+
+    assert [campaign_app_services.reserve_sent_mail_by_sender_email(
+        sender_email=SENDER_EMAIL, send_date=SEND_DATE, max_sent_mails=2) for _ in range(3)] == [1, 2, None]
+    assert SendLedger.objects.get(sender_email=SENDER_EMAIL, send_date=SEND_DATE).total_sent_mails == 2
+
+
+@pytest.mark.django_db
+def test_reserve_sent_mail_by_sender_email_counts_days_and_senders_apart():
+    campaign_app_services = CampaignAppServices()
+    campaign_app_services.reserve_sent_mail_by_sender_email(sender_email=SENDER_EMAIL, send_date=SEND_DATE,
+                                                            max_sent_mails=1)
+
+    assert campaign_app_services.reserve_sent_mail_by_sender_email(
+        sender_email=SENDER_EMAIL, send_date=SEND_DATE + datetime.timedelta(days=1), max_sent_mails=1) == 1
+    assert campaign_app_services.reserve_sent_mail_by_sender_email(
+        sender_email="other@gmail.com", send_date=SEND_DATE, max_sent_mails=1) == 1
+
+
+@pytest.mark.django_db
+def test_release_sent_mail_by_sender_email_frees_a_reserved_mail():
+    campaign_app_services = CampaignAppServices()
+    campaign_app_services.reserve_sent_mail_by_sender_email(sender_email=SENDER_EMAIL, send_date=SEND_DATE,
+                                                            max_sent_mails=1)
+    campaign_app_services.release_sent_mail_by_sender_email(sender_email=SENDER_EMAIL, send_date=SEND_DATE)
+
+    assert campaign_app_services.reserve_sent_mail_by_sender_email(
+        sender_email=SENDER_EMAIL, send_date=SEND_DATE, max_sent_mails=1) == 1
+    # Releasing never Counts below Zero
+    for _ in range(2):
+        campaign_app_services.release_sent_mail_by_sender_email(sender_email=SENDER_EMAIL, send_date=SEND_DATE)
+    assert SendLedger.objects.get(sender_email=SENDER_EMAIL, send_date=SEND_DATE).total_sent_mails == 0
@@ -0,0 +1,224 @@
+import uuid
+import asyncio
+import smtplib
+import datetime
+import threading
+
+import pytest
+import aiosmtplib
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+
+from embermail.application.campaigns.services import CampaignAppServices
+from embermail.application.templates.services import TemplateAppServices
+from embermail.domain.campaigns.models import Campaign, DomainList, WarmupSend
+from embermail.domain.templates.models import Template, Thread
+from embermail.domain.text_choices import WarmupSendStatusChoices, WarmupSendDirectionChoices, \
+    CampaignActionRequiredChoices
+from embermail.infrastructure.mailer_sevices.smtp.services import SMTPServices, AsyncSMTPServices, \
+    smtp_connection_pool
+from embermail.infrastructure.mailer_sevices.stub.services import StubMailStore, StubSMTPServer
+
+
+def create_warmup_send(thread_key: uuid.UUID, thread_index: int, send_in: int,
+                       status: str = WarmupSendStatusChoices.PENDING, **fields) -> WarmupSend:
+    warmup_send_fields = dict(
+        campaign_id=uuid.uuid4(), domain_list_id=uuid.uuid4(), thread_key=thread_key, template_id=uuid.uuid4(),
+        thread_index=thread_index, direction=WarmupSendDirectionChoices.TO_RECEIVER,
+        from_email="campaign@gmail.com", to_email="receiver@outlook.com", template_subject="Subject",
+        total_mails_to_send=10, message_id=f"<{uuid.uuid4().hex}@gmail.com>",
+        send_at=timezone.now() + datetime.timedelta(seconds=send_in), status=status)
+    warmup_send_fields.update(fields)
+    return WarmupSend.objects.create(**warmup_send_fields)
+
+
+@pytest.fixture
+def stub_smtp_server(tmp_path, monkeypatch):
+    # Record Logs are Written Relative to the Working Directory
+    monkeypatch.chdir(tmp_path)
+    mail_store = StubMailStore()
+    loop = asyncio.new_event_loop()
+    smtp_server = StubSMTPServer(mail_store=mail_store)
+    loop.run_until_complete(smtp_server.start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    smtp_sessions = list()
+
+    def set_smtp_server_configurations(smtp_services: SMTPServices) -> smtplib.SMTP:
+        server = smtplib.SMTP(smtp_server.host, smtp_server.port)
+        server.login(smtp_services.username, smtp_services.password)
+        smtp_sessions.append(smtp_services.username)
+        return server
+
+    async def set_async_smtp_server_configurations(smtp_services: AsyncSMTPServices) -> aiosmtplib.SMTP:
+        server = aiosmtplib.SMTP(hostname=smtp_server.host, port=smtp_server.port, start_tls=False)
+        await server.connect()
+        await server.login(smtp_services.username, smtp_services.password)
+        smtp_sessions.append(smtp_services.username)
+        return server
+
+    monkeypatch.setattr(SMTPServices, "set_smtp_server_configurations", set_smtp_server_configurations)
+    monkeypatch.setattr(AsyncSMTPServices, "set_smtp_server_configurations", set_async_smtp_server_configurations)
+    yield mail_store, smtp_sessions
+    smtp_connection_pool.close_all()
+    asyncio.run_coroutine_threadsafe(smtp_server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def create_warmup_thread(campaign_email: str, domain_list: DomainList, mails: int) -> list:
+    """
+    Warmup Sends of the first Mail of Threads from a Warmup Email, all Due
+    """
+    campaign_app_services = CampaignAppServices()
+    campaign = Campaign.objects.create(email=campaign_email, email_service_provider="gmail", is_stopped=False,
+                                       app_password=campaign_app_services.encrypt_app_password(app_password="secret"))
+    template = Template.objects.create(name="Template", subject="Subject", thread_count=1)
+    Thread.objects.create(template_id=template.id, body="Hi {{test_user2}}, {{test_user1}} here",
+                          thread_ordering_number=1)
+    return [create_warmup_send(thread_key=uuid.uuid4(), thread_index=0, send_in=-60 + index, campaign_id=campaign.id,
+                               domain_list_id=domain_list.id, template_id=template.id, from_email=campaign_email,
+                               to_email=domain_list.email, warmup_email_name="Warmer") for index in range(mails)]
+
+
+@pytest.mark.django_db
+def test_dispatch_due_warmup_sends_claims_due_sends_by_send_time():
+    latest = create_warmup_send(thread_key=uuid.uuid4(), thread_index=0, send_in=-10)
+    earliest = create_warmup_send(thread_key=uuid.uuid4(), thread_index=0, send_in=-30)
+    middle = create_warmup_send(thread_key=uuid.uuid4(), thread_index=0, send_in=-20)
+    create_warmup_send(thread_key=uuid.uuid4(), thread_index=0, send_in=600)
+
+    assert CampaignAppServices().dispatch_due_warmup_sends(batch_size=2) == [earliest.id, middle.id]
+    assert CampaignAppServices().dispatch_due_warmup_sends(batch_size=2) == [latest.id]
+    earliest.refresh_from_db()
+    assert earliest.status == WarmupSendStatusChoices.DISPATCHED
+    assert earliest.attempts == 1
+
+
+@pytest.mark.django_db
+def test_dispatch_due_warmup_sends_waits_for_previous_mail_of_thread():
+    thread_key = uuid.uuid4()
+    first = create_warmup_send(thread_key=thread_key, thread_index=0, send_in=-30)
+    reply = create_warmup_send(thread_key=thread_key, thread_index=1, send_in=-20)
+    campaign_app_services = CampaignAppServices()
+
+    assert campaign_app_services.dispatch_due_warmup_sends(batch_size=10) == [first.id]
+    assert campaign_app_services.dispatch_due_warmup_sends(batch_size=10) == []
+    campaign_app_services.finish_warmup_send(warmup_send_id=first.id, thread_key=thread_key, thread_index=0,
+                                             status=WarmupSendStatusChoices.SENT)
+    assert campaign_app_services.dispatch_due_warmup_sends(batch_size=10) == [reply.id]
+
+
+@pytest.mark.django_db
+def test_send_warmup_send_leaves_send_pending_while_sending_is_disabled(settings):
+    settings.ENABLE_SEND_MAILS_FOR_WARMUP = False
+    thread_key = uuid.uuid4()
+    create_warmup_send(thread_key=thread_key, thread_index=0, send_in=-30)
+    reply = create_warmup_send(thread_key=thread_key, thread_index=1, send_in=-20)
+    campaign_app_services = CampaignAppServices()
+    [warmup_send_id] = campaign_app_services.dispatch_due_warmup_sends(batch_size=10)
+
+    campaign_app_services.send_warmup_send(warmup_send_id=warmup_send_id)
+
+    warmup_send = WarmupSend.objects.get(id=warmup_send_id)
+    assert (warmup_send.status, warmup_send.attempts) == (WarmupSendStatusChoices.PENDING, 0)
+    reply.refresh_from_db()
+    assert reply.status == WarmupSendStatusChoices.PENDING
+
+
+@pytest.mark.django_db
+def test_send_warmup_sends_sends_mails_of_each_sender_over_one_smtp_session(stub_smtp_server):
+    mail_store, smtp_sessions = stub_smtp_server
+    domain_list = DomainList.objects.create(email="receiver@outlook.com", app_password="encrypted",
+                                            email_service_provider="outlook")
+    create_warmup_thread(campaign_email="first@gmail.com", domain_list=domain_list, mails=3)
+    create_warmup_thread(campaign_email="second@gmail.com", domain_list=domain_list, mails=2)
+    campaign_app_services = CampaignAppServices()
+    warmup_send_ids_by_sender = campaign_app_services.dispatch_due_warmup_sends_by_sender(batch_size=10)
+    assert sorted(len(sender_warmup_send_ids) for sender_warmup_send_ids in warmup_send_ids_by_sender) == [2, 3]
+
+    send_results = dict()
+    for sender_warmup_send_ids in warmup_send_ids_by_sender:
+        send_results.update(campaign_app_services.send_warmup_sends(warmup_send_ids=sender_warmup_send_ids))
+
+    assert set(send_results.values()) == {"Mail Sent"}
+    assert sorted(smtp_sessions) == ["first@gmail.com", "second@gmail.com"]
+    assert set(WarmupSend.objects.values_list("status", flat=True)) == {WarmupSendStatusChoices.SENT}
+    assert len(mail_store.messages) == 5
+    assert "<b>receiver</b>, <b>Warmer</b> here" in mail_store.messages[0]["raw"].decode("utf-8")
+    assert campaign_app_services.calculate_total_sent_mails_by_sender_email(
+        file_date=datetime.date.today(), sender_email="first@gmail.com") == 3
+
+
+@pytest.mark.django_db
+def test_send_warmup_sends_concurrently_resolves_credentials_from_ids(stub_smtp_server):
+    mail_store, smtp_sessions = stub_smtp_server
+    domain_list = DomainList.objects.create(email="receiver@outlook.com", app_password="encrypted",
+                                            email_service_provider="outlook")
+    create_warmup_thread(campaign_email="first@gmail.com", domain_list=domain_list, mails=2)
+    create_warmup_thread(campaign_email="second@gmail.com", domain_list=domain_list, mails=1)
+    campaign_app_services = CampaignAppServices()
+    warmup_send_ids = campaign_app_services.dispatch_due_warmup_sends(batch_size=10)
+
+    send_results = campaign_app_services.send_warmup_sends_concurrently(warmup_send_ids=warmup_send_ids,
+                                                                        max_concurrency=2)
+
+    assert send_results == {warmup_send_id: "Mail Sent" for warmup_send_id in warmup_send_ids}
+    assert sorted(smtp_sessions) == ["first@gmail.com", "second@gmail.com"]
+    assert len(mail_store.messages) == 3
+    assert set(WarmupSend.objects.values_list("status", flat=True)) == {WarmupSendStatusChoices.SENT}
+
+
+@pytest.mark.django_db
+def test_planned_warmup_sends_render_thread_bodies_without_reading_threads(stub_smtp_server):
+    mail_store, _ = stub_smtp_server
+    campaign_app_services = CampaignAppServices()
+    Campaign.objects.create(email="warmup@gmail.com", email_service_provider="gmail", is_stopped=False,
+                            plan_id=uuid.uuid4(), mails_to_be_sent=1, max_email_per_day=1, email_step_up=1,
+                            action_required=CampaignActionRequiredChoices.NONE,
+                            app_password=campaign_app_services.encrypt_app_password(app_password="secret"))
+    DomainList.objects.create(email="receiver@outlook.com", app_password="encrypted", email_service_provider="outlook")
+    template = Template.objects.create(name="Template", subject="Subject", is_general=True, thread_count=2)
+    threads = [Thread.objects.create(template_id=template.id, body=f"Mail {number} to {{{{test_user2}}}}",
+                                     thread_ordering_number=number) for number in (1, 2)]
+
+    assert campaign_app_services.plan_warmup_sends() == 2
+    warmup_sends = list(WarmupSend.objects.order_by("thread_index"))
+    assert [(warmup_send.thread_id, warmup_send.thread_updated_at) for warmup_send in warmup_sends] == [
+        (thread.id, thread.updated_at) for thread in threads]
+
+    WarmupSend.objects.update(send_at=timezone.now())
+    [warmup_send_id] = campaign_app_services.dispatch_due_warmup_sends(batch_size=10)
+    TemplateAppServices.compile_thread_body(thread_id=threads[0].id, updated_at=threads[0].updated_at)
+    with CaptureQueriesContext(connection) as captured_queries:
+        assert campaign_app_services.send_warmup_send(warmup_send_id=warmup_send_id) == "Mail Sent"
+
+    assert not [query for query in captured_queries.captured_queries if '"thread"' in query["sql"]]
+    assert "Mail 1 to <b>receiver</b>" in mail_store.messages[0]["raw"].decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_warmup_send_of_updated_or_deleted_thread_sends_current_body_or_is_skipped(stub_smtp_server):
+    mail_store, _ = stub_smtp_server
+    domain_list = DomainList.objects.create(email="receiver@outlook.com", app_password="encrypted",
+                                            email_service_provider="outlook")
+    updated, deleted = create_warmup_thread(campaign_email="warmup@gmail.com", domain_list=domain_list, mails=2)
+    thread = Thread.objects.get()
+    planned_updated_at = thread.updated_at
+    WarmupSend.objects.update(thread_id=thread.id, thread_updated_at=planned_updated_at)
+    thread.body = "Updated Body to {{test_user2}}"
+    thread.save()
+    assert thread.updated_at != planned_updated_at
+    campaign_app_services = CampaignAppServices()
+    campaign_app_services.dispatch_due_warmup_sends(batch_size=10)
+
+    assert campaign_app_services.send_warmup_send(warmup_send_id=updated.id) == "Mail Sent"
+    thread.delete()
+    assert campaign_app_services.send_warmup_send(warmup_send_id=deleted.id) == \
+        "Thread of the Warmup Send was Deleted."
+
+    assert "Updated Body to <b>receiver</b>" in mail_store.messages[0]["raw"].decode("utf-8")
+    assert len(mail_store.messages) == 1
+    assert dict(WarmupSend.objects.values_list("id", "status")) == {
+        updated.id: WarmupSendStatusChoices.SENT, deleted.id: WarmupSendStatusChoices.SKIPPED}
+    assert campaign_app_services.calculate_total_sent_mails_by_sender_email(
+        file_date=datetime.date.today(), sender_email="warmup@gmail.com") == 1
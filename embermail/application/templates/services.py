@@ -1,12 +1,16 @@
 import uuid
+import datetime
 
 from uuid import UUID
+from functools import lru_cache
+from typing import Dict, Tuple
 
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Q, F, Count
 from django.db import transaction
 from django.db.models.query import QuerySet
 
-from embermail.domain.templates.models import Thread, Template, TemplateData, ThreadData
+from embermail.domain.templates.models import Thread, Template, TemplateData, ThreadData, ThreadBodyTemplate
 from utils.django.exceptions import TemplateDoesNotExist, ThreadDoesNotExist, TemplateThreadAccessDenied, \
     TemplateAlreadyExist
 from embermail.domain.templates.services import ThreadServices, TemplateServices
@@ -176,21 +180,25 @@ class TemplateAppServices:
                 template_subject = default_template_instance.subject
                 template_data = TemplateData(name=template_name, subject=template_subject, warmup_email=warmup_email,
                                              user_id=user_id, master_user_id=master_user_id, is_selected=True)
-                template_instance, created = self.template_services.get_template_factory().get_entity_with_get_or_create(
-                    template_data=template_data)
-                if created:
-                    # Create Threads for new Created Template
-                    default_threads_list = self.list_threads_by_template_id(template_id=uuid.UUID(default_template_id))
-                    threads_list = []
-                    for thread in default_threads_list:
-                        thread_data = ThreadData(template_id=template_instance.id, body=thread.body,
-                                                 thread_ordering_number=thread.thread_ordering_number)
-                        thread_instance = self.thread_services.get_thread_factory().build_entity_with_id(
-                            thread_data=thread_data)
-                        threads_list.append(thread_instance)
-                    Thread.objects.bulk_create(threads_list)
-                    return True
-                return False
+                with transaction.atomic():
+                    template_instance, created = self.template_services.get_template_factory().get_entity_with_get_or_create(
+                        template_data=template_data)
+                    if created:
+                        # Create Threads for new Created Template
+                        default_threads_list = self.list_threads_by_template_id(
+                            template_id=uuid.UUID(default_template_id))
+                        threads_list = []
+                        for thread in default_threads_list:
+                            thread_data = ThreadData(template_id=template_instance.id, body=thread.body,
+                                                     thread_ordering_number=thread.thread_ordering_number)
+                            thread_instance = self.thread_services.get_thread_factory().build_entity_with_id(
+                                thread_data=thread_data)
+                            threads_list.append(thread_instance)
+                        Thread.objects.bulk_create(threads_list)
+                        self.list_templates().filter(id=template_instance.id).update(
+                            thread_count=F('thread_count') + len(threads_list))
+                        return True
+                    return False
 
         except Exception as e:
             raise e
@@ -242,7 +250,58 @@ class TemplateAppServices:
         """
         Returns Total Threads in a Template by Template ID
         """
-        return int(self.list_threads_by_template_id(template_id=template_id).count())
+        return int(self.list_templates().filter(id=template_id).values_list('thread_count', flat=True).first() or 0)
+
+    def list_template_thread_count_mismatches(self) -> Dict[UUID, Tuple[int, int]]:
+        """
+        List Templates whose thread_count does not Match their Threads as {template_id: (thread_count, threads)}
+        """
+        threads_by_template_id = dict(self.list_threads().order_by().values('template_id').annotate(
+            threads=Count('id')).values_list('template_id', 'threads'))
+        return {template_id: (thread_count, threads_by_template_id.get(template_id, 0)) for template_id, thread_count in
+                self.list_templates().values_list('id', 'thread_count') if
+                thread_count != threads_by_template_id.get(template_id, 0)}
+
+    def sync_template_thread_counts(self) -> Dict[UUID, Tuple[int, int]]:
+        """
+        Set thread_count of Templates to their Counted Threads and Returns the Corrected Templates
+        """
+        with transaction.atomic():
+            thread_count_mismatches = self.list_template_thread_count_mismatches()
+            for template_id, (_, threads) in thread_count_mismatches.items():
+                self.list_templates().filter(id=template_id).update(thread_count=threads)
+        return thread_count_mismatches
+
+    @staticmethod
+    @lru_cache(maxsize=int(getattr(settings, "THREAD_BODY_TEMPLATE_CACHE_SIZE", 1024)))
+    def compile_thread_body(thread_id: UUID, updated_at: datetime.datetime) -> ThreadBodyTemplate:
+        """
+        Compile Body of a Thread, Cached by Thread ID and updated_at so an Updated Body is Compiled again
+        Raises ThreadDoesNotExist when the Thread was Updated since updated_at or Deleted
+        """
+        body = ThreadServices.get_thread_repo().filter(id=thread_id, updated_at=updated_at).values_list(
+            'body', flat=True).first()
+        if body is None:
+            raise ThreadDoesNotExist(message="Thread was Updated or Deleted.",
+                                     item={'thread_id': str(thread_id), 'updated_at': str(updated_at)})
+        return ThreadBodyTemplate.compile(body=body)
+
+    def get_current_thread_body_template(self, thread_id: UUID) -> ThreadBodyTemplate:
+        """
+        Get Compiled Current Body of a Thread, Raises ThreadDoesNotExist when the Thread was Deleted
+        """
+        updated_at = self.list_threads().filter(id=thread_id).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            raise ThreadDoesNotExist(message="Thread not Found.", item={'thread_id': str(thread_id)})
+        return self.compile_thread_body(thread_id=thread_id, updated_at=updated_at)
+
+    def get_thread_body_template(self, template_id: UUID, thread_index: int) -> ThreadBodyTemplate:
+        """
+        Get Compiled Body of the Thread at thread_index of a Template, the Body is only Read when not Cached
+        """
+        thread_id, updated_at = self.list_threads_by_template_id(template_id=template_id).order_by(
+            'thread_ordering_number').values_list('id', 'updated_at')[thread_index]
+        return self.compile_thread_body(thread_id=thread_id, updated_at=updated_at)
 
     def check_user_can_update_delete_thread(self, template_id: str, user_id: str) -> bool:
         """
@@ -261,10 +320,12 @@ class TemplateAppServices:
             with transaction.atomic():
                 template_id = uuid.UUID(thread_data_dict.get("template_id"))
                 body = thread_data_dict.get("body")
+                # Incrementing the Count locks the Template, so Concurrent Creates get Distinct Ordering Numbers
+                if not self.list_templates().filter(id=template_id).update(thread_count=F('thread_count') + 1):
+                    raise TemplateDoesNotExist(message="Template not Found.", item={'error': str(template_id)})
                 thread_counts = self.get_thread_count_in_template(template_id=template_id)
 
-                thread_data = ThreadData(template_id=template_id, body=body,
-                                         thread_ordering_number=int(thread_counts) + 1)
+                thread_data = ThreadData(template_id=template_id, body=body, thread_ordering_number=int(thread_counts))
                 thread_instance = self.thread_services.get_thread_factory().build_entity_with_id(
                     thread_data=thread_data)
                 thread_instance.save()
@@ -302,9 +363,12 @@ class TemplateAppServices:
                 template_id = thread_data_dict.get('template_id')
                 user_id = thread_data_dict.get('user_id')
                 if self.check_user_can_update_delete_thread(template_id=template_id, user_id=user_id):
-                    thread_counts = self.get_thread_count_in_template(template_id=template_id)
                     thread_instance = self.get_thread_by_id(id=uuid.UUID(thread_id))
-                    if int(thread_instance.thread_ordering_number) == thread_counts:
+                    # Only the Last Thread is Deleted, the Count is Decremented only if it still is the Last one
+                    if self.list_templates().filter(
+                            id=thread_instance.template_id,
+                            thread_count=int(thread_instance.thread_ordering_number)).update(
+                            thread_count=F('thread_count') - 1):
                         thread_instance.delete()
                     return None
                 raise TemplateThreadAccessDenied(message="Access Denied.",
@@ -1,25 +1,30 @@
 import uuid
 import datetime
 from uuid import UUID
-from typing import Optional
+from typing import Optional, List
+from itertools import groupby
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from django.db.models.query import QuerySet
 from django.utils.timezone import make_aware
 from django.contrib.auth import authenticate
 
 from embermail.application.users import signals
-from embermail.infrastructure.mailer_sevices.services import sendgrid_mail
+from embermail.domain.text_choices import EmailOutboxStatusChoices
+from embermail.infrastructure.mailer_sevices.services import sendgrid_client, SENDGRID_MAX_PERSONALIZATIONS
 from utils.django.regex import validate_email_by_regex, validate_password_by_regex
 from utils.data_manipulation.type_conversion import encode_by_base64, decode_by_base64
-from embermail.domain.users.services import UserServices, ForgotPasswordServices, VisitedUserServices, InquiryServices
+from embermail.domain.users.services import UserServices, ForgotPasswordServices, VisitedUserServices, \
+    InquiryServices, EmailOutboxServices
 from embermail.domain.users.models import User, ForgotPassword, UserPersonalData, UserBasePermissions, VisitedUser, \
-    Inquiry
+    Inquiry, EmailOutbox, EmailOutboxData
 from utils.django.exceptions import StripeCustomerException, UserDoesNotExist, ForgotPasswordInstanceDoesNotExist, \
     UserAlreadyExist, UserRegistrationException, UserLoginException, InvalidCredentialsException, ValidationException, \
     UserDoesNotVerified, ForgotPasswordException, ForgotPasswordLinkExpired, VisitedUserCreationException, \
-    InquiryException, InquiryDoesNotExist
+    InquiryException, InquiryDoesNotExist, SendgridEmailException
 
 
 class UserAppServices:
@@ -27,6 +32,7 @@ class UserAppServices:
     forgot_password_services = ForgotPasswordServices()
     visited_user_services = VisitedUserServices()
     inquiry_services = InquiryServices()
+    email_outbox_services = EmailOutboxServices()
 
     # =====================================================================================
     # USER
@@ -170,8 +176,8 @@ class UserAppServices:
             'date_time': datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S"),
             'verification_link': verification_link
         }
-        sendgrid_mail(to_email=user.email, TEMPLATE_KEY=sendgrid_email_verification_template_id,
-                      dynamic_data_for_template=template_data)
+        self.enqueue_email(to_email=user.email, template_id=sendgrid_email_verification_template_id,
+                           dynamic_template_data=template_data)
         return None
 
     def verify_user_by_verification_link(self, encoded_user_id: str) -> User:
@@ -258,8 +264,8 @@ class UserAppServices:
                     'reset_password_link': forgot_password_url
                 }
                 sendgrid_forgot_password_template_id = getattr(settings, "SENDGRID_FORGOT_PASSWORD_TEMPLATE_KEY", None)
-                sendgrid_mail(to_email=email, TEMPLATE_KEY=sendgrid_forgot_password_template_id,
-                              dynamic_data_for_template=template_data)
+                self.enqueue_email(to_email=email, template_id=sendgrid_forgot_password_template_id,
+                                   dynamic_template_data=template_data, idempotency_key=f"forgot-password:{token}")
                 return forgot_password_instance
         except Exception as e:
             raise e
@@ -321,8 +327,9 @@ class UserAppServices:
             sendgrid_forgot_password_completed_template_id = getattr(settings,
                                                                      "SENDGRID_FORGOT_PASSWORD_COMPLETED_TEMPLATE_KEY",
                                                                      None)
-            sendgrid_mail(to_email=user.email, TEMPLATE_KEY=sendgrid_forgot_password_completed_template_id,
-                          dynamic_data_for_template=template_data)
+            self.enqueue_email(to_email=user.email, template_id=sendgrid_forgot_password_completed_template_id,
+                               dynamic_template_data=template_data,
+                               idempotency_key=f"forgot-password-completed:{password_token}")
         except Exception as e:
             raise e
 
@@ -406,3 +413,95 @@ class UserAppServices:
                 return inquiry_instance
         except Exception as e:
             raise e
+
+    # =====================================================================================
+    # EMAIL OUTBOX
+    # =====================================================================================
+    def enqueue_email(self, to_email: str, template_id: str, dynamic_template_data: dict,
+                      idempotency_key: str = None) -> EmailOutbox:
+        """
+        Queue a Transactional Mail to the Email Outbox in the Caller's Transaction, it is Sent by drain_email_outbox
+        A Mail with an already Queued Idempotency Key is not Queued again
+        """
+        email_outbox_data = EmailOutboxData(idempotency_key=idempotency_key or str(uuid.uuid4()), to_email=to_email,
+                                            template_id=template_id, dynamic_template_data=dynamic_template_data)
+        email_outbox_instance, _ = self.email_outbox_services.get_email_outbox_factory().get_entity_with_get_or_create(
+            email_outbox_data=email_outbox_data)
+        return email_outbox_instance
+
+    def enqueue_emails(self, emails_data: List[EmailOutboxData]) -> None:
+        """
+        Queue many Transactional Mails to the Email Outbox by one Query, already Queued Idempotency Keys are Skipped
+        """
+        email_outbox_factory = self.email_outbox_services.get_email_outbox_factory()
+        self.email_outbox_services.get_email_outbox_repo().bulk_create(
+            [email_outbox_factory.build_entity_with_id(email_outbox_data=email_outbox_data) for email_outbox_data in
+             emails_data], ignore_conflicts=True)
+
+    def requeue_stale_emails(self, sending_timeout: int) -> int:
+        """
+        Requeue Mails left Sending by a Worker which Died, Returns Total Requeued Mails
+        """
+        stale_before = timezone.now() - datetime.timedelta(seconds=sending_timeout)
+        return self.email_outbox_services.get_email_outbox_repo().filter(
+            status=EmailOutboxStatusChoices.SENDING, updated_at__lt=stale_before).update(
+            status=EmailOutboxStatusChoices.PENDING, updated_at=timezone.now())
+
+    def drain_email_outbox(self, batch_size: int, max_attempts: int, retry_delay: int) -> int:
+        """
+        Send Due Mails of the Email Outbox, Mails of one Template are Sent together by SendGrid Batch Requests
+        Failed Mails are Retried with Exponential Backoff up to max_attempts, Returns Total Sent Mails
+        """
+        email_outbox_repo = self.email_outbox_services.get_email_outbox_repo()
+        now = timezone.now()
+        with transaction.atomic():
+            # Workers Draining at the same time Claim different Mails
+            email_outbox_ids = list(email_outbox_repo.select_for_update(skip_locked=True).filter(
+                status=EmailOutboxStatusChoices.PENDING, next_attempt_at__lte=now).order_by(
+                'next_attempt_at').values_list('id', flat=True)[:batch_size])
+            email_outbox_repo.filter(id__in=email_outbox_ids).update(
+                status=EmailOutboxStatusChoices.SENDING, attempts=F('attempts') + 1, updated_at=now)
+        emails = sorted(email_outbox_repo.filter(id__in=email_outbox_ids),
+                        key=lambda email_outbox: email_outbox.template_id or "")
+
+        total_sent_mails = 0
+        for template_id, template_emails in groupby(emails, key=lambda email_outbox: email_outbox.template_id or ""):
+            template_emails = list(template_emails)
+            for index in range(0, len(template_emails), SENDGRID_MAX_PERSONALIZATIONS):
+                total_sent_mails += self.__send_email_outbox_batch(
+                    template_id=template_id or None, batch=template_emails[index:index + SENDGRID_MAX_PERSONALIZATIONS],
+                    max_attempts=max_attempts, retry_delay=retry_delay)
+        return total_sent_mails
+
+    def __send_email_outbox_batch(self, template_id: Optional[str], batch: list, max_attempts: int,
+                                  retry_delay: int) -> int:
+        """
+        Send Outbox Mails of one Template by one SendGrid Batch Request, Returns Total Sent Mails
+        A Batch Rejected for good is Split in Halves, so only its Rejected Mails are Failed
+        """
+        email_outbox_repo = self.email_outbox_services.get_email_outbox_repo()
+        try:
+            sendgrid_client.send_batch(template_id=template_id, personalizations=[
+                {"to_email": email_outbox.to_email,
+                 "dynamic_template_data": email_outbox.dynamic_template_data,
+                 "custom_args": {"email_outbox_id": str(email_outbox.id)}} for email_outbox in batch])
+        except SendgridEmailException as e:
+            if not e.item.get('retryable') and len(batch) > 1:
+                middle = len(batch) // 2
+                return self.__send_email_outbox_batch(template_id=template_id, batch=batch[:middle],
+                                                      max_attempts=max_attempts, retry_delay=retry_delay) + \
+                    self.__send_email_outbox_batch(template_id=template_id, batch=batch[middle:],
+                                                   max_attempts=max_attempts, retry_delay=retry_delay)
+            for email_outbox in batch:
+                email_outbox.error = str(e.item.get('error'))
+                if e.item.get('retryable') and email_outbox.attempts < max_attempts:
+                    email_outbox.status = EmailOutboxStatusChoices.PENDING
+                    email_outbox.next_attempt_at = timezone.now() + datetime.timedelta(
+                        seconds=retry_delay * 2 ** (email_outbox.attempts - 1))
+                else:
+                    email_outbox.status = EmailOutboxStatusChoices.FAILED
+            email_outbox_repo.bulk_update(batch, fields=["status", "next_attempt_at", "error", "updated_at"])
+            return 0
+        email_outbox_repo.filter(id__in=[email_outbox.id for email_outbox in batch]).update(
+            status=EmailOutboxStatusChoices.SENT, sent_at=timezone.now(), error=None, updated_at=timezone.now())
+        return len(batch)
@@ -0,0 +1,101 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from embermail.application.users.services import UserAppServices
+from embermail.domain.users.models import EmailOutbox, EmailOutboxData
+from embermail.domain.text_choices import EmailOutboxStatusChoices
+from embermail.infrastructure.mailer_sevices.services import sendgrid_client
+from utils.django.exceptions import SendgridEmailException
+
+RETRY_DELAY = 60
+
+
+class FakeSendGrid:
+    """
+    Records SendGrid Batch Requests and Rejects them by the Given Errors
+    """
+
+    def __init__(self):
+        self.requests = list()
+        self.retryable_failures = 0
+        self.invalid_emails = set()
+
+    def send_batch(self, template_id: str, personalizations: list):
+        self.requests.append((template_id, [personalization["to_email"] for personalization in personalizations]))
+        if self.retryable_failures:
+            self.retryable_failures -= 1
+            raise SendgridEmailException(message="Something went wrong in sending mails.",
+                                         item={'error': "Service Unavailable", 'status_code': 503, 'retryable': True})
+        if self.invalid_emails & {personalization["to_email"] for personalization in personalizations}:
+            raise SendgridEmailException(message="Something went wrong in sending mails.",
+                                         item={'error': "Invalid Email", 'status_code': 400, 'retryable': False})
+
+
+@pytest.fixture
+def sendgrid(monkeypatch):
+    fake_sendgrid = FakeSendGrid()
+    monkeypatch.setattr(sendgrid_client, "send_batch", fake_sendgrid.send_batch)
+    return fake_sendgrid
+
+
+def enqueue_emails(total_emails: int, template_id: str = "template") -> None:
+    UserAppServices().enqueue_emails(emails_data=[
+        EmailOutboxData(idempotency_key=f"{template_id}:{number}", to_email=f"user{number}@gmail.com",
+                        template_id=template_id, dynamic_template_data={"number": number}) for number in
+        range(total_emails)])
+
+
+def drain_email_outbox() -> int:
+    return UserAppServices().drain_email_outbox(batch_size=100, max_attempts=3, retry_delay=RETRY_DELAY)
+
+
+def make_emails_due() -> None:
+    EmailOutbox.objects.filter(status=EmailOutboxStatusChoices.PENDING).update(next_attempt_at=timezone.now())
+
+
+@pytest.mark.django_db
+def test_drain_email_outbox_sends_mails_of_a_template_by_one_request(sendgrid):
+    enqueue_emails(total_emails=3, template_id="first")
+    enqueue_emails(total_emails=2, template_id="second")
+
+    assert drain_email_outbox() == 5
+    assert sorted((template_id, len(to_emails)) for template_id, to_emails in sendgrid.requests) == [
+        ("first", 3), ("second", 2)]
+    assert set(EmailOutbox.objects.values_list("status", flat=True)) == {EmailOutboxStatusChoices.SENT}
+
+
+@pytest.mark.django_db
+def test_drain_email_outbox_retries_with_exponential_backoff_until_max_attempts(sendgrid):
+    enqueue_emails(total_emails=1)
+    sendgrid.retryable_failures = 3
+    retry_delays = list()
+    for _ in range(2):
+        drained_at = timezone.now()
+        assert drain_email_outbox() == 0
+        email_outbox = EmailOutbox.objects.get()
+        assert email_outbox.status == EmailOutboxStatusChoices.PENDING
+        retry_delays.append((email_outbox.next_attempt_at - drained_at).total_seconds())
+        # Mails are not Sent again before their Backoff has Passed
+        assert drain_email_outbox() == 0
+        make_emails_due()
+
+    assert [round(retry_delay) for retry_delay in retry_delays] == [RETRY_DELAY, RETRY_DELAY * 2]
+    assert drain_email_outbox() == 0
+    email_outbox = EmailOutbox.objects.get()
+    assert (email_outbox.status, email_outbox.attempts) == (EmailOutboxStatusChoices.FAILED, 3)
+    assert email_outbox.error == "Service Unavailable"
+    assert len(sendgrid.requests) == 3
+
+
+@pytest.mark.django_db
+def test_drain_email_outbox_fails_only_rejected_mails_of_a_batch(sendgrid):
+    enqueue_emails(total_emails=8)
+    sendgrid.invalid_emails = {"user2@gmail.com", "user5@gmail.com"}
+
+    assert drain_email_outbox() == 6
+    failed_emails = set(EmailOutbox.objects.filter(status=EmailOutboxStatusChoices.FAILED).values_list(
+        "to_email", flat=True))
+    assert failed_emails == sendgrid.invalid_emails
+    assert EmailOutbox.objects.filter(status=EmailOutboxStatusChoices.SENT).count() == 6
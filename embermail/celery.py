@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from celery.schedules import crontab
 
 from django.conf import settings
@@ -16,6 +17,31 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Auto-discover and register tasks from Django app modules
 app.autodiscover_tasks()
 
+
+@worker_process_init.connect
+def keep_imap_sessions_alive(**kwargs):
+    """
+    Send NOOP on Cached IMAP Sessions of each Worker Process, so Providers do not Drop them between Scans
+    """
+    from embermail.infrastructure.mailer_sevices.imap.services import imap_session_cache
+
+    imap_session_cache.start_keepalive()
+
+
+@worker_process_shutdown.connect
+def close_pooled_mail_connections(**kwargs):
+    """
+    Close Pooled SMTP Connections, Cached IMAP Sessions and the SendGrid Session when a Worker Process Exits
+    """
+    from embermail.infrastructure.mailer_sevices.services import sendgrid_client
+    from embermail.infrastructure.mailer_sevices.imap.services import imap_session_cache
+    from embermail.infrastructure.mailer_sevices.smtp.services import smtp_connection_pool
+
+    smtp_connection_pool.close_all()
+    imap_session_cache.close_all()
+    sendgrid_client.close()
+
+
 # # Celery Beat Settings
 # crontab_hour = getattr(settings, "MAIN_ALGORITHM_RUN_TIME_HOUR", '1')
 # crontab_minute = getattr(settings, "MAIN_ALGORITHM_RUN_TIME_MINUTE", '30')
@@ -27,3 +53,27 @@ app.autodiscover_tasks()
 #         # 'args': (),
 #     }
 # }
+
+# Dispatch Due Warmup Sends
+app.conf.beat_schedule = {
+    'dispatch_warmup_sends': {
+        'task': 'embermail.interface.campaigns.tasks.dispatch_warmup_sends',
+        'schedule': int(getattr(settings, "WARMUP_SEND_DISPATCH_INTERVAL", 30)),
+    },
+    # Send Queued Transactional Mails
+    'drain_email_outbox': {
+        'task': 'embermail.interface.campaigns.tasks.drain_email_outbox',
+        'schedule': int(getattr(settings, "EMAIL_OUTBOX_DRAIN_INTERVAL", 10)),
+    },
+    # Refresh today's Campaign Reports Incrementally
+    'refresh_campaign_reports': {
+        'task': 'embermail.interface.campaigns.tasks.refresh_campaign_reports',
+        'schedule': int(getattr(settings, "CAMPAIGN_REPORT_REFRESH_INTERVAL", 300)),
+    },
+    # Compact Record Log Files of Closed Days
+    'compact_record_logs': {
+        'task': 'embermail.interface.campaigns.tasks.compact_record_logs',
+        'schedule': crontab(hour=getattr(settings, "RECORD_LOG_COMPACTION_HOUR", '0'),
+                            minute=getattr(settings, "RECORD_LOG_COMPACTION_MINUTE", '15')),
+    },
+}
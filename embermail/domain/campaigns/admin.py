@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from embermail.domain.campaigns.models import Campaign, CampaignType, CampaignReport, DomainList
+from embermail.domain.campaigns.models import Campaign, CampaignType, CampaignReport, DomainList, WarmupSend, \
+    SendLedger, RecordLogCheckpoint, MailboxCheckpoint
 
 
 class CampaignAdmin(admin.ModelAdmin):
@@ -31,7 +32,36 @@ class DomainListAdmin(admin.ModelAdmin):
     ordering = ('is_active',)
 
 
+class WarmupSendAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'send_at', 'status', 'direction', 'from_email', 'to_email', 'template_subject', 'thread_index',
+        'attempts', 'sent_at')
+    search_fields = ('id', 'campaign_id', 'thread_key', 'from_email', 'to_email')
+    list_filter = ('status', 'direction')
+
+
+class SendLedgerAdmin(admin.ModelAdmin):
+    list_display = ('id', 'sender_email', 'send_date', 'total_sent_mails')
+    search_fields = ('id', 'sender_email')
+    list_filter = ('send_date',)
+
+
+class RecordLogCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('id', 'file_date', 'offset')
+    search_fields = ('id',)
+
+
+class MailboxCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('id', 'receiver_email', 'report_date')
+    search_fields = ('id', 'receiver_email')
+    list_filter = ('report_date',)
+
+
 admin.site.register(Campaign, CampaignAdmin)
 admin.site.register(CampaignType, CampaignTypeAdmin)
 admin.site.register(CampaignReport, CampaignReportAdmin)
 admin.site.register(DomainList, DomainListAdmin)
+admin.site.register(WarmupSend, WarmupSendAdmin)
+admin.site.register(SendLedger, SendLedgerAdmin)
+admin.site.register(RecordLogCheckpoint, RecordLogCheckpointAdmin)
+admin.site.register(MailboxCheckpoint, MailboxCheckpointAdmin)
@@ -1,12 +1,13 @@
 import uuid
 from datetime import datetime
-from typing import Union, Tuple
+from typing import Union, Tuple, List
 from dataclasses import dataclass
 
 from django.db import models
 from django.core.validators import validate_email
 from dataclass_type_validator import dataclass_validate
-from embermail.domain.text_choices import EmailServiceProviderChoices, CampaignActionRequiredChoices, DomainTypes
+from embermail.domain.text_choices import EmailServiceProviderChoices, CampaignActionRequiredChoices, DomainTypes, \
+    WarmupSendStatusChoices, WarmupSendDirectionChoices
 
 from utils.django import custom_models
 from utils.data_manipulation.type_conversion import encode_by_base64, decode_by_base64
@@ -65,6 +66,15 @@ class Campaign(custom_models.ActivityTracking):
         verbose_name = "Campaign"
         verbose_name_plural = "Campaigns"
         db_table = "campaign"
+        indexes = [
+            models.Index(fields=["is_stopped", "action_required"], name="campaign_stopped_action_idx"),
+            # Only Runnable Campaigns are Indexed, the Warmup Planner reads nothing else
+            models.Index(fields=["id"], name="campaign_runnable_idx",
+                         condition=models.Q(is_stopped=False, app_password__isnull=False,
+                                            action_required=CampaignActionRequiredChoices.NONE)),
+            models.Index(fields=["master_user_id"], name="campaign_master_user_id_idx"),
+            models.Index(fields=["user_id"], name="campaign_user_id_idx"),
+        ]
 
     def __str__(self):
         return self.email
@@ -116,6 +126,8 @@ class CampaignReportData:
     campaign_id: uuid.UUID
     master_user_id: Union[uuid.UUID, None] = None
     user_id: Union[uuid.UUID, None] = None
+    inbox_ratio: Union[float, None] = None
+    reputation_ratio: Union[float, None] = None
 
     def __post_init__(self):
         validate_email(self.email)
@@ -143,6 +155,13 @@ class CampaignReport(custom_models.ActivityTracking):
         verbose_name = "CampaignReport"
         verbose_name_plural = "CampaignReports"
         db_table = "campaign_report"
+        constraints = [
+            models.UniqueConstraint(fields=["email", "report_date"], name="campaign_report_email_report_date_unique"),
+        ]
+        # Lookups by (email, report_date) use the Index of the Unique Constraint
+        indexes = [
+            models.Index(fields=["report_date"], name="campaign_report_date_idx"),
+        ]
 
     def __str__(self):
         return f"{self.id} - {self.email}"
@@ -168,6 +187,18 @@ class CampaignReportFactory:
             defaults=campaign_report_data_dict)
         return campaign_report_instance, created
 
+    @staticmethod
+    def bulk_upsert_entities(campaign_reports_data: List[CampaignReportData]) -> List[CampaignReport]:
+        """
+        Factory method used for create or update instances of CampaignReport by Email and Report Date in one Query
+        """
+        campaign_report_instances = [CampaignReportFactory.build_entity_with_id(campaign_report_data) for
+                                     campaign_report_data in campaign_reports_data]
+        return CampaignReport.objects.bulk_create(
+            campaign_report_instances, update_conflicts=True, unique_fields=["email", "report_date"],
+            update_fields=["campaign_id", "user_id", "master_user_id", "total_emails_sent", "spam_count",
+                           "inbox_count", "category_count", "inbox_ratio", "reputation_ratio", "updated_at"])
+
 
 @dataclass_validate(before_post_init=True)
 @dataclass(frozen=True)
@@ -197,6 +228,10 @@ class DomainList(custom_models.ActivityTracking):
         verbose_name = "DomainList"
         verbose_name_plural = "DomainLists"
         db_table = "domain_list"
+        indexes = [
+            # Covers the Receivers Read by the Warmup Planner, only Active ones are Indexed
+            models.Index(fields=["id", "email"], name="domain_list_active_idx", condition=models.Q(is_active=True)),
+        ]
 
     def __str__(self):
         return self.email
@@ -210,3 +245,220 @@ class DomainListFactory:
         """
         domain_list_data_dict = as_dict(domain_list_data, skip_empty=True)
         return DomainList(id=uuid.uuid4(), **domain_list_data_dict)
+
+
+@dataclass_validate(before_post_init=True)
+@dataclass(frozen=True)
+class WarmupSendData:
+    """
+    WarmupSend data which is passed to the WarmupSendFactory
+    """
+    campaign_id: uuid.UUID
+    domain_list_id: uuid.UUID
+    thread_key: uuid.UUID
+    template_id: uuid.UUID
+    thread_index: int
+    direction: str
+    from_email: str
+    to_email: str
+    template_subject: str
+    total_mails_to_send: int
+    message_id: str
+    send_at: datetime
+    parent_message_id: Union[str, None] = None
+    warmup_email_name: Union[str, None] = None
+    thread_id: Union[uuid.UUID, None] = None
+    thread_updated_at: Union[datetime, None] = None
+    status: str = WarmupSendStatusChoices.PENDING
+
+
+class WarmupSend(custom_models.ActivityTracking):
+    """
+    WarmupSend Model, One Planned Mail of a Warmup Thread which is Dispatched when it is Due
+    """
+    id = models.UUIDField(editable=False, primary_key=True, default=uuid.uuid4)
+    campaign_id = models.UUIDField(max_length=64)
+    domain_list_id = models.UUIDField(max_length=64)
+    thread_key = models.UUIDField(max_length=64)
+    template_id = models.UUIDField(max_length=64)
+    thread_index = models.IntegerField(default=0)
+    direction = models.CharField(max_length=55, choices=WarmupSendDirectionChoices.choices)
+    from_email = models.EmailField(max_length=64)
+    to_email = models.EmailField(max_length=64)
+    template_subject = models.CharField(max_length=155)
+    total_mails_to_send = models.IntegerField(default=0)
+    message_id = models.CharField(max_length=255)
+    parent_message_id = models.CharField(max_length=255, null=True, blank=True)
+    # Display Name of the Warmup Email, Resolved once by the Planner
+    warmup_email_name = models.CharField(max_length=155, null=True, blank=True)
+    # Thread whose Body is Sent and its updated_at when Planned, the Key of the Compiled Body Cache
+    thread_id = models.UUIDField(max_length=64, null=True, blank=True)
+    thread_updated_at = models.DateTimeField(null=True, blank=True)
+    send_at = models.DateTimeField()
+    status = models.CharField(max_length=55, choices=WarmupSendStatusChoices.choices,
+                              default=WarmupSendStatusChoices.PENDING)
+    attempts = models.IntegerField(default=0)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "WarmupSend"
+        verbose_name_plural = "WarmupSends"
+        db_table = "warmup_send"
+        indexes = [
+            models.Index(fields=["status", "send_at"], name="warmup_send_status_send_at_idx"),
+            models.Index(fields=["thread_key", "thread_index"], name="warmup_send_thread_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.from_email} - {self.to_email} - {self.thread_index}"
+
+
+class WarmupSendFactory:
+    @staticmethod
+    def build_entity_with_id(warmup_send_data: WarmupSendData) -> WarmupSend:
+        """
+        Factory method used for build an instance of WarmupSend
+        """
+        warmup_send_data_dict = as_dict(warmup_send_data, skip_empty=True)
+        return WarmupSend(id=uuid.uuid4(), **warmup_send_data_dict)
+
+
+@dataclass_validate(before_post_init=True)
+@dataclass(frozen=True)
+class SendLedgerData:
+    """
+    SendLedger data which is passed to the SendLedgerFactory
+    """
+    sender_email: str
+    send_date: datetime.date
+    total_sent_mails: int = 0
+
+    def __post_init__(self):
+        validate_email(self.sender_email)
+
+
+class SendLedger(custom_models.ActivityTracking):
+    """
+    SendLedger Model, Daily Counter of Mails Sent by a Warmup Email
+    """
+    id = models.UUIDField(editable=False, primary_key=True, default=uuid.uuid4)
+    sender_email = models.EmailField(max_length=64)
+    send_date = models.DateField()
+    total_sent_mails = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "SendLedger"
+        verbose_name_plural = "SendLedgers"
+        db_table = "send_ledger"
+        constraints = [
+            models.UniqueConstraint(fields=["sender_email", "send_date"], name="send_ledger_sender_send_date_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.sender_email} - {self.send_date}"
+
+
+class SendLedgerFactory:
+    @staticmethod
+    def get_entity_with_get_or_create(send_ledger_data: SendLedgerData) -> Tuple[SendLedger, bool]:
+        """
+        Factory method used for build or get an instance of SendLedger
+        """
+        send_ledger_data_dict = as_dict(send_ledger_data, skip_empty=True)
+        send_ledger_instance, created = SendLedger.objects.get_or_create(
+            sender_email=send_ledger_data_dict.pop("sender_email"), send_date=send_ledger_data_dict.pop("send_date"),
+            defaults=send_ledger_data_dict)
+        return send_ledger_instance, created
+
+
+@dataclass_validate(before_post_init=True)
+@dataclass(frozen=True)
+class RecordLogCheckpointData:
+    """
+    RecordLogCheckpoint data which is passed to the RecordLogCheckpointFactory
+    """
+    file_date: datetime.date
+    offset: int = 0
+
+
+class RecordLogCheckpoint(custom_models.ActivityTracking):
+    """
+    RecordLogCheckpoint Model, Byte Offset of a Record Log File up to which Campaign Reports are Refreshed
+    """
+    id = models.UUIDField(editable=False, primary_key=True, default=uuid.uuid4)
+    file_date = models.DateField(unique=True)
+    offset = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "RecordLogCheckpoint"
+        verbose_name_plural = "RecordLogCheckpoints"
+        db_table = "record_log_checkpoint"
+
+    def __str__(self):
+        return f"{self.file_date} - {self.offset}"
+
+
+class RecordLogCheckpointFactory:
+    @staticmethod
+    def get_entity_with_get_or_create(record_log_checkpoint_data: RecordLogCheckpointData) -> \
+            Tuple[RecordLogCheckpoint, bool]:
+        """
+        Factory method used for build or get an instance of RecordLogCheckpoint
+        """
+        record_log_checkpoint_data_dict = as_dict(record_log_checkpoint_data, skip_empty=True)
+        record_log_checkpoint_instance, created = RecordLogCheckpoint.objects.get_or_create(
+            file_date=record_log_checkpoint_data_dict.pop("file_date"), defaults=record_log_checkpoint_data_dict)
+        return record_log_checkpoint_instance, created
+
+
+@dataclass_validate(before_post_init=True)
+@dataclass(frozen=True)
+class MailboxCheckpointData:
+    """
+    MailboxCheckpoint data which is passed to the MailboxCheckpointFactory
+    """
+    receiver_email: str
+    report_date: datetime.date
+    mailbox_uids: Union[dict, None] = None
+
+    def __post_init__(self):
+        validate_email(self.receiver_email)
+
+
+class MailboxCheckpoint(custom_models.ActivityTracking):
+    """
+    MailboxCheckpoint Model, UIDVALIDITY and Last Scanned UID of every Mailbox of a Receiver on a Report Date
+    mailbox_uids is like {"Inbox": [UIDVALIDITY, Last UID]}
+    """
+    id = models.UUIDField(editable=False, primary_key=True, default=uuid.uuid4)
+    receiver_email = models.EmailField(max_length=64)
+    report_date = models.DateField()
+    mailbox_uids = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        verbose_name = "MailboxCheckpoint"
+        verbose_name_plural = "MailboxCheckpoints"
+        db_table = "mailbox_checkpoint"
+        constraints = [
+            models.UniqueConstraint(fields=["receiver_email", "report_date"],
+                                    name="mailbox_checkpoint_receiver_report_date_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.receiver_email} - {self.report_date}"
+
+
+class MailboxCheckpointFactory:
+    @staticmethod
+    def get_entity_with_get_or_create(mailbox_checkpoint_data: MailboxCheckpointData) -> \
+            Tuple[MailboxCheckpoint, bool]:
+        """
+        Factory method used for build or get an instance of MailboxCheckpoint
+        """
+        mailbox_checkpoint_data_dict = as_dict(mailbox_checkpoint_data, skip_empty=True)
+        mailbox_checkpoint_instance, created = MailboxCheckpoint.objects.get_or_create(
+            receiver_email=mailbox_checkpoint_data_dict.pop("receiver_email"),
+            report_date=mailbox_checkpoint_data_dict.pop("report_date"), defaults=mailbox_checkpoint_data_dict)
+        return mailbox_checkpoint_instance, created
@@ -3,7 +3,8 @@ from typing import Type
 from django.db.models.manager import BaseManager
 
 from embermail.domain.campaigns.models import Campaign, CampaignFactory, CampaignType, CampaignReportFactory, \
-    CampaignReport, DomainList, DomainListFactory
+    CampaignReport, DomainList, DomainListFactory, WarmupSend, WarmupSendFactory, SendLedger, \
+    SendLedgerFactory, RecordLogCheckpoint, RecordLogCheckpointFactory, MailboxCheckpoint, MailboxCheckpointFactory
 
 
 class CampaignServices:
@@ -39,4 +40,44 @@ class DomainListServices:
 
     @staticmethod
     def get_domain_list_repo() -> BaseManager[DomainList]:
-        return DomainList.objects
\ No newline at end of file
+        return DomainList.objects
+
+
+class WarmupSendServices:
+    @staticmethod
+    def get_warmup_send_factory() -> Type[WarmupSendFactory]:
+        return WarmupSendFactory
+
+    @staticmethod
+    def get_warmup_send_repo() -> BaseManager[WarmupSend]:
+        return WarmupSend.objects
+
+
+class SendLedgerServices:
+    @staticmethod
+    def get_send_ledger_factory() -> Type[SendLedgerFactory]:
+        return SendLedgerFactory
+
+    @staticmethod
+    def get_send_ledger_repo() -> BaseManager[SendLedger]:
+        return SendLedger.objects
+
+
+class RecordLogCheckpointServices:
+    @staticmethod
+    def get_record_log_checkpoint_factory() -> Type[RecordLogCheckpointFactory]:
+        return RecordLogCheckpointFactory
+
+    @staticmethod
+    def get_record_log_checkpoint_repo() -> BaseManager[RecordLogCheckpoint]:
+        return RecordLogCheckpoint.objects
+
+
+class MailboxCheckpointServices:
+    @staticmethod
+    def get_mailbox_checkpoint_factory() -> Type[MailboxCheckpointFactory]:
+        return MailboxCheckpointFactory
+
+    @staticmethod
+    def get_mailbox_checkpoint_repo() -> BaseManager[MailboxCheckpoint]:
+        return MailboxCheckpoint.objects
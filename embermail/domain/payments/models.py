@@ -94,7 +94,13 @@ class Payment(custom_models.ActivityTracking):
     stripe_subscription = models.JSONField()
     invoice_download_url = models.CharField(max_length=555, null=True, blank=True, default="")
     invoice_name = models.CharField(max_length=125, null=True, blank=True, default="")
-    payment_status = models.CharField(choices=PaymentStatusChoices.choices, default=PaymentStatusChoices.INCOMPLETE)
+    payment_status = models.CharField(max_length=55, choices=PaymentStatusChoices.choices,
+                                      default=PaymentStatusChoices.INCOMPLETE)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["warmup_email", "created_at"], name="payment_warmup_created_idx"),
+        ]
 
     def __str__(self):
         return self.warmup_email
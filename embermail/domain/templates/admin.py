@@ -4,7 +4,8 @@ from embermail.domain.templates.models import Thread, Template
 
 
 class TemplateAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'subject', 'warmup_email', 'user_id', 'is_selected', 'is_general', 'is_active')
+    list_display = ('id', 'name', 'subject', 'warmup_email', 'user_id', 'is_selected', 'is_general', 'thread_count',
+                    'is_active')
     search_fields = ('id', 'name', 'subject', 'warmup_email', 'user_id')
     list_filter = ('is_active', 'subject', 'warmup_email',)
     order_by = ('-updated_at',)
@@ -1,5 +1,6 @@
+import re
 import uuid
-from typing import Union, Tuple
+from typing import Union, Tuple, Dict
 from dataclasses import dataclass
 
 from django.db import models
@@ -7,6 +8,12 @@ from django.db import models
 from utils.django import custom_models
 from utils.data_manipulation.type_conversion import as_dict
 
+# Placeholders of Thread Bodies, replaced by the Names of the Warmup Email and the Domain Email
+WARMUP_EMAIL_NAME_PLACEHOLDER = "test_user1"
+DOMAIN_EMAIL_NAME_PLACEHOLDER = "test_user2"
+THREAD_BODY_PLACEHOLDER_PATTERN = re.compile(
+    r"\{\{(%s|%s)\}\}" % (WARMUP_EMAIL_NAME_PLACEHOLDER, DOMAIN_EMAIL_NAME_PLACEHOLDER))
+
 
 @dataclass(frozen=True)
 class TemplateData:
@@ -20,6 +27,7 @@ class TemplateData:
     master_user_id: Union[uuid.UUID, None] = None
     is_selected: bool = False
     is_general: bool = False
+    thread_count: int = 0
 
 
 @dataclass(frozen=True)
@@ -32,6 +40,23 @@ class ThreadData:
     thread_ordering_number: int
 
 
+@dataclass(frozen=True)
+class ThreadBodyTemplate:
+    """
+    Thread Body Compiled once to Literal and Placeholder Segments, Rendering only Joins them
+    Segments Alternate, Literals are at Even and Placeholder Names at Odd Positions
+    """
+    segments: Tuple[str, ...]
+
+    @classmethod
+    def compile(cls, body: str) -> "ThreadBodyTemplate":
+        return cls(segments=tuple(THREAD_BODY_PLACEHOLDER_PATTERN.split(body)))
+
+    def render(self, values: Dict[str, str]) -> str:
+        return "".join(values[segment] if position % 2 else segment for position, segment in
+                       enumerate(self.segments))
+
+
 class Template(custom_models.ActivityTracking):
     """
     Template Model with ActivityTracking model
@@ -45,11 +70,18 @@ class Template(custom_models.ActivityTracking):
     master_user_id = models.UUIDField(null=True, blank=True)
     is_selected = models.BooleanField(default=False)
     is_general = models.BooleanField(default=False)
+    # Threads of the Template, Maintained by TemplateAppServices on every Thread Write
+    thread_count = models.IntegerField(default=0)
 
     class Meta:
         verbose_name = "Template"
         verbose_name_plural = "Templates"
         db_table = "template"
+        indexes = [
+            models.Index(fields=["warmup_email"], name="template_warmup_email_idx"),
+            # General Templates are few, so only they are Indexed
+            models.Index(fields=["is_general"], name="template_general_idx", condition=models.Q(is_general=True)),
+        ]
 
     def __str__(self):
         return self.name
@@ -69,6 +101,9 @@ class Thread(custom_models.ActivityTracking):
         verbose_name = "Thread"
         verbose_name_plural = "Threads"
         db_table = "thread"
+        indexes = [
+            models.Index(fields=["template_id", "thread_ordering_number"], name="thread_template_ordering_idx"),
+        ]
 
     def __str__(self):
         return str(self.template_id)
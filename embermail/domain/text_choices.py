@@ -56,3 +56,33 @@ class CampaignActionRequiredChoices(models.TextChoices):
     APP_PASSWORD_REQUIRED = "app_password", "APP PASSWORD REQUIRED"
     PAYMENT_REQUIRED = "payment", "PAYMENT REQUIRED"
     NONE = None, "NO ACTION REQUIRED"
+
+
+class WarmupSendStatusChoices(models.TextChoices):
+    """
+    Status of a Planned Warmup Send Used in WarmupSend Model
+    """
+    PENDING = "pending", "PENDING"
+    DISPATCHED = "dispatched", "DISPATCHED"
+    SENDING = "sending", "SENDING"
+    SENT = "sent", "SENT"
+    FAILED = "failed", "FAILED"
+    SKIPPED = "skipped", "SKIPPED"
+
+
+class WarmupSendDirectionChoices(models.TextChoices):
+    """
+    Direction of a Planned Warmup Send Used in WarmupSend Model
+    """
+    TO_RECEIVER = "to_receiver", "WARMUP EMAIL TO RECEIVER"
+    TO_WARMUP_EMAIL = "to_warmup_email", "RECEIVER TO WARMUP EMAIL"
+
+
+class EmailOutboxStatusChoices(models.TextChoices):
+    """
+    Status of a Queued Transactional Mail Used in EmailOutbox Model
+    """
+    PENDING = "pending", "PENDING"
+    SENDING = "sending", "SENDING"
+    SENT = "sent", "SENT"
+    FAILED = "failed", "FAILED"
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from embermail.domain.users.models import User, ForgotPassword, VisitedUser, Inquiry
+from embermail.domain.users.models import User, ForgotPassword, VisitedUser, Inquiry, EmailOutbox
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -27,7 +27,14 @@ class InquiryAdmin(admin.ModelAdmin):
     ordering = ('-created_at', 'is_solved', 'email')
 
 
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'to_email', 'template_id', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    search_fields = ('id', 'to_email', 'idempotency_key')
+    list_filter = ('status',)
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(ForgotPassword, ForgotPasswordAdmin)
 admin.site.register(VisitedUser, VisitedUserAdmin)
 admin.site.register(Inquiry, InquiryAdmin)
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
@@ -4,6 +4,7 @@ from typing import Union, Tuple
 from dataclasses import dataclass, field
 
 from django.db import models
+from django.utils import timezone
 from django.core.validators import validate_email
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager, AbstractUser
@@ -11,6 +12,7 @@ from django.contrib.auth.models import UserManager, AbstractUser
 from dataclass_type_validator import dataclass_validate
 
 from utils.django import custom_models
+from embermail.domain.text_choices import EmailOutboxStatusChoices
 from utils.data_manipulation.type_conversion import as_dict
 
 
@@ -200,4 +202,68 @@ class InquiryFactory:
         """
         Inquiry Factory method used for build an instance of Inquiry
         """
-        return Inquiry(id=uuid.uuid4(), email=email, contact_message=contact_message)
\ No newline at end of file
+        return Inquiry(id=uuid.uuid4(), email=email, contact_message=contact_message)
+
+
+@dataclass_validate(before_post_init=True)
+@dataclass(frozen=True)
+class EmailOutboxData:
+    """
+    EmailOutbox data which is passed to the EmailOutboxFactory
+    """
+    idempotency_key: str
+    to_email: str
+    template_id: Union[str, None] = None
+    dynamic_template_data: Union[dict, None] = None
+
+    def __post_init__(self):
+        validate_email(self.to_email)
+
+
+class EmailOutbox(custom_models.ActivityTracking):
+    """
+    EmailOutbox Model, Transactional Mail Queued for SendGrid
+    A Mail is Queued once per idempotency_key and Retried with Backoff until it is Sent
+    """
+    id = models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True)
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    to_email = models.EmailField(max_length=64)
+    template_id = models.CharField(max_length=128, null=True, blank=True)
+    dynamic_template_data = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=EmailOutboxStatusChoices.choices,
+                              default=EmailOutboxStatusChoices.PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "EmailOutbox"
+        verbose_name_plural = "EmailOutboxes"
+        db_table = "email_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="email_outbox_status_next_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} - {self.status}"
+
+
+class EmailOutboxFactory:
+    @staticmethod
+    def build_entity_with_id(email_outbox_data: EmailOutboxData) -> EmailOutbox:
+        """
+        Factory method used for build an instance of EmailOutbox
+        """
+        email_outbox_data_dict = as_dict(email_outbox_data, skip_empty=True)
+        return EmailOutbox(id=uuid.uuid4(), **email_outbox_data_dict)
+
+    @staticmethod
+    def get_entity_with_get_or_create(email_outbox_data: EmailOutboxData) -> Tuple[EmailOutbox, bool]:
+        """
+        Factory method used for build or get an instance of EmailOutbox by Idempotency Key
+        """
+        email_outbox_data_dict = as_dict(email_outbox_data, skip_empty=True)
+        email_outbox_instance, created = EmailOutbox.objects.get_or_create(
+            idempotency_key=email_outbox_data_dict.pop("idempotency_key"), defaults=email_outbox_data_dict)
+        return email_outbox_instance, created
@@ -3,7 +3,7 @@ from typing import Type
 from django.db.models.manager import BaseManager
 
 from embermail.domain.users.models import User, UserFactory, ForgotPassword, ForgotPasswordFactory, VisitedUserFactory, \
-    VisitedUser, InquiryFactory, Inquiry
+    VisitedUser, InquiryFactory, Inquiry, EmailOutbox, EmailOutboxFactory
 
 
 class UserServices:
@@ -44,3 +44,13 @@ class InquiryServices:
     @staticmethod
     def get_inquiry_repo() -> BaseManager[Inquiry]:
         return Inquiry.objects
+
+
+class EmailOutboxServices:
+    @staticmethod
+    def get_email_outbox_factory() -> Type[EmailOutboxFactory]:
+        return EmailOutboxFactory
+
+    @staticmethod
+    def get_email_outbox_repo() -> BaseManager[EmailOutbox]:
+        return EmailOutbox.objects
@@ -0,0 +1,236 @@
+"""This file includes readers of the record log files written by the record_logger"""
+
+import os
+import datetime
+from typing import Iterator, Union, Tuple
+
+import ujson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Column name of a Record and its Path in the JSON Log Line
+RECORD_COLUMNS = {
+    'sender_name': ('sender', 'name'),
+    'sender_email': ('sender', 'email'),
+    'sender_email_provider': ('sender', 'email_provider'),
+    'sender_send_max_emails_per_day': ('sender', 'send_max_emails_per_day'),
+    'sender_total_sent_mails': ('sender', 'total_number_of_sent_mails'),
+    'receiver_name': ('receiver', 'name'),
+    'receiver_email': ('receiver', 'email'),
+    'receiver_email_provider': ('receiver', 'email_provider'),
+    'mail_sent_status': ('mail_sent_status',),
+    'subject': ('template_subject',),
+    'message_id': ('message_id',),
+    'thread_number': ('thread_number',),
+    'date': ('date',),
+    'time': ('time',),
+    'datetime': ('datetime',),
+    'msg': ('msg',),
+    'body': ('body',),
+}
+NUMERIC_RECORD_COLUMNS = ('sender_send_max_emails_per_day', 'sender_total_sent_mails', 'thread_number')
+CATEGORICAL_RECORD_COLUMNS = ('sender_email', 'sender_email_provider', 'receiver_email', 'receiver_email_provider')
+
+# Typed Columns of Compacted Record Files, Repeated Values are Dictionary Encoded and the Body is kept as a
+# Column of its own, so Readers which do not Project it never Read its Pages
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+RECORD_SCHEMA = pa.schema([
+    ('sender_name', DICTIONARY_STRING),
+    ('sender_email', DICTIONARY_STRING),
+    ('sender_email_provider', DICTIONARY_STRING),
+    ('sender_send_max_emails_per_day', pa.int64()),
+    ('sender_total_sent_mails', pa.int64()),
+    ('receiver_name', DICTIONARY_STRING),
+    ('receiver_email', DICTIONARY_STRING),
+    ('receiver_email_provider', DICTIONARY_STRING),
+    ('mail_sent_status', pa.bool_()),
+    ('subject', DICTIONARY_STRING),
+    ('message_id', pa.string()),
+    ('thread_number', pa.int64()),
+    ('date', DICTIONARY_STRING),
+    ('time', pa.string()),
+    ('datetime', pa.string()),
+    ('msg', DICTIONARY_STRING),
+    ('body', pa.large_string()),
+])
+COMPACTION_BATCH_SIZE = 50000
+RECORD_FILE_SUFFIX = "_records.log"
+
+
+def get_record_file_path(file_date: str) -> str:
+    return f'logs/records/{file_date}_records.log'
+
+
+def get_compacted_record_file_path(file_date: str) -> str:
+    return f'logs/records/{file_date}_records.parquet'
+
+
+def _get_record_value(log_data: dict, path: tuple):
+    value = log_data
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def iter_records(file_date: str, columns: list = None, filters: dict = None) -> Iterator[dict]:
+    """
+    Stream Records of a Record Log File line by line as Dicts of the Projected Columns
+    filters are pushed down as Equality Checks, e.g. {'sender_email': 'x@gmail.com'}
+    """
+    columns = list(columns or RECORD_COLUMNS)
+    filters = filters or dict()
+    compacted_record_file_path = get_compacted_record_file_path(file_date=file_date)
+    if os.path.exists(compacted_record_file_path):
+        parquet_file = pq.ParquetFile(compacted_record_file_path, memory_map=True)
+        for record_batch in parquet_file.iter_batches(columns=list(dict.fromkeys(columns + list(filters)))):
+            for record in record_batch.to_pylist():
+                if all(record.get(column) == value for column, value in filters.items()):
+                    yield {column: record.get(column) for column in columns}
+        return
+
+    # Lines which can not contain a Filter Value are Skipped before Parsing them
+    encoded_filter_values = [ujson.dumps(value)[1:-1] for value in filters.values() if isinstance(value, str)]
+    with open(get_record_file_path(file_date=file_date)) as file:
+        for data_line in file:
+            if not data_line.strip() or not all(value in data_line for value in encoded_filter_values):
+                continue
+            log_data = ujson.loads(data_line)
+            if not all(_get_record_value(log_data, RECORD_COLUMNS[column]) == value for column, value in
+                       filters.items()):
+                continue
+            yield {column: _get_record_value(log_data, RECORD_COLUMNS[column]) for column in columns}
+
+
+def read_new_records(file_date: str, offset: int, columns: list = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Read Records Appended to a Record Log File after the Byte Offset and Returns them with the New Offset
+    A Partially Written Last Line is left for the Next Read
+    """
+    columns = list(columns or RECORD_COLUMNS)
+    records = list()
+    record_file_path = get_record_file_path(file_date=file_date)
+    if not os.path.exists(record_file_path):
+        return build_records_dataframe(records=records, columns=columns), offset
+    with open(record_file_path, 'rb') as file:
+        file.seek(offset)
+        for data_line in file:
+            if not data_line.endswith(b"\n"):
+                break
+            offset += len(data_line)
+            if not data_line.strip():
+                continue
+            log_data = ujson.loads(data_line)
+            records.append({column: _get_record_value(log_data, RECORD_COLUMNS[column]) for column in columns})
+    return build_records_dataframe(records=records, columns=columns), offset
+
+
+def build_records_dataframe(records: list, columns: list = None) -> pd.DataFrame:
+    """
+    Build DataFrame of Records, None values are Filled and Email and Provider Columns are Categorical
+    """
+    columns = list(columns or RECORD_COLUMNS)
+    return _fill_records_dataframe(df=pd.DataFrame.from_records(records, columns=columns), columns=columns)
+
+
+def _fill_records_dataframe(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    # Compacted Files are Read with Dictionary Encoded Columns as Categoricals, which only Accept Known Categories
+    for column in columns:
+        if not isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        if column not in CATEGORICAL_RECORD_COLUMNS:
+            df[column] = df[column].astype(object)
+        elif "" not in df[column].cat.categories:
+            df[column] = df[column].cat.add_categories("")
+    # Filling None values to 0 if it is Integer or Float Field and to "" if it is String Field
+    numeric_columns = [column for column in columns if column in NUMERIC_RECORD_COLUMNS]
+    string_columns = [column for column in columns if column not in NUMERIC_RECORD_COLUMNS]
+    df[numeric_columns] = df[numeric_columns].fillna(value=0)
+    df[string_columns] = df[string_columns].fillna(value="")
+    for column in columns:
+        if column in CATEGORICAL_RECORD_COLUMNS:
+            df[column] = df[column].astype('category').cat.remove_unused_categories()
+    return df
+
+
+def read_records(file_date: str, columns: list = None, filters: dict = None,
+                 chunksize: int = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Read Records of a Record Log File to a DataFrame, or to DataFrames of chunksize Records for Aggregations
+    """
+    compacted_record_file_path = get_compacted_record_file_path(file_date=file_date)
+    if not chunksize and os.path.exists(compacted_record_file_path):
+        columns = list(columns or RECORD_COLUMNS)
+        table = pq.read_table(compacted_record_file_path, columns=columns, memory_map=True,
+                              filters=[(column, '==', value) for column, value in filters.items()] if filters else None)
+        return _fill_records_dataframe(df=table.to_pandas(), columns=columns)
+    records = iter_records(file_date=file_date, columns=columns, filters=filters)
+    if not chunksize:
+        return build_records_dataframe(records=list(records), columns=columns)
+    return _iter_record_chunks(records=records, columns=columns, chunksize=chunksize)
+
+
+def _iter_record_chunks(records: Iterator[dict], columns: list, chunksize: int) -> Iterator[pd.DataFrame]:
+    chunk = list()
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunksize:
+            yield build_records_dataframe(records=chunk, columns=columns)
+            chunk = list()
+    if chunk:
+        yield build_records_dataframe(records=chunk, columns=columns)
+
+
+def read_records_by_file_dates(file_dates: list, columns: list = None, filters: dict = None) -> pd.DataFrame:
+    """
+    Read Records of many Days to one DataFrame, Days without a Record File are Skipped
+    """
+    dataframes = [read_records(file_date=file_date, columns=columns, filters=filters) for file_date in file_dates if
+                  os.path.exists(get_compacted_record_file_path(file_date=file_date)) or os.path.exists(
+                      get_record_file_path(file_date=file_date))]
+    if not dataframes:
+        return build_records_dataframe(records=list(), columns=columns)
+    return _fill_records_dataframe(df=pd.concat(dataframes, ignore_index=True), columns=list(columns or RECORD_COLUMNS))
+
+
+def compact_record_file(file_date: str) -> str:
+    """
+    Convert a Record Log File to a Typed Columnar Parquet File and Returns its Path
+    Records are Written in Row Groups, so Memory stays Bounded by COMPACTION_BATCH_SIZE
+    """
+    compacted_record_file_path = get_compacted_record_file_path(file_date=file_date)
+    temporary_file_path = f"{compacted_record_file_path}.tmp"
+    with pq.ParquetWriter(temporary_file_path, schema=RECORD_SCHEMA, compression='zstd') as writer:
+        batch = list()
+        for record in iter_records(file_date=file_date):
+            batch.append(record)
+            if len(batch) == COMPACTION_BATCH_SIZE:
+                writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=RECORD_SCHEMA))
+                batch = list()
+        if batch:
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=RECORD_SCHEMA))
+    # Readers only see a Completely Written File
+    os.replace(temporary_file_path, compacted_record_file_path)
+    return compacted_record_file_path
+
+
+def compact_closed_record_files(delete_record_files: bool = False) -> list:
+    """
+    Compact Record Log Files of Days before today which are not Compacted yet and Returns their Dates
+    """
+    today = datetime.date.today().strftime("%Y-%m-%d")
+    records_directory = os.path.dirname(get_record_file_path(file_date=today))
+    compacted_file_dates = list()
+    for file_name in sorted(os.listdir(records_directory)):
+        if not file_name.endswith(RECORD_FILE_SUFFIX):
+            continue
+        file_date = file_name[:-len(RECORD_FILE_SUFFIX)]
+        if file_date >= today or os.path.exists(get_compacted_record_file_path(file_date=file_date)):
+            continue
+        compact_record_file(file_date=file_date)
+        if delete_record_files:
+            os.remove(get_record_file_path(file_date=file_date))
+        compacted_file_dates.append(file_date)
+    return compacted_file_dates
@@ -1,3 +1,4 @@
+import os
 import datetime
 import logging
 
@@ -37,3 +38,27 @@ class RecordDataJSONFormatter(json_log_formatter.JSONFormatter):
         if request:
             extra["x_forward_for"] = request.META.get("X-FORWARD-FOR")
         return extra
+
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    File Handler which Writes Records to the File of the Day they are Logged, filename_pattern is Formatted with date
+    Long Running Processes move on to the File of the next Day, so Files of Closed Days are no longer Appended
+    """
+
+    def __init__(self, filename_pattern: str, mode="a", encoding=None, delay=False):
+        self.filename_pattern = filename_pattern
+        self.file_date = datetime.date.today()
+        super().__init__(filename=filename_pattern.format(date=self.file_date), mode=mode, encoding=encoding,
+                         delay=delay)
+
+    def emit(self, record):
+        file_date = datetime.date.today()
+        if file_date != self.file_date:
+            # The File of the next Day is Opened by FileHandler.emit
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+            self.file_date = file_date
+            self.baseFilename = os.path.abspath(self.filename_pattern.format(date=file_date))
+        super().emit(record)
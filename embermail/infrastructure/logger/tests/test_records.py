@@ -0,0 +1,119 @@
+import os
+import datetime
+
+import ujson
+import pytest
+
+from embermail.infrastructure.logger.records import iter_records, read_records, read_new_records, \
+    compact_record_file, compact_closed_record_files, get_record_file_path, get_compacted_record_file_path
+
+FILE_DATE = "2023-08-01"
+
+
+def build_log_data(number: int, sender_email: str, receiver_name=None, thread_number=None) -> dict:
+    return {
+        "sender": {"name": sender_email.split("@")[0], "email": sender_email, "email_provider": "gmail",
+                   "send_max_emails_per_day": 10, "total_number_of_sent_mails": number},
+        "receiver": {"name": receiver_name, "email": f"receiver{number}@outlook.com", "email_provider": None},
+        "mail_sent_status": number % 2 == 0,
+        "template_subject": f"Subject {number}",
+        "message_id": None,
+        "thread_number": thread_number,
+        "body": f"Body {number}",
+        "msg": "Mail Sent Successfully from Warmup Email to User.",
+        "date": "01-08-2023",
+        "time": "10:00:00",
+        "datetime": "01-08-2023 10:00:00",
+    }
+
+
+@pytest.fixture
+def record_file(tmp_path, monkeypatch):
+    # Record Paths are Relative to the Working Directory
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("logs/records")
+    log_lines = [build_log_data(number=1, sender_email="first@gmail.com", receiver_name="receiver", thread_number=1),
+                 build_log_data(number=2, sender_email="second@gmail.com"),
+                 build_log_data(number=3, sender_email="first@gmail.com", thread_number=2)]
+    with open(get_record_file_path(file_date=FILE_DATE), "w") as file:
+        for log_data in log_lines:
+            file.write(ujson.dumps(log_data) + "\n")
+    return log_lines
+
+
+def test_read_records_returns_same_records_from_record_file_and_compacted_file(record_file):
+    json_df = read_records(file_date=FILE_DATE)
+    compact_record_file(file_date=FILE_DATE)
+    assert os.path.exists(get_compacted_record_file_path(file_date=FILE_DATE))
+    parquet_df = read_records(file_date=FILE_DATE)
+
+    assert len(json_df) == 3
+    assert json_df.to_dict("records") == parquet_df.to_dict("records")
+    # None values are Filled the same way
+    assert list(parquet_df["receiver_name"]) == ["receiver", "", ""]
+    assert list(parquet_df["receiver_email_provider"]) == ["", "", ""]
+    assert list(parquet_df["thread_number"]) == [1, 0, 2]
+
+
+def test_read_records_with_columns_and_filters_from_record_file_and_compacted_file(record_file):
+    columns = ["sender_email", "receiver_email", "receiver_name"]
+    filters = {"sender_email": "first@gmail.com"}
+    json_df = read_records(file_date=FILE_DATE, columns=columns, filters=filters)
+    compact_record_file(file_date=FILE_DATE)
+    parquet_df = read_records(file_date=FILE_DATE, columns=columns, filters=filters)
+
+    assert list(json_df.columns) == columns
+    assert json_df.to_dict("records") == parquet_df.to_dict("records")
+    assert list(parquet_df["receiver_email"]) == ["receiver1@outlook.com", "receiver3@outlook.com"]
+    assert list(parquet_df["sender_email"].cat.categories) == ["first@gmail.com"]
+
+
+def test_read_records_by_chunks(record_file):
+    chunks = list(read_records(file_date=FILE_DATE, columns=["sender_email"], chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+
+def test_iter_records_from_record_file_and_compacted_file(record_file):
+    json_records = list(iter_records(file_date=FILE_DATE, columns=["receiver_email", "thread_number"],
+                                     filters={"sender_email": "second@gmail.com"}))
+    compact_record_file(file_date=FILE_DATE)
+    parquet_records = list(iter_records(file_date=FILE_DATE, columns=["receiver_email", "thread_number"],
+                                        filters={"sender_email": "second@gmail.com"}))
+
+    assert json_records == parquet_records == [{"receiver_email": "receiver2@outlook.com", "thread_number": None}]
+
+
+def test_iter_records_without_record_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        list(iter_records(file_date=FILE_DATE))
+
+
+def test_read_new_records_leaves_partially_written_line(record_file):
+    df, offset = read_new_records(file_date=FILE_DATE, offset=0, columns=["receiver_email"])
+    assert len(df) == 3
+
+    log_line = ujson.dumps(build_log_data(number=4, sender_email="first@gmail.com"))
+    with open(get_record_file_path(file_date=FILE_DATE), "a") as file:
+        file.write(log_line[:20])
+    df, partial_offset = read_new_records(file_date=FILE_DATE, offset=offset, columns=["receiver_email"])
+    assert len(df) == 0
+    assert partial_offset == offset
+
+    with open(get_record_file_path(file_date=FILE_DATE), "a") as file:
+        file.write(log_line[20:] + "\n")
+    df, new_offset = read_new_records(file_date=FILE_DATE, offset=offset, columns=["receiver_email"])
+    assert list(df["receiver_email"]) == ["receiver4@outlook.com"]
+    assert new_offset == os.path.getsize(get_record_file_path(file_date=FILE_DATE))
+
+
+def test_compact_closed_record_files_skips_today(record_file):
+    today = datetime.date.today().strftime("%Y-%m-%d")
+    with open(get_record_file_path(file_date=today), "w") as file:
+        file.write(ujson.dumps(build_log_data(number=1, sender_email="first@gmail.com")) + "\n")
+
+    assert compact_closed_record_files(delete_record_files=True) == [FILE_DATE]
+    assert not os.path.exists(get_record_file_path(file_date=FILE_DATE))
+    assert not os.path.exists(get_compacted_record_file_path(file_date=today))
+    # Deleted Record Files are Read from their Compacted Files
+    assert len(read_records(file_date=FILE_DATE)) == 3
@@ -0,0 +1,36 @@
+import os
+import logging
+import datetime
+from types import SimpleNamespace
+
+from embermail.infrastructure.logger import services
+from embermail.infrastructure.logger.services import DailyFileHandler
+
+
+class FakeDate(datetime.date):
+    today_date = datetime.date(2023, 8, 1)
+
+    @classmethod
+    def today(cls):
+        return cls.today_date
+
+
+def test_daily_file_handler_moves_on_to_the_file_of_the_next_day(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(services, "datetime", SimpleNamespace(date=FakeDate))
+    handler = DailyFileHandler(filename_pattern="{date}_records.log")
+    logger = logging.getLogger("daily_file_handler_test")
+    logger.addHandler(handler)
+    try:
+        logger.error("first day")
+        FakeDate.today_date = datetime.date(2023, 8, 2)
+        logger.error("second day")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert sorted(os.listdir(tmp_path)) == ["2023-08-01_records.log", "2023-08-02_records.log"]
+    with open(tmp_path / "2023-08-01_records.log") as file:
+        assert file.read() == "first day\n"
+    with open(tmp_path / "2023-08-02_records.log") as file:
+        assert file.read() == "second day\n"
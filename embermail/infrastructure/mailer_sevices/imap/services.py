@@ -1,9 +1,324 @@
+import os
+import re
+import time
 import imaplib
-import email
+import datetime
+import threading
+from email import message_from_bytes
+from email.utils import parseaddr
+from typing import Tuple, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import aioimaplib
+from django.conf import settings
+
+MESSAGE_ID_HEADER_PATTERN = re.compile(rb"^Message-ID:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+FETCH_UID_PATTERN = re.compile(rb"\bUID (\d+)")
+MESSAGE_ID_FETCH_ITEM = "(UID BODY.PEEK[HEADER.FIELDS (MESSAGE-ID)])"
+SENDER_FETCH_ITEM = "(UID BODY.PEEK[HEADER.FIELDS (FROM)])"
+GMAIL_PLACEMENT_FETCH_ITEM = "(UID X-GM-LABELS BODY.PEEK[HEADER.FIELDS (FROM)])"
+SENDER_HEADER_FETCH_KEY = "BODY[HEADER.FIELDS (FROM)]"
+LITERAL_PATTERN = re.compile(r"^\{(\d+)\}$")
+# Senders OR'd in one SEARCH, keeps Command Lines within Provider Limits
+SEARCH_SENDERS_PER_COMMAND = 50
+
+
+def build_sequence_set(numbers: list) -> str:
+    """
+    Build Compact IMAP Sequence Set of Message Numbers or UIDs, e.g. [1, 2, 3, 7] becomes "1:3,7"
+    """
+    ranges = list()
+    for number in sorted(set(int(number) for number in numbers)):
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ",".join(str(start) if start == end else f"{start}:{end}" for start, end in ranges)
+
+
+def build_or_search_criteria(key: str, values: list) -> str:
+    """
+    Build IMAP SEARCH Criteria Matching any of the Values, e.g. OR (FROM "a") (OR (FROM "b") (FROM "c"))
+    """
+    criteria = f'({key} "{values[-1]}")'
+    for value in reversed(values[:-1]):
+        criteria = f'(OR ({key} "{value}") {criteria})'
+    return criteria
+
+
+def tokenize_imap_list(text: str, literals: list = None) -> list:
+    """
+    Tokenize IMAP Data (RFC 3501) into Nested Lists of Atoms and Strings
+    Parenthesized lists become lists, quoted strings are unescaped and bracketed sections like
+    BODY[HEADER.FIELDS (FROM)] are kept in one atom
+    Literal markers like {42} are replaced in order by the given literals
+    """
+    literals = iter(literals or list())
+    root = list()
+    stack = [root]
+    index = 0
+    while index < len(text):
+        character = text[index]
+        if character in " \r\n":
+            index += 1
+        elif character == "(":
+            nested_list = list()
+            stack[-1].append(nested_list)
+            stack.append(nested_list)
+            index += 1
+        elif character == ")":
+            if len(stack) > 1:
+                stack.pop()
+            index += 1
+        elif character == '"':
+            index += 1
+            quoted_characters = list()
+            while index < len(text) and text[index] != '"':
+                if text[index] == "\\" and index + 1 < len(text):
+                    index += 1
+                quoted_characters.append(text[index])
+                index += 1
+            stack[-1].append("".join(quoted_characters))
+            index += 1
+        else:
+            start = index
+            bracket_depth = 0
+            while index < len(text) and (bracket_depth or text[index] not in ' ()"\r\n'):
+                if text[index] == "[":
+                    bracket_depth += 1
+                elif text[index] == "]":
+                    bracket_depth -= 1
+                index += 1
+            atom = text[start:index]
+            stack[-1].append(next(literals, atom) if LITERAL_PATTERN.match(atom) else atom)
+    return root
+
+
+def parse_fetch_response(data: list) -> dict:
+    """
+    Parse UID FETCH Response Data of imaplib to Dicts of Fetch Items by UID, Literals are kept as Bytes
+    """
+    text_parts = list()
+    literals = list()
+    for response_part in data:
+        if isinstance(response_part, tuple):
+            text_parts.append(response_part[0].decode('utf-8', 'replace'))
+            literals.append(response_part[1])
+        elif response_part:
+            text_parts.append(response_part.decode('utf-8', 'replace'))
+    fetch_items_by_uid = dict()
+    # Responses are "<Sequence Number> (<Item> <Value> ...)", Sequence Numbers are Skipped
+    for token in tokenize_imap_list(" ".join(text_parts), literals=literals):
+        if not isinstance(token, list):
+            continue
+        fetch_items = {str(key).upper(): value for key, value in zip(token[::2], token[1::2])}
+        if str(fetch_items.get('UID', '')).isdigit():
+            fetch_items_by_uid[int(fetch_items['UID'])] = fetch_items
+    return fetch_items_by_uid
+
+
+def get_sender_email(fetch_items: dict) -> str:
+    """
+    Get Lower Cased Sender Email from the Fetched FROM Header
+    """
+    header = fetch_items.get(SENDER_HEADER_FETCH_KEY)
+    if not isinstance(header, bytes):
+        return ""
+    return parseaddr(message_from_bytes(header).get('From', ''))[1].lower()
+
+
+class IMAPSession:
+    """
+    Authenticated IMAP Connection with its Selected Mailbox
+    """
+
+    def __init__(self, imap: imaplib.IMAP4_SSL):
+        self.imap = imap
+        self.selected_mailbox = None
+        self.uid_validity = None
+        self.last_used_at = time.monotonic()
+
+    def select(self, mailbox: str) -> None:
+        """
+        Select the Mailbox, skipped when it is already Selected on this Session
+        """
+        if self.selected_mailbox != mailbox:
+            self.selected_mailbox = None
+            result, data = self.imap.select(mailbox)
+            if result != "OK":
+                raise imaplib.IMAP4.error(f"SELECT {mailbox} failed: {data}")
+            self.selected_mailbox = mailbox
+            _, uid_validity = self.imap.response('UIDVALIDITY')
+            self.uid_validity = int(uid_validity[-1]) if uid_validity and uid_validity[-1] else None
+
+
+class IMAPSessionCache:
+    """
+    Per-process Cache of Authenticated IMAP Sessions keyed by (host, username)
+    Idle Sessions are kept alive with NOOP and Logged out when Evicted
+    """
+
+    def __init__(self, max_sessions: int, idle_timeout: int, keepalive_interval: int):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+        self.__idle_sessions = OrderedDict()
+        self.__keepalive_stopped = threading.Event()
+
+    def __reset_after_fork(self) -> None:
+        # Sessions opened by the Parent Process must not be shared with Forked Celery Workers
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__lock = threading.Lock()
+            self.__idle_sessions = OrderedDict()
+            self.__keepalive_stopped = threading.Event()
+
+    @staticmethod
+    def __logout(session: IMAPSession) -> None:
+        try:
+            session.imap.logout()
+        except Exception:
+            try:
+                session.imap.shutdown()
+            except Exception:
+                pass
+
+    @staticmethod
+    def __is_alive(session: IMAPSession) -> bool:
+        try:
+            return session.imap.noop()[0] == "OK"
+        except Exception:
+            return False
+
+    def acquire(self, imap_services: "IMAPServices") -> IMAPSession:
+        """
+        Get the Idle Session of the Account or Open a New one
+        """
+        self.__reset_after_fork()
+        self.close_idle_sessions()
+        with self.__lock:
+            session = self.__idle_sessions.pop((imap_services.host, imap_services.username), None)
+        if session is not None:
+            if time.monotonic() - session.last_used_at < self.keepalive_interval or self.__is_alive(session):
+                return session
+            self.__logout(session)
+        imap = imap_services.get_connection_with_imap()
+        if imap is None:
+            raise imaplib.IMAP4.abort(f"Connection to {imap_services.host} Aborted")
+        return IMAPSession(imap=imap)
+
+    def release(self, imap_services: "IMAPServices", session: IMAPSession) -> None:
+        """
+        Return the Session to the Cache, Least Recently Used Sessions are Logged out over Max Sessions
+        """
+        self.__reset_after_fork()
+        key = (imap_services.host, imap_services.username)
+        session.last_used_at = time.monotonic()
+        evicted_sessions = list()
+        with self.__lock:
+            replaced_session = self.__idle_sessions.pop(key, None)
+            if replaced_session is not None:
+                evicted_sessions.append(replaced_session)
+            self.__idle_sessions[key] = session
+            while len(self.__idle_sessions) > self.max_sessions:
+                evicted_sessions.append(self.__idle_sessions.popitem(last=False)[1])
+        for evicted_session in evicted_sessions:
+            self.__logout(evicted_session)
+
+    def discard(self, session: IMAPSession) -> None:
+        """
+        Log out the Session without returning it to the Cache
+        """
+        self.__logout(session)
+
+    def close_idle_sessions(self) -> None:
+        """
+        Log out Sessions which are Idle for more than Idle Timeout
+        """
+        now = time.monotonic()
+        with self.__lock:
+            expired_keys = [key for key, session in self.__idle_sessions.items() if
+                            now - session.last_used_at >= self.idle_timeout]
+            expired_sessions = [self.__idle_sessions.pop(key) for key in expired_keys]
+        for session in expired_sessions:
+            self.__logout(session)
+
+    def keepalive(self) -> None:
+        """
+        Send NOOP on Idle Sessions so Providers do not drop them, Dead Sessions are Evicted
+        """
+        self.close_idle_sessions()
+        now = time.monotonic()
+        with self.__lock:
+            stale_sessions = [(key, session) for key, session in self.__idle_sessions.items() if
+                              now - session.last_used_at >= self.keepalive_interval]
+            for key, _ in stale_sessions:
+                del self.__idle_sessions[key]
+        for key, session in stale_sessions:
+            if self.__is_alive(session):
+                with self.__lock:
+                    if key not in self.__idle_sessions:
+                        self.__idle_sessions[key] = session
+                        continue
+            self.__logout(session)
+
+    def start_keepalive(self) -> threading.Thread:
+        """
+        Run keepalive every Keepalive Interval on a Daemon Thread of the Process until close_all
+        """
+        self.__reset_after_fork()
+        keepalive_stopped = self.__keepalive_stopped
+
+        def run_keepalive():
+            while not keepalive_stopped.wait(self.keepalive_interval):
+                try:
+                    self.keepalive()
+                except Exception as e:
+                    print(e)
+
+        keepalive_thread = threading.Thread(target=run_keepalive, name="imap-session-keepalive", daemon=True)
+        keepalive_thread.start()
+        return keepalive_thread
+
+    def close_all(self) -> None:
+        """
+        Stop the Keepalive Thread and Log out all Idle Sessions of the Cache
+        """
+        self.__keepalive_stopped.set()
+        with self.__lock:
+            idle_sessions = list(self.__idle_sessions.values())
+            self.__idle_sessions = OrderedDict()
+        for session in idle_sessions:
+            self.__logout(session)
+
+    @contextmanager
+    def session(self, imap_services: "IMAPServices"):
+        """
+        Acquire a Session and Release it back to the Cache, Sessions in unknown state are Logged out
+        """
+        session = self.acquire(imap_services=imap_services)
+        try:
+            yield session
+        except (imaplib.IMAP4.abort, OSError):
+            self.discard(session=session)
+            raise
+        except imaplib.IMAP4.error:
+            # Command was Rejected by the Server (NO / BAD), Session is still Usable
+            self.release(imap_services=imap_services, session=session)
+            raise
+        except Exception:
+            self.discard(session=session)
+            raise
+        else:
+            self.release(imap_services=imap_services, session=session)
 
 
 class IMAPServices:
     def __init__(self, email_provider: str, username: str, app_password: str):
+        self.email_provider = email_provider
         self.host = 'imap.gmail.com' if email_provider == 'gmail' else 'outlook.office365.com'
         self.username = username
         self.password = app_password
@@ -17,38 +332,285 @@ class IMAPServices:
         except Exception as e:
             print('Connection Aborted...', e)
 
+    @staticmethod
+    def __search_uids(session: IMAPSession, search_query: str) -> list:
+        result, data = session.imap.uid('SEARCH', None, search_query)
+        if result != "OK" or not data or not data[0]:
+            return list()
+        return [int(uid) for uid in data[0].split()]
+
+    @staticmethod
+    def __fetch_message_ids(session: IMAPSession, uids: list) -> dict:
+        message_ids = dict()
+        if not uids:
+            return message_ids
+        # Only the Message-ID Header is Downloaded, PEEK keeps the Seen Flag untouched
+        result, data = session.imap.uid('FETCH', build_sequence_set(uids), MESSAGE_ID_FETCH_ITEM)
+        if result != "OK":
+            return message_ids
+        for response_part in data:
+            if not isinstance(response_part, tuple):
+                continue
+            matched_uid = FETCH_UID_PATTERN.search(response_part[0])
+            matched_message_id = MESSAGE_ID_HEADER_PATTERN.search(response_part[1])
+            if matched_uid and matched_message_id:
+                message_ids[int(matched_uid.group(1))] = matched_message_id.group(1).decode('utf-8')
+        return message_ids
+
+    @staticmethod
+    def __fetch_items(session: IMAPSession, uids: list, fetch_item: str) -> dict:
+        if not uids:
+            return dict()
+        result, data = session.imap.uid('FETCH', build_sequence_set(uids), fetch_item)
+        if result != "OK":
+            return dict()
+        return parse_fetch_response(data)
+
+    def __search_uids_by_senders(self, session: IMAPSession, sender_emails: list, since: datetime.date,
+                                 before: datetime.date) -> list:
+        uids = list()
+        for index in range(0, len(sender_emails), SEARCH_SENDERS_PER_COMMAND):
+            sender_criteria = build_or_search_criteria(
+                key='FROM', values=sender_emails[index:index + SEARCH_SENDERS_PER_COMMAND])
+            search_query = f'(SINCE {since.strftime("%d-%b-%Y")} BEFORE {before.strftime("%d-%b-%Y")} ' \
+                           f'{sender_criteria})'
+            uids.extend(self.__search_uids(session=session, search_query=search_query))
+        return uids
+
+    def __scan_mailbox(self, session: IMAPSession, mailbox: str, fetch_item: str, sender_emails: list,
+                       since: datetime.date, before: datetime.date, mailbox_uids: dict = None) -> list:
+        session.select(mailbox)
+        if mailbox_uids is None:
+            uids = self.__search_uids_by_senders(session=session, sender_emails=sender_emails, since=since,
+                                                 before=before)
+        else:
+            # Only Mails after the Last Scanned UID, UIDs are only Comparable while UIDVALIDITY is unchanged
+            uid_validity, last_uid = mailbox_uids.get(mailbox) or (None, 0)
+            if uid_validity != session.uid_validity:
+                last_uid = 0
+            search_query = f'(UID {last_uid + 1}:* SINCE {since.strftime("%d-%b-%Y")} ' \
+                           f'BEFORE {before.strftime("%d-%b-%Y")})'
+            # "n:*" Matches the Last Mail even when its UID is below n
+            uids = [uid for uid in self.__search_uids(session=session, search_query=search_query) if uid > last_uid]
+            mailbox_uids[mailbox] = [session.uid_validity, max(uids, default=last_uid)]
+        return list(self.__fetch_items(session=session, uids=uids, fetch_item=fetch_item).values())
+
+    def __count_mail_placements(self, session: IMAPSession, sender_emails: list, since: datetime.date,
+                                before: datetime.date, mailbox_uids: dict = None) -> dict:
+        placements = {sender_email.lower(): {'inbox_count': 0, 'category_count': 0, 'spam_count': 0} for
+                      sender_email in sender_emails}
+        if self.email_provider == 'gmail':
+            # Placement of Gmail Mails is given by their Labels, Mails out of Inbox are in a Category
+            for fetch_items in self.__scan_mailbox(session=session, mailbox='"[Gmail]/All Mail"',
+                                                   fetch_item=GMAIL_PLACEMENT_FETCH_ITEM,
+                                                   sender_emails=sender_emails, since=since, before=before,
+                                                   mailbox_uids=mailbox_uids):
+                sender_placements = placements.get(get_sender_email(fetch_items=fetch_items))
+                if sender_placements is None:
+                    continue
+                labels = [str(label).lstrip("\\").lower() for label in fetch_items.get('X-GM-LABELS') or list()]
+                sender_placements['inbox_count' if 'inbox' in labels else 'category_count'] += 1
+            spam_mailbox = '[Gmail]/Spam'
+        else:
+            for fetch_items in self.__scan_mailbox(session=session, mailbox='Inbox', fetch_item=SENDER_FETCH_ITEM,
+                                                   sender_emails=sender_emails, since=since, before=before,
+                                                   mailbox_uids=mailbox_uids):
+                sender_placements = placements.get(get_sender_email(fetch_items=fetch_items))
+                if sender_placements is not None:
+                    sender_placements['inbox_count'] += 1
+            spam_mailbox = 'Junk'
+
+        for fetch_items in self.__scan_mailbox(session=session, mailbox=spam_mailbox, fetch_item=SENDER_FETCH_ITEM,
+                                               sender_emails=sender_emails, since=since, before=before,
+                                               mailbox_uids=mailbox_uids):
+            sender_placements = placements.get(get_sender_email(fetch_items=fetch_items))
+            if sender_placements is not None:
+                sender_placements['spam_count'] += 1
+        return {sender_email: placements[sender_email.lower()] for sender_email in sender_emails}
+
+    def count_mail_placements_by_senders(self, sender_emails: list, since: datetime.date,
+                                         before: datetime.date) -> Optional[dict]:
+        """
+        Count Inbox, Category and Spam Placements of Mails from Senders between Dates, by Sender Email
+        One SEARCH and one FETCH per Mailbox, Category Counts are only Known for Gmail
+        Returns None when the Mailboxes could not be Scanned
+        """
+        if not sender_emails:
+            return dict()
+        try:
+            try:
+                with imap_session_cache.session(imap_services=self) as session:
+                    return self.__count_mail_placements(session=session, sender_emails=sender_emails, since=since,
+                                                        before=before)
+            except imaplib.IMAP4.abort:
+                # Cached Session was Dropped by the Provider, Retry once on a Fresh Session
+                with imap_session_cache.session(imap_services=self) as session:
+                    return self.__count_mail_placements(session=session, sender_emails=sender_emails, since=since,
+                                                        before=before)
+        except Exception as e:
+            print(e)
+            return None
+
+    def count_new_mail_placements_by_senders(self, sender_emails: list, since: datetime.date, before: datetime.date,
+                                             mailbox_uids: dict) -> Tuple[dict, dict]:
+        """
+        Count Placements of Mails from Senders which Arrived after the Last Scanned UIDs of the Mailboxes
+        mailbox_uids is like {"Inbox": [UIDVALIDITY, Last UID]}, Returns Placements and Updated mailbox_uids
+        which are Unchanged when the Mailboxes could not be Scanned
+        """
+        if not sender_emails:
+            return dict(), mailbox_uids
+        try:
+            updated_mailbox_uids = dict(mailbox_uids)
+            with imap_session_cache.session(imap_services=self) as session:
+                placements = self.__count_mail_placements(session=session, sender_emails=sender_emails, since=since,
+                                                          before=before, mailbox_uids=updated_mailbox_uids)
+            return placements, updated_mailbox_uids
+        except Exception as e:
+            print(e)
+            return dict(), mailbox_uids
+
+    def __search_latest_mail_message_id(self, session: IMAPSession, subject: str, receiver_email: str):
+        session.select('Inbox')
+        # Get Mails which one's Subject is Matching
+        search_query = f'(FROM "{receiver_email}" SUBJECT "{subject}")'
+        uids = self.__search_uids(session=session, search_query=search_query)
+        if not uids:
+            return None
+        latest_uid = max(uids)
+        return self.__fetch_message_ids(session=session, uids=[latest_uid]).get(latest_uid)
+
     def get_latest_mail_message_id_by_subject(self, subject: str, receiver_email: str):
         try:
-            imap = self.get_connection_with_imap()
-            imap.select('Inbox')
-            # Get Mails which one's Subject is Matching
+            try:
+                with imap_session_cache.session(imap_services=self) as session:
+                    return self.__search_latest_mail_message_id(session=session, subject=subject,
+                                                                receiver_email=receiver_email)
+            except imaplib.IMAP4.abort:
+                # Cached Session was Dropped by the Provider, Retry once on a Fresh Session
+                with imap_session_cache.session(imap_services=self) as session:
+                    return self.__search_latest_mail_message_id(session=session, subject=subject,
+                                                                receiver_email=receiver_email)
+        except Exception as e:
+            print(e)
+            pass
+
+    def get_message_ids_by_uids(self, uids: list, mailbox: str = 'Inbox') -> dict:
+        """
+        Get Message-IDs of Mails by UIDs with one Header-only UID FETCH
+        """
+        try:
+            with imap_session_cache.session(imap_services=self) as session:
+                session.select(mailbox)
+                return self.__fetch_message_ids(session=session, uids=uids)
+        except Exception as e:
+            print(e)
+            return dict()
+
+    def mark_seen_many(self, uids: list, mailbox: str = 'Inbox') -> bool:
+        """
+        Mark Mails as Seen by UIDs with one UID STORE
+        """
+        if not uids:
+            return True
+        try:
+            with imap_session_cache.session(imap_services=self) as session:
+                session.select(mailbox)
+                result, _ = session.imap.uid('STORE', build_sequence_set(uids), '+FLAGS.SILENT', '(\\Seen)')
+                return result == "OK"
+        except Exception as e:
+            print(e)
+            return False
+
+    def read_mail_by_subject(self, subject: str):
+        try:
+            with imap_session_cache.session(imap_services=self) as session:
+                session.select('Inbox')
+                # Get Mails which one's Subject is Matching
+                search_query = f'(SUBJECT "{subject}")'
+                uids = self.__search_uids(session=session, search_query=search_query)
+            return self.mark_seen_many(uids=uids)
+        except Exception as e:
+            print(e)
+            pass
+
+
+class AsyncIMAPServices:
+    """
+    asyncio Counterpart of IMAPServices with the same method surface
+    """
+
+    def __init__(self, email_provider: str, username: str, app_password: str, hostname: str = None,
+                 port: int = None, use_ssl: bool = True):
+        self.host = hostname or ('imap.gmail.com' if email_provider == 'gmail' else 'outlook.office365.com')
+        self.port = port or (993 if use_ssl else 143)
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = app_password
+
+    @staticmethod
+    def __get_search_uids(response: aioimaplib.Response) -> list:
+        if response.result != "OK" or not response.lines:
+            return list()
+        search_line = response.lines[0]
+        if isinstance(search_line, (bytes, bytearray)):
+            search_line = search_line.decode('utf-8')
+        return [int(uid) for uid in search_line.split() if uid.isdigit()]
+
+    async def get_connection_with_imap(self) -> aioimaplib.IMAP4:
+        try:
+            if self.use_ssl:
+                imap = aioimaplib.IMAP4_SSL(host=self.host, port=self.port)
+            else:
+                imap = aioimaplib.IMAP4(host=self.host, port=self.port)
+            await imap.wait_hello_from_server()
+            await imap.login(self.username, self.password)
+
+            return imap
+        except Exception as e:
+            print('Connection Aborted...', e)
+
+    async def get_latest_mail_message_id_by_subject(self, subject: str, receiver_email: str):
+        imap = await self.get_connection_with_imap()
+        try:
+            await imap.select('Inbox')
+            # Get Mails which one's Subject is Matching, UIDs stay Stable while other Mails are Expunged
             search_query = f'(FROM "{receiver_email}" SUBJECT "{subject}")'
-            result, email_ids = imap.search(None, search_query)
+            uids = self.__get_search_uids(await imap.uid_search(search_query, charset=None))
             message_id = None
-            if result == "OK" and email_ids[0]:
-                email_ids = email_ids[0].split()
-                result, email_data = imap.fetch(email_ids[-1], "(RFC822)")
-                if result:
-                    raw_email = email_data[0][1]
-                    msg = email.message_from_bytes(raw_email)
-                    message_id = msg.get("Message-ID").strip()
+            if uids:
+                response = await imap.uid('fetch', str(max(uids)), MESSAGE_ID_FETCH_ITEM)
+                if response.result == "OK":
+                    raw_headers = b"\r\n".join(bytes(line) for line in response.lines)
+                    matched_message_id = MESSAGE_ID_HEADER_PATTERN.search(raw_headers)
+                    if matched_message_id:
+                        message_id = matched_message_id.group(1).decode('utf-8')
             return message_id
         except Exception as e:
             print(e)
             pass
+        finally:
+            if imap:
+                await imap.logout()
 
-    def read_mail_by_subject(self, subject: str):
+    async def read_mail_by_subject(self, subject: str):
+        imap = await self.get_connection_with_imap()
         try:
-            imap = self.get_connection_with_imap()
-            imap.select('Inbox')
+            await imap.select('Inbox')
             # Get Mails which one's Subject is Matching
             search_query = f'(SUBJECT "{subject}")'
-            result, email_ids = imap.search(None, search_query)
-            email_ids = email_ids[0].split()
-            if result == "OK" and email_ids:
-                for ids in email_ids:
-                    result, email_data = imap.fetch(ids, "(RFC822)")
+            uids = self.__get_search_uids(await imap.uid_search(search_query, charset=None))
+            if uids:
+                await imap.uid('store', build_sequence_set(uids), "+FLAGS.SILENT", "(\\Seen)")
             return True
         except Exception as e:
             print(e)
             pass
+        finally:
+            if imap:
+                await imap.logout()
+
+
+imap_session_cache = IMAPSessionCache(max_sessions=int(getattr(settings, "IMAP_SESSION_CACHE_SIZE", 100)),
+                                      idle_timeout=int(getattr(settings, "IMAP_SESSION_IDLE_TIMEOUT", 600)),
+                                      keepalive_interval=int(getattr(settings, "IMAP_SESSION_KEEPALIVE_INTERVAL", 60)))
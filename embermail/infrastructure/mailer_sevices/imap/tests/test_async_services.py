@@ -0,0 +1,64 @@
+import asyncio
+
+from embermail.infrastructure.mailer_sevices.imap.services import AsyncIMAPServices
+from embermail.infrastructure.mailer_sevices.stub.services import StubMailStore, StubIMAPServer
+
+RECEIVER_EMAIL = "receiver@outlook.com"
+
+
+def deliver(mail_store: StubMailStore, sender: str, recipient: str, subject: str, message_id: str) -> dict:
+    return mail_store.deliver(sender=sender, recipient=recipient, raw_message=(
+        f"From: {sender}\r\nTo: {recipient}\r\nSubject: {subject}\r\nMessage-ID: {message_id}\r\n\r\nBody\r\n").encode(
+        'utf-8'))
+
+
+def run_with_stub_imap_server(mail_store: StubMailStore, read):
+    async def run():
+        imap_server = StubIMAPServer(mail_store=mail_store)
+        await imap_server.start()
+        try:
+            return await read(AsyncIMAPServices(email_provider="outlook", username=RECEIVER_EMAIL,
+                                                app_password="secret", hostname=imap_server.host,
+                                                port=imap_server.port, use_ssl=False))
+        finally:
+            await imap_server.stop()
+
+    return asyncio.run(run())
+
+
+def build_mail_store() -> StubMailStore:
+    mail_store = StubMailStore()
+    # Mails of another Mailbox take the first UIDs, so UIDs of the Receiver differ from its Sequence Numbers
+    deliver(mail_store, "sender@gmail.com", "other@outlook.com", "Warmup Subject", "<other@gmail.com>")
+    deliver(mail_store, "sender@gmail.com", RECEIVER_EMAIL, "Warmup Subject", "<first@gmail.com>")
+    deliver(mail_store, "stranger@gmail.com", RECEIVER_EMAIL, "Warmup Subject", "<stranger@gmail.com>")
+    deliver(mail_store, "sender@gmail.com", RECEIVER_EMAIL, "Re: Warmup Subject", "<reply@gmail.com>")
+    deliver(mail_store, "sender@gmail.com", RECEIVER_EMAIL, "Other Subject", "<unrelated@gmail.com>")
+    return mail_store
+
+
+def test_get_latest_mail_message_id_by_subject_returns_message_id_of_latest_uid():
+    message_id = run_with_stub_imap_server(build_mail_store(), lambda imap_services: (
+        imap_services.get_latest_mail_message_id_by_subject(subject="Warmup Subject",
+                                                            receiver_email="sender@gmail.com")))
+
+    assert message_id == "<reply@gmail.com>"
+
+
+def test_get_latest_mail_message_id_by_subject_returns_none_without_matching_mail():
+    message_id = run_with_stub_imap_server(build_mail_store(), lambda imap_services: (
+        imap_services.get_latest_mail_message_id_by_subject(subject="Missing Subject",
+                                                            receiver_email="sender@gmail.com")))
+
+    assert message_id is None
+
+
+def test_read_mail_by_subject_marks_only_matching_mails_of_the_mailbox_seen():
+    mail_store = build_mail_store()
+
+    assert run_with_stub_imap_server(mail_store, lambda imap_services: imap_services.read_mail_by_subject(
+        subject="Warmup Subject"))
+
+    seen_message_ids = [message['headers']['Message-ID'] for message in mail_store.messages if
+                        "\\Seen" in message['flags']]
+    assert seen_message_ids == ["<first@gmail.com>", "<stranger@gmail.com>", "<reply@gmail.com>"]
@@ -0,0 +1,125 @@
+import asyncio
+import imaplib
+import datetime
+import threading
+
+import pytest
+
+from embermail.infrastructure.mailer_sevices.imap.services import IMAPServices, imap_session_cache, \
+    build_sequence_set, build_or_search_criteria, parse_fetch_response, get_sender_email
+from embermail.infrastructure.mailer_sevices.stub.services import StubMailStore, StubIMAPServer
+
+TODAY = datetime.date.today()
+TOMORROW = TODAY + datetime.timedelta(days=1)
+
+
+def test_build_sequence_set_merges_consecutive_numbers():
+    assert build_sequence_set([7, 3, 1, 2, 3, "9", 8]) == "1:3,7:9"
+    assert build_sequence_set([4]) == "4"
+
+
+def test_build_or_search_criteria_nests_or_for_every_extra_value():
+    assert build_or_search_criteria(key="FROM", values=["a@gmail.com"]) == '(FROM "a@gmail.com")'
+    assert build_or_search_criteria(key="FROM", values=["a@gmail.com", "b@gmail.com", "c@gmail.com"]) == (
+        '(OR (FROM "a@gmail.com") (OR (FROM "b@gmail.com") (FROM "c@gmail.com")))')
+
+
+def test_parse_fetch_response_returns_fetch_items_by_uid():
+    data = [
+        (b'1 (UID 5 X-GM-LABELS ("\\\\Inbox" \\Important) BODY[HEADER.FIELDS (FROM)] {33}',
+         b'From: First <First@Gmail.com>\r\n\r\n'),
+        b')',
+        (b'2 (UID 9 X-GM-LABELS () BODY[HEADER.FIELDS (FROM)] {26}', b'From: second@gmail.com\r\n\r\n'),
+        b')',
+        b'3 (UID 12 FLAGS (\\Seen))',
+    ]
+
+    fetch_items_by_uid = parse_fetch_response(data=data)
+
+    assert sorted(fetch_items_by_uid) == [5, 9, 12]
+    assert fetch_items_by_uid[5]['X-GM-LABELS'] == ["\\Inbox", "\\Important"]
+    assert fetch_items_by_uid[9]['X-GM-LABELS'] == []
+    assert fetch_items_by_uid[12]['FLAGS'] == ["\\Seen"]
+    assert get_sender_email(fetch_items=fetch_items_by_uid[5]) == "first@gmail.com"
+    assert get_sender_email(fetch_items=fetch_items_by_uid[9]) == "second@gmail.com"
+    assert get_sender_email(fetch_items=fetch_items_by_uid[12]) == ""
+
+
+def test_parse_fetch_response_skips_responses_without_uid():
+    assert parse_fetch_response(data=[b'1 (FLAGS (\\Seen))', None]) == dict()
+
+
+@pytest.fixture
+def stub_imap_server(monkeypatch):
+    mail_store = StubMailStore()
+    loop = asyncio.new_event_loop()
+    imap_server = StubIMAPServer(mail_store=mail_store)
+    loop.run_until_complete(imap_server.start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    def get_connection_with_imap(imap_services: IMAPServices) -> imaplib.IMAP4:
+        imap = imaplib.IMAP4(imap_server.host, imap_server.port)
+        imap.login(imap_services.username, imap_services.password)
+        return imap
+
+    monkeypatch.setattr(IMAPServices, "get_connection_with_imap", get_connection_with_imap)
+    yield mail_store
+    imap_session_cache.close_all()
+    asyncio.run_coroutine_threadsafe(imap_server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def deliver(mail_store: StubMailStore, sender: str, recipient: str, total_mails: int = 1) -> None:
+    for _ in range(total_mails):
+        mail_store.deliver(sender=sender, recipient=recipient,
+                           raw_message=f"From: {sender}\r\nTo: {recipient}\r\nSubject: Hi\r\n\r\nBody\r\n".encode())
+
+
+def test_count_mail_placements_by_senders_counts_inbox_and_spam_of_senders(stub_imap_server):
+    mail_store = stub_imap_server
+    mail_store.spam_senders.add("spammed@gmail.com")
+    deliver(mail_store, "first@gmail.com", "receiver@outlook.com", total_mails=2)
+    deliver(mail_store, "spammed@gmail.com", "receiver@outlook.com")
+    deliver(mail_store, "stranger@gmail.com", "receiver@outlook.com")
+    deliver(mail_store, "first@gmail.com", "other@outlook.com")
+
+    placements = IMAPServices(email_provider="outlook", username="receiver@outlook.com",
+                              app_password="secret").count_mail_placements_by_senders(
+        sender_emails=["first@gmail.com", "spammed@gmail.com", "silent@gmail.com"], since=TODAY, before=TOMORROW)
+
+    assert placements == {
+        "first@gmail.com": {'inbox_count': 2, 'category_count': 0, 'spam_count': 0},
+        "spammed@gmail.com": {'inbox_count': 0, 'category_count': 0, 'spam_count': 1},
+        "silent@gmail.com": {'inbox_count': 0, 'category_count': 0, 'spam_count': 0},
+    }
+
+
+def test_count_new_mail_placements_by_senders_counts_only_mails_after_last_scanned_uids(stub_imap_server):
+    mail_store = stub_imap_server
+    imap_services = IMAPServices(email_provider="outlook", username="receiver@outlook.com", app_password="secret")
+    deliver(mail_store, "first@gmail.com", "receiver@outlook.com", total_mails=2)
+
+    placements, mailbox_uids = imap_services.count_new_mail_placements_by_senders(
+        sender_emails=["first@gmail.com"], since=TODAY, before=TOMORROW, mailbox_uids=dict())
+    assert placements["first@gmail.com"]['inbox_count'] == 2
+
+    deliver(mail_store, "first@gmail.com", "receiver@outlook.com")
+    placements, mailbox_uids = imap_services.count_new_mail_placements_by_senders(
+        sender_emails=["first@gmail.com"], since=TODAY, before=TOMORROW, mailbox_uids=mailbox_uids)
+    assert placements["first@gmail.com"]['inbox_count'] == 1
+
+    placements, _ = imap_services.count_new_mail_placements_by_senders(
+        sender_emails=["first@gmail.com"], since=TODAY, before=TOMORROW, mailbox_uids=mailbox_uids)
+    assert placements["first@gmail.com"]['inbox_count'] == 0
+
+
+def test_count_mail_placements_by_senders_returns_none_when_mailbox_is_unreachable(monkeypatch):
+    def get_connection_with_imap(imap_services: IMAPServices) -> imaplib.IMAP4:
+        raise ConnectionRefusedError("IMAP Server is down")
+
+    monkeypatch.setattr(IMAPServices, "get_connection_with_imap", get_connection_with_imap)
+    placements = IMAPServices(email_provider="outlook", username="unreachable@outlook.com",
+                              app_password="secret").count_mail_placements_by_senders(
+        sender_emails=["first@gmail.com"], since=TODAY, before=TOMORROW)
+
+    assert placements is None
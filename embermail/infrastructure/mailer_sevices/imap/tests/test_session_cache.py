@@ -0,0 +1,56 @@
+import time
+
+from embermail.infrastructure.mailer_sevices.imap.services import IMAPServices, IMAPSession, IMAPSessionCache
+
+
+class FakeIMAP:
+    def __init__(self, alive: bool = True):
+        self.alive = alive
+        self.noops = 0
+        self.logged_out = False
+
+    def noop(self):
+        self.noops += 1
+        if not self.alive:
+            raise OSError("Connection Reset")
+        return "OK", [b"NOOP completed"]
+
+    def logout(self):
+        self.logged_out = True
+
+
+def release_session(imap_session_cache: IMAPSessionCache, username: str, imap: FakeIMAP) -> None:
+    imap_session_cache.release(imap_services=IMAPServices(email_provider="gmail", username=username,
+                                                          app_password="secret"),
+                               session=IMAPSession(imap=imap))
+
+
+def test_keepalive_sends_noop_on_idle_sessions_and_evicts_dead_ones():
+    imap_session_cache = IMAPSessionCache(max_sessions=10, idle_timeout=600, keepalive_interval=0)
+    alive_imap, dead_imap = FakeIMAP(), FakeIMAP(alive=False)
+    release_session(imap_session_cache, "alive@gmail.com", alive_imap)
+    release_session(imap_session_cache, "dead@gmail.com", dead_imap)
+
+    imap_session_cache.keepalive()
+
+    assert (alive_imap.noops, alive_imap.logged_out) == (1, False)
+    assert (dead_imap.noops, dead_imap.logged_out) == (1, True)
+    imap_session_cache.close_all()
+    assert alive_imap.logged_out
+
+
+def test_start_keepalive_runs_until_close_all():
+    imap_session_cache = IMAPSessionCache(max_sessions=10, idle_timeout=600, keepalive_interval=0.01)
+    imap = FakeIMAP()
+    release_session(imap_session_cache, "alive@gmail.com", imap)
+
+    keepalive_thread = imap_session_cache.start_keepalive()
+    deadline = time.monotonic() + 5
+    while imap.noops < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    imap_session_cache.close_all()
+    keepalive_thread.join(timeout=5)
+
+    assert imap.noops >= 2
+    assert imap.logged_out
+    assert not keepalive_thread.is_alive()
@@ -1,29 +1,78 @@
 """This file includes the function for the sendgrid mail functionality"""
 
+import os
+
+import requests
 from django.conf import settings
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-from python_http_client import exceptions
 
 from utils.django.exceptions import SendgridEmailException
 
+SENDGRID_MAIL_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+# SendGrid Accepts up to 1000 Personalizations in one Mail Send Request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+SENDGRID_RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
 
-def sendgrid_mail(to_email: str, TEMPLATE_KEY: str, dynamic_data_for_template: dict):
+class SendGridClient:
     """
-    This function is used to send emails using Sendgrid
+    Per-process SendGrid Mail Send Client on one Keep-Alive HTTP Session
     """
-    SENDGRID_API_KEY = getattr(settings, "SENDGRID_API_KEY", None)
-    SENDGRID_FROM_MAIL = getattr(settings, "SENDGRID_FROM_MAIL", None)
-    message = Mail(
-        from_email=SENDGRID_FROM_MAIL,
-        to_emails=to_email,
-    )
-    message.dynamic_template_data = dynamic_data_for_template
-    message.template_id = TEMPLATE_KEY
-    try:
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
+
+    def __init__(self, timeout: int):
+        self.timeout = timeout
+        self.__pid = os.getpid()
+        self.__session = None
+
+    def __get_session(self) -> requests.Session:
+        # Connections opened by the Parent Process must not be shared with Forked Celery Workers
+        if self.__session is None or self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__session = requests.Session()
+            self.__session.headers.update({
+                "Authorization": f"Bearer {getattr(settings, 'SENDGRID_API_KEY', None)}",
+                "Content-Type": "application/json",
+            })
+        return self.__session
+
+    def send_batch(self, template_id: str, personalizations: list) -> requests.Response:
+        """
+        Send a Dynamic Template to many Recipients with one Request, personalizations are like
+        [{"to_email": "x@y.com", "dynamic_template_data": {...}, "custom_args": {...}}]
+        Raises SendgridEmailException, item['retryable'] tells if the Request may be Retried
+        """
+        if len(personalizations) > SENDGRID_MAX_PERSONALIZATIONS:
+            raise ValueError(f"SendGrid Accepts up to {SENDGRID_MAX_PERSONALIZATIONS} Personalizations.")
+        payload = {
+            "from": {"email": getattr(settings, "SENDGRID_FROM_MAIL", None)},
+            "template_id": template_id,
+            "personalizations": [
+                {
+                    "to": [{"email": personalization["to_email"]}],
+                    "dynamic_template_data": personalization.get("dynamic_template_data") or dict(),
+                    **({"custom_args": personalization["custom_args"]} if personalization.get("custom_args") else {}),
+                } for personalization in personalizations
+            ],
+        }
+        try:
+            response = self.__get_session().post(SENDGRID_MAIL_SEND_URL, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            print("Exception in sending mail :", e)
+            raise SendgridEmailException(message="Something went wrong in sending mails.",
+                                         item={'error': e, 'retryable': True})
+        if response.status_code >= 400:
+            print("Exception in sending mail :", response.status_code, response.text)
+            raise SendgridEmailException(message="Something went wrong in sending mails.",
+                                         item={'error': response.text, 'status_code': response.status_code,
+                                               'retryable': response.status_code in SENDGRID_RETRYABLE_STATUS_CODES})
         return response
-    except exceptions.BadRequestsError as e:
-        print("Exception in sending mail :", e)
-        raise SendgridEmailException(message="Something went wrong in sending mails.", item={'error': e})
+
+    def close(self) -> None:
+        """
+        Close the HTTP Session of the Process
+        """
+        if self.__session is not None and self.__pid == os.getpid():
+            self.__session.close()
+        self.__session = None
+
+
+sendgrid_client = SendGridClient(timeout=int(getattr(settings, "SENDGRID_REQUEST_TIMEOUT", 10)))
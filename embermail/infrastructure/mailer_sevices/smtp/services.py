@@ -1,13 +1,141 @@
+import os
+import ssl
+import time
+import uuid
+import asyncio
 import smtplib
+import threading
+from itertools import groupby
+from email.policy import SMTP
+from email.utils import make_msgid
+from contextlib import contextmanager
 from email.message import EmailMessage
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import ssl
 
+import aiosmtplib
 from django.conf import settings
 from django.template.loader import render_to_string
 
 
+class SMTPConnectionPool:
+    """
+    Per-process Pool of Authenticated SMTP Connections keyed by (host, username)
+    """
+
+    def __init__(self, idle_timeout: int, health_check_interval: int):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.__pid = os.getpid()
+        self.__lock = threading.Lock()
+        self.__idle_connections = dict()
+
+    def __reset_after_fork(self) -> None:
+        # Connections opened by the Parent Process must not be shared with Forked Celery Workers
+        if self.__pid != os.getpid():
+            self.__pid = os.getpid()
+            self.__lock = threading.Lock()
+            self.__idle_connections = dict()
+
+    @staticmethod
+    def __close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def __is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def acquire(self, smtp_services: "SMTPServices") -> smtplib.SMTP:
+        """
+        Get an Idle Authenticated Connection for the Sender or Open a New one
+        """
+        self.__reset_after_fork()
+        self.close_idle_connections()
+        key = (smtp_services.host, smtp_services.username)
+        while True:
+            with self.__lock:
+                idle_connections = self.__idle_connections.get(key)
+                if not idle_connections:
+                    break
+                server, last_used_at = idle_connections.pop()
+            if time.monotonic() - last_used_at < self.health_check_interval or self.__is_alive(server):
+                return server
+            self.__close(server)
+        return smtp_services.set_smtp_server_configurations()
+
+    def release(self, smtp_services: "SMTPServices", server: smtplib.SMTP) -> None:
+        """
+        Return the Connection to the Pool for Reuse
+        """
+        self.__reset_after_fork()
+        key = (smtp_services.host, smtp_services.username)
+        with self.__lock:
+            self.__idle_connections.setdefault(key, []).append((server, time.monotonic()))
+
+    def discard(self, server: smtplib.SMTP) -> None:
+        """
+        Close the Connection without returning it to the Pool
+        """
+        self.__close(server)
+
+    def close_idle_connections(self) -> None:
+        """
+        Close Connections which are Idle for more than Idle Timeout
+        """
+        expired_connections = list()
+        now = time.monotonic()
+        with self.__lock:
+            for key, idle_connections in list(self.__idle_connections.items()):
+                expired_connections += [server for server, last_used_at in idle_connections if
+                                        now - last_used_at >= self.idle_timeout]
+                idle_connections[:] = [(server, last_used_at) for server, last_used_at in idle_connections if
+                                       now - last_used_at < self.idle_timeout]
+                if not idle_connections:
+                    del self.__idle_connections[key]
+        for server in expired_connections:
+            self.__close(server)
+
+    def close_all(self) -> None:
+        """
+        Close all Idle Connections of the Pool
+        """
+        with self.__lock:
+            idle_connections = [server for connections in self.__idle_connections.values() for server, _ in
+                                connections]
+            self.__idle_connections = dict()
+        for server in idle_connections:
+            self.__close(server)
+
+    @contextmanager
+    def connection(self, smtp_services: "SMTPServices"):
+        """
+        Acquire a Connection and Release it back to the Pool, Connections in unknown state are Discarded
+        """
+        server = self.acquire(smtp_services=smtp_services)
+        try:
+            yield server
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError):
+            # Transaction was already Reset by smtplib, Connection is still Usable
+            self.release(smtp_services=smtp_services, server=server)
+            raise
+        except Exception:
+            self.discard(server=server)
+            raise
+        else:
+            self.release(smtp_services=smtp_services, server=server)
+
+
+smtp_connection_pool = SMTPConnectionPool(idle_timeout=int(getattr(settings, "SMTP_POOL_IDLE_TIMEOUT", 300)),
+                                          health_check_interval=int(
+                                              getattr(settings, "SMTP_POOL_HEALTH_CHECK_INTERVAL", 30)))
+
+
 class SMTPServices:
 
     def __init__(self, email_provider: str, username: str, app_password: str):
@@ -37,9 +165,19 @@ class SMTPServices:
         except Exception as e:
             raise e
 
-    def configure_email_data(self, subject: str, body: str, to: str, message_id: str = None) -> EmailMessage:
+    @staticmethod
+    def generate_message_id(thread_key: str, thread_index: int, sender_email: str) -> str:
+        """
+        Generate Deterministic Message-ID for a Mail of a Warmup Thread
+        """
+        message_uuid = uuid.uuid5(uuid.NAMESPACE_URL, f"{thread_key}/{thread_index}")
+        return f"<{message_uuid.hex}@{sender_email.split('@')[-1]}>"
+
+    def configure_email_data(self, subject: str, body: str, to: str, message_id: str = None,
+                             new_message_id: str = None) -> EmailMessage:
         """
         Setup Email Parameters to Message Object
+        message_id is the Message-ID of the Parent Mail and new_message_id is set as Message-ID of this Mail
         """
         # EMAIL SETUP
         subject = subject
@@ -51,6 +189,7 @@ class SMTPServices:
         message_object['To'] = to
         message_object['Subject'] = subject
         message_object['Reply-to'] = self.username
+        message_object['Message-ID'] = new_message_id or make_msgid(domain=self.username.split("@")[-1])
         if message_id:
             message_object['In-Reply-To'] = message_id
             message_object['References'] = message_id
@@ -59,17 +198,223 @@ class SMTPServices:
         message_object.attach(part)
         return message_object
 
-    def send_mail(self, to: str, subject: str, body: str, message_id: str = None) -> list:
+    def send_mail(self, to: str, subject: str, body: str, message_id: str = None, new_message_id: str = None) -> dict:
         """
-        Send Mail using SMTP
+        Send Mail using Pooled SMTP Connection
         """
         try:
-            server = self.set_smtp_server_configurations()
-            message_object = self.configure_email_data(subject=subject, body=body, to=to, message_id=message_id)
-            mail_status = server.sendmail(self.username, to, message_object.as_string())
+            message_object = self.configure_email_data(subject=subject, body=body, to=to, message_id=message_id,
+                                                       new_message_id=new_message_id)
+            try:
+                with smtp_connection_pool.connection(smtp_services=self) as server:
+                    return server.sendmail(self.username, to, message_object.as_string())
+            except smtplib.SMTPServerDisconnected:
+                # Pooled Connection was Closed by the Provider, Retry once on a Fresh Connection
+                with smtp_connection_pool.connection(smtp_services=self) as server:
+                    return server.sendmail(self.username, to, message_object.as_string())
+        except Exception as e:
+            print(e)
+            pass
 
-            server.quit()
-            return mail_status
+    def __send_pipelined(self, server: smtplib.SMTP, to: str, message_object: EmailMessage) -> dict:
+        """
+        Send MAIL FROM and RCPT TO in one round trip (RFC 2920) and then the Message Data
+        Returns Refused Recipients like smtplib's sendmail
+        """
+        server.putcmd("mail", f"FROM:{smtplib.quoteaddr(self.username)}")
+        server.putcmd("rcpt", f"TO:{smtplib.quoteaddr(to)}")
+        mail_code, mail_response = server.getreply()
+        rcpt_code, rcpt_response = server.getreply()
+        if mail_code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_response, self.username)
+        if rcpt_code not in (250, 251):
+            server.rset()
+            return {to: (rcpt_code, rcpt_response)}
+        data_code, data_response = server.data(message_object.as_bytes(policy=SMTP))
+        if data_code != 250:
+            server.rset()
+            raise smtplib.SMTPDataError(data_code, data_response)
+        return {}
+
+    def send_many(self, messages: list) -> list:
+        """
+        Send Multiple Mails over one Pooled SMTP Connection, Pipelined when the Server Advertises PIPELINING
+        Each message is a dict of to, subject, body, message_id and new_message_id
+        Returns Status of each message as a dict of to, sent, refused_recipients and error
+        """
+        mail_statuses = [{'to': message.get('to'), 'sent': False, 'refused_recipients': {}, 'error': None} for
+                         message in messages]
+        next_message_index = 0
+        for attempt in range(2):
+            try:
+                with smtp_connection_pool.connection(smtp_services=self) as server:
+                    pipelining = server.has_extn('pipelining')
+                    while next_message_index < len(messages):
+                        message = messages[next_message_index]
+                        mail_status = mail_statuses[next_message_index]
+                        message_object = self.configure_email_data(subject=message.get('subject'),
+                                                                   body=message.get('body'), to=message.get('to'),
+                                                                   message_id=message.get('message_id'),
+                                                                   new_message_id=message.get('new_message_id'))
+                        try:
+                            if pipelining:
+                                refused_recipients = self.__send_pipelined(server=server, to=message.get('to'),
+                                                                           message_object=message_object)
+                            else:
+                                refused_recipients = server.sendmail(self.username, message.get('to'),
+                                                                     message_object.as_string())
+                            mail_status['refused_recipients'] = refused_recipients
+                            mail_status['sent'] = not refused_recipients
+                        except smtplib.SMTPRecipientsRefused as e:
+                            mail_status['refused_recipients'] = e.recipients
+                        except (smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                            mail_status['error'] = str(e)
+                        next_message_index += 1
+                break
+            except smtplib.SMTPServerDisconnected as e:
+                # Connection was Closed by the Provider, Resume Remaining Messages once on a Fresh Connection
+                if attempt:
+                    for mail_status in mail_statuses[next_message_index:]:
+                        mail_status['error'] = str(e)
+            except Exception as e:
+                print(e)
+                for mail_status in mail_statuses[next_message_index:]:
+                    mail_status['error'] = str(e)
+                break
+        return mail_statuses
+
+
+class AsyncSMTPServices:
+    """
+    asyncio Counterpart of SMTPServices with the same method surface
+    """
+
+    def __init__(self, email_provider: str, username: str, app_password: str, hostname: str = None,
+                 port: int = 587, start_tls: bool = True):
+        self.smtp_services = SMTPServices(email_provider=email_provider, username=username, app_password=app_password)
+        self.host = hostname or self.smtp_services.host
+        self.port = port
+        self.start_tls = start_tls
+        self.username = username
+        self.password = app_password
+
+    async def set_smtp_server_configurations(self) -> aiosmtplib.SMTP:
+        """
+        Get Connection to SMTP server
+        """
+        server = aiosmtplib.SMTP(hostname=self.host, port=self.port, start_tls=self.start_tls)
+        await server.connect()
+        await server.login(self.username, self.password)
+        return server
+
+    def configure_email_data(self, subject: str, body: str, to: str, message_id: str = None,
+                             new_message_id: str = None) -> EmailMessage:
+        """
+        Setup Email Parameters to Message Object
+        """
+        return self.smtp_services.configure_email_data(subject=subject, body=body, to=to, message_id=message_id,
+                                                       new_message_id=new_message_id)
+
+    async def send_mail(self, to: str, subject: str, body: str, message_id: str = None,
+                        new_message_id: str = None) -> dict:
+        """
+        Send Mail using SMTP
+        """
+        try:
+            return (await self.send_many(messages=[{'to': to, 'subject': subject, 'body': body,
+                                                    'message_id': message_id, 'new_message_id': new_message_id}]))[
+                0].get('refused_recipients')
         except Exception as e:
             print(e)
             pass
+
+    async def send_many(self, messages: list) -> list:
+        """
+        Send Multiple Mails over one SMTP Connection
+        Returns Status of each message as a dict of to, sent, refused_recipients and error
+        """
+        mail_statuses = [{'to': message.get('to'), 'sent': False, 'refused_recipients': {}, 'error': None} for
+                         message in messages]
+        try:
+            server = await self.set_smtp_server_configurations()
+        except Exception as e:
+            for mail_status in mail_statuses:
+                mail_status['error'] = str(e)
+            return mail_statuses
+
+        try:
+            for message, mail_status in zip(messages, mail_statuses):
+                message_object = self.configure_email_data(subject=message.get('subject'), body=message.get('body'),
+                                                           to=message.get('to'), message_id=message.get('message_id'),
+                                                           new_message_id=message.get('new_message_id'))
+                try:
+                    refused_recipients, _ = await server.sendmail(self.username, message.get('to'),
+                                                                  message_object.as_string())
+                    mail_status['refused_recipients'] = {recipient: (response.code, response.message) for
+                                                         recipient, response in refused_recipients.items()}
+                    mail_status['sent'] = not refused_recipients
+                except aiosmtplib.SMTPRecipientsRefused as e:
+                    mail_status['refused_recipients'] = {error.recipient: (error.code, error.message) for error in
+                                                         e.recipients}
+                except (aiosmtplib.SMTPSenderRefused, aiosmtplib.SMTPDataError) as e:
+                    mail_status['error'] = str(e)
+        except aiosmtplib.SMTPException as e:
+            for mail_status in mail_statuses:
+                if not (mail_status['sent'] or mail_status['refused_recipients'] or mail_status['error']):
+                    mail_status['error'] = str(e)
+        finally:
+            try:
+                await server.quit()
+            except aiosmtplib.SMTPException:
+                server.close()
+        return mail_statuses
+
+
+class AsyncSMTPSendWorker:
+    """
+    Keeps SMTP Conversations of many Senders in flight Concurrently from one Event Loop
+    """
+
+    def __init__(self, max_concurrency: int = 1000, hostname: str = None, port: int = 587, start_tls: bool = True):
+        self.max_concurrency = max_concurrency
+        self.hostname = hostname
+        self.port = port
+        self.start_tls = start_tls
+
+    async def send(self, sends: list) -> list:
+        """
+        Send Mails where each send is a dict of email_provider, username, app_password and message fields
+        Mails of the same sender share one SMTP conversation
+        Returns Status of each send in the order of sends
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        def sender_key(indexed_send):
+            return indexed_send[1].get('email_provider'), indexed_send[1].get('username')
+
+        async def send_sender_mails(sender_sends: list) -> list:
+            _, first_send = sender_sends[0]
+            async with semaphore:
+                mail_statuses = await AsyncSMTPServices(email_provider=first_send.get('email_provider'),
+                                                        username=first_send.get('username'),
+                                                        app_password=first_send.get('app_password'),
+                                                        hostname=self.hostname, port=self.port,
+                                                        start_tls=self.start_tls).send_many(
+                    messages=[mail_send for _, mail_send in sender_sends])
+            return [(index, mail_status) for (index, _), mail_status in zip(sender_sends, mail_statuses)]
+
+        sorted_sends = sorted(enumerate(sends), key=sender_key)
+        sender_results = await asyncio.gather(
+            *[send_sender_mails(list(sender_sends)) for _, sender_sends in groupby(sorted_sends, key=sender_key)])
+        mail_statuses = [None] * len(sends)
+        for sender_result in sender_results:
+            for index, mail_status in sender_result:
+                mail_statuses[index] = mail_status
+        return mail_statuses
+
+    def run(self, sends: list) -> list:
+        """
+        Run the Send Worker in a New Event Loop
+        """
+        return asyncio.run(self.send(sends=sends))
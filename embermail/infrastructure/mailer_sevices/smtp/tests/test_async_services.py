@@ -0,0 +1,68 @@
+import asyncio
+
+from embermail.infrastructure.mailer_sevices.smtp.services import AsyncSMTPServices, AsyncSMTPSendWorker
+from embermail.infrastructure.mailer_sevices.stub.services import StubMailStore, StubSMTPServer
+
+
+def run_with_stub_smtp_server(mail_store: StubMailStore, send):
+    async def run():
+        smtp_server = StubSMTPServer(mail_store=mail_store)
+        await smtp_server.start()
+        try:
+            return await send(smtp_server)
+        finally:
+            await smtp_server.stop()
+
+    return asyncio.run(run())
+
+
+def test_send_many_sends_every_message_over_one_conversation():
+    mail_store = StubMailStore()
+    messages = [{'to': f"receiver{number}@outlook.com", 'subject': f"Subject {number}", 'body': "<p>Body</p>",
+                 'message_id': "<parent@gmail.com>" if number else None,
+                 'new_message_id': f"<mail{number}@gmail.com>"} for number in range(3)]
+
+    mail_statuses = run_with_stub_smtp_server(mail_store, lambda smtp_server: AsyncSMTPServices(
+        email_provider="gmail", username="sender@gmail.com", app_password="secret", hostname=smtp_server.host,
+        port=smtp_server.port, start_tls=False).send_many(messages=messages))
+
+    assert [mail_status['sent'] for mail_status in mail_statuses] == [True, True, True]
+    assert [message['owner'] for message in mail_store.messages] == [message['to'] for message in messages]
+    assert mail_store.messages[1]['headers']['Message-ID'] == "<mail1@gmail.com>"
+    assert mail_store.messages[1]['headers']['In-Reply-To'] == "<parent@gmail.com>"
+    assert mail_store.messages[0]['headers']['In-Reply-To'] is None
+
+
+def test_send_many_reports_every_message_unsent_when_connection_fails():
+    mail_store = StubMailStore()
+
+    async def send(smtp_server):
+        await smtp_server.stop()
+        return await AsyncSMTPServices(email_provider="gmail", username="sender@gmail.com", app_password="secret",
+                                       hostname=smtp_server.host, port=smtp_server.port, start_tls=False).send_many(
+            messages=[{'to': "receiver@outlook.com", 'subject': "Subject", 'body': "Body"}] * 2)
+
+    async def run():
+        smtp_server = StubSMTPServer(mail_store=mail_store)
+        await smtp_server.start()
+        return await send(smtp_server)
+
+    mail_statuses = asyncio.run(run())
+
+    assert [mail_status['sent'] for mail_status in mail_statuses] == [False, False]
+    assert all(mail_status['error'] for mail_status in mail_statuses)
+    assert not mail_store.messages
+
+
+def test_send_worker_returns_statuses_in_order_of_sends():
+    mail_store = StubMailStore()
+    sends = [{'email_provider': "gmail", 'username': f"sender{number % 2}@gmail.com", 'app_password': "secret",
+              'to': f"receiver{number}@outlook.com", 'subject': "Subject", 'body': "Body"} for number in range(5)]
+
+    mail_statuses = run_with_stub_smtp_server(mail_store, lambda smtp_server: AsyncSMTPSendWorker(
+        max_concurrency=2, hostname=smtp_server.host, port=smtp_server.port, start_tls=False).send(sends=sends))
+
+    assert [mail_status['to'] for mail_status in mail_statuses] == [send['to'] for send in sends]
+    assert all(mail_status['sent'] for mail_status in mail_statuses)
+    assert sorted((message['owner'], message['headers']['From']) for message in mail_store.messages) == sorted(
+        (send['to'], f"{send['username'].split('@')[0]} <{send['username']}>") for send in sends)
@@ -0,0 +1,361 @@
+"""This file includes local stub SMTP and IMAP servers used for exercising the mail transports without a provider"""
+
+import base64
+import asyncio
+import datetime
+from email import message_from_bytes
+from email.utils import parseaddr, make_msgid
+
+from embermail.infrastructure.mailer_sevices.imap.services import tokenize_imap_list
+
+
+class StubMailStore:
+    """
+    In-memory Mailboxes shared by the Stub SMTP and IMAP Servers
+    """
+
+    uid_validity = 1
+
+    def __init__(self):
+        self.next_uid = 1
+        self.messages = list()
+        self.spam_senders = set()
+
+    def deliver(self, sender: str, recipient: str, raw_message: bytes) -> dict:
+        """
+        Store a Message in the Recipient's Inbox, or Spam folder if the Sender is Marked as Spam
+        """
+        is_spam = sender.lower() in self.spam_senders
+        # Providers stamp a Message-ID on Mails submitted without one
+        if message_from_bytes(raw_message).get('Message-ID') is None:
+            raw_message = f"Message-ID: {make_msgid(domain='stub.local')}\r\n".encode('utf-8') + raw_message
+        message = {
+            'uid': self.next_uid,
+            'owner': recipient.lower(),
+            'folder': 'SPAM' if is_spam else 'INBOX',
+            'raw': raw_message,
+            'headers': message_from_bytes(raw_message),
+            'flags': set(),
+            'labels': ['\\Spam'] if is_spam else ['\\Inbox'],
+            'internal_date': datetime.date.today(),
+        }
+        self.next_uid += 1
+        self.messages.append(message)
+        return message
+
+    def list_messages(self, username: str, mailbox: str) -> list:
+        """
+        List Messages of a Mailbox, Gmail and Outlook folder names are mapped to Inbox, All Mail and Spam
+        """
+        mailbox = mailbox.strip('"').upper()
+        owned_messages = [message for message in self.messages if message['owner'] == username.lower()]
+        if mailbox in ('[GMAIL]/SPAM', 'JUNK', 'SPAM'):
+            return [message for message in owned_messages if message['folder'] == 'SPAM']
+        if mailbox == '[GMAIL]/ALL MAIL':
+            return [message for message in owned_messages if message['folder'] != 'SPAM']
+        return [message for message in owned_messages if message['folder'] == mailbox]
+
+
+class StubSMTPServer:
+    """
+    Minimal asyncio SMTP Server accepting any credentials and advertising PIPELINING, without STARTTLS
+    """
+
+    def __init__(self, mail_store: StubMailStore, host: str = "127.0.0.1", port: int = 0):
+        self.mail_store = mail_store
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sender = None
+        recipients = list()
+
+        def reply(response: str) -> None:
+            writer.write(f"{response}\r\n".encode('utf-8'))
+
+        reply("220 stub.local ESMTP ready")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode('utf-8', errors='replace').strip()
+            verb, _, argument = command.partition(" ")
+            verb = verb.upper()
+            if verb in ("EHLO", "HELO"):
+                reply("250-stub.local\r\n250-PIPELINING\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                mechanism, _, initial_response = argument.partition(" ")
+                if mechanism.upper() == "LOGIN":
+                    for prompt in ("Username:", "Password:"):
+                        reply(f"334 {base64.b64encode(prompt.encode()).decode()}")
+                        await writer.drain()
+                        await reader.readline()
+                elif not initial_response:
+                    reply("334 ")
+                    await writer.drain()
+                    await reader.readline()
+                reply("235 Authentication successful")
+            elif verb == "MAIL":
+                sender = parseaddr(argument.split(":", 1)[-1])[1]
+                recipients = list()
+                reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(parseaddr(argument.split(":", 1)[-1])[1])
+                reply("250 OK")
+            elif verb == "DATA":
+                if not (sender and recipients):
+                    reply("503 Bad sequence of commands")
+                    continue
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                await writer.drain()
+                data_lines = list()
+                while True:
+                    data_line = await reader.readline()
+                    if data_line in (b".\r\n", b".\n", b""):
+                        break
+                    data_lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                for recipient in recipients:
+                    self.mail_store.deliver(sender=sender, recipient=recipient, raw_message=b"".join(data_lines))
+                sender, recipients = None, list()
+                reply("250 OK: queued")
+            elif verb == "RSET":
+                sender, recipients = None, list()
+                reply("250 OK")
+            elif verb == "NOOP":
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Command not implemented")
+            await writer.drain()
+        writer.close()
+
+
+class StubIMAPServer:
+    """
+    Minimal asyncio IMAP4rev1 Server over Stub Mailboxes supporting SELECT, SEARCH, FETCH and STORE
+    including their UID variants and Gmail's X-GM-LABELS
+    """
+
+    def __init__(self, mail_store: StubMailStore, host: str = "127.0.0.1", port: int = 0):
+        self.mail_store = mail_store
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @staticmethod
+    def __parse_sequence_set(sequence_set: str, maximum: int) -> set:
+        numbers = set()
+        for part in sequence_set.split(","):
+            start, _, end = part.partition(":")
+            start = maximum if start == "*" else int(start)
+            end = start if not end else (maximum if end == "*" else int(end))
+            numbers.update(range(min(start, end), max(start, end) + 1))
+        return numbers
+
+    def __matches(self, message: dict, criteria: list, sequence_number: int, maximum_uid: int,
+                  maximum_sequence: int) -> bool:
+        index = 0
+        while index < len(criteria):
+            criterion = criteria[index]
+            if isinstance(criterion, list):
+                if not self.__matches(message, criterion, sequence_number, maximum_uid, maximum_sequence):
+                    return False
+                index += 1
+                continue
+            key = criterion.upper()
+            if key == "ALL":
+                index += 1
+            elif key in ("FROM", "TO", "SUBJECT"):
+                if criteria[index + 1].lower() not in str(message['headers'].get(key, "")).lower():
+                    return False
+                index += 2
+            elif key == "HEADER":
+                if criteria[index + 2].lower() not in str(message['headers'].get(criteria[index + 1], "")).lower():
+                    return False
+                index += 3
+            elif key in ("SINCE", "BEFORE", "ON"):
+                date = datetime.datetime.strptime(criteria[index + 1], "%d-%b-%Y").date()
+                internal_date = message['internal_date']
+                if (key == "SINCE" and internal_date < date) or (key == "BEFORE" and internal_date >= date) or (
+                        key == "ON" and internal_date != date):
+                    return False
+                index += 2
+            elif key == "UID":
+                if message['uid'] not in self.__parse_sequence_set(criteria[index + 1], maximum_uid):
+                    return False
+                index += 2
+            elif key in ("SEEN", "UNSEEN"):
+                if (key == "SEEN") != ("\\Seen" in message['flags']):
+                    return False
+                index += 1
+            elif key == "NOT":
+                if self.__matches(message, [criteria[index + 1]], sequence_number, maximum_uid, maximum_sequence):
+                    return False
+                index += 2
+            elif key == "OR":
+                if not (self.__matches(message, [criteria[index + 1]], sequence_number, maximum_uid,
+                                       maximum_sequence) or self.__matches(message, [criteria[index + 2]],
+                                                                           sequence_number, maximum_uid,
+                                                                           maximum_sequence)):
+                    return False
+                index += 3
+            else:
+                if sequence_number not in self.__parse_sequence_set(criterion, maximum_sequence):
+                    return False
+                index += 1
+        return True
+
+    @staticmethod
+    def __fetch_section(message: dict, section: str) -> bytes:
+        raw_message = message['raw']
+        header_end = raw_message.find(b"\r\n\r\n")
+        header_end = len(raw_message) if header_end == -1 else header_end + 4
+        if not section:
+            return raw_message
+        if section.upper() == "HEADER":
+            return raw_message[:header_end]
+        if section.upper().startswith("HEADER.FIELDS"):
+            field_names = [name.lower() for name in tokenize_imap_list(section[len("HEADER.FIELDS"):])[0]]
+            headers = b"".join(f"{name}: {value}\r\n".encode('utf-8') for name, value in message['headers'].items()
+                               if name.lower() in field_names)
+            return headers + b"\r\n"
+        return raw_message[header_end:]
+
+    def __fetch_message(self, message: dict, sequence_number: int, items: list, include_uid: bool) -> bytes:
+        item_names = [item.upper() for item in items]
+        if include_uid and "UID" not in item_names:
+            items = ["UID"] + items
+        parts = list()
+        for item in items:
+            item_name = item.upper()
+            if item_name == "UID":
+                parts.append(f"UID {message['uid']}".encode('utf-8'))
+            elif item_name == "FLAGS":
+                parts.append(f"FLAGS ({' '.join(sorted(message['flags']))})".encode('utf-8'))
+            elif item_name == "X-GM-LABELS":
+                labels = " ".join(label if label.startswith("\\") else f'"{label}"' for label in message['labels'])
+                parts.append(f"X-GM-LABELS ({labels})".encode('utf-8'))
+            elif item_name in ("RFC822", "RFC822.HEADER") or item_name.startswith("BODY"):
+                section = item[item.find("[") + 1:item.rfind("]")] if "[" in item else ""
+                if item_name == "RFC822.HEADER":
+                    section = "HEADER"
+                data = self.__fetch_section(message, section)
+                if not (item_name.startswith("BODY.PEEK") or item_name == "RFC822.HEADER"):
+                    message['flags'].add("\\Seen")
+                response_name = item_name if item_name.startswith("RFC822") else f"BODY[{section}]"
+                parts.append(f"{response_name} {{{len(data)}}}\r\n".encode('utf-8') + data)
+        return f"* {sequence_number} FETCH (".encode('utf-8') + b" ".join(parts) + b")\r\n"
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        username = None
+        mailbox = None
+
+        def reply(response: str) -> None:
+            writer.write(f"{response}\r\n".encode('utf-8'))
+
+        reply("* OK [CAPABILITY IMAP4rev1] Stub IMAP ready")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command_line = line.decode('utf-8', errors='replace').rstrip("\r\n")
+            # Read Synchronizing Literals ({n}) into the Command Line
+            while command_line.endswith("}") and "{" in command_line:
+                literal_size = int(command_line[command_line.rfind("{") + 1:-1])
+                reply("+ Ready for literal")
+                await writer.drain()
+                literal = await reader.readexactly(literal_size)
+                rest = (await reader.readline()).decode('utf-8', errors='replace').rstrip("\r\n")
+                escaped_literal = literal.decode('utf-8', errors='replace').replace("\\", "\\\\").replace('"', '\\"')
+                command_line = command_line[:command_line.rfind("{")] + f'"{escaped_literal}"' + rest
+            tokens = tokenize_imap_list(command_line)
+            if len(tokens) < 2:
+                reply("* BAD Invalid command")
+                await writer.drain()
+                continue
+            tag, command, arguments = tokens[0], tokens[1].upper(), tokens[2:]
+            is_uid_command = command == "UID"
+            if is_uid_command:
+                command, arguments = arguments[0].upper(), arguments[1:]
+
+            if command == "CAPABILITY":
+                reply("* CAPABILITY IMAP4rev1 IDLE UIDPLUS X-GM-EXT-1")
+                reply(f"{tag} OK CAPABILITY completed")
+            elif command == "LOGIN":
+                username = arguments[0]
+                reply(f"{tag} OK LOGIN completed")
+            elif command in ("SELECT", "EXAMINE"):
+                mailbox = arguments[0]
+                messages = self.mail_store.list_messages(username=username, mailbox=mailbox)
+                reply(f"* {len(messages)} EXISTS")
+                reply("* 0 RECENT")
+                reply(f"* OK [UIDVALIDITY {self.mail_store.uid_validity}] UIDs valid")
+                reply(f"* OK [UIDNEXT {self.mail_store.next_uid}] Predicted next UID")
+                reply("* FLAGS (\\Answered \\Flagged \\Deleted \\Seen \\Draft)")
+                reply(f"{tag} OK [READ-WRITE] {command} completed")
+            elif command in ("SEARCH", "FETCH", "STORE") and mailbox is None:
+                reply(f"{tag} BAD No mailbox selected")
+            elif command == "SEARCH":
+                if arguments and str(arguments[0]).upper() == "CHARSET":
+                    arguments = arguments[2:]
+                messages = self.mail_store.list_messages(username=username, mailbox=mailbox)
+                maximum_uid = max([message['uid'] for message in messages], default=0)
+                matched = [message['uid'] if is_uid_command else sequence_number for sequence_number, message in
+                           enumerate(messages, start=1) if
+                           self.__matches(message, arguments, sequence_number, maximum_uid, len(messages))]
+                reply(" ".join(["* SEARCH"] + [str(number) for number in matched]))
+                reply(f"{tag} OK SEARCH completed")
+            elif command in ("FETCH", "STORE"):
+                messages = self.mail_store.list_messages(username=username, mailbox=mailbox)
+                maximum = max([message['uid'] for message in messages], default=0) if is_uid_command else len(
+                    messages)
+                requested = self.__parse_sequence_set(arguments[0], maximum) if messages else set()
+                for sequence_number, message in enumerate(messages, start=1):
+                    if (message['uid'] if is_uid_command else sequence_number) not in requested:
+                        continue
+                    if command == "FETCH":
+                        items = arguments[1] if isinstance(arguments[1], list) else [arguments[1]]
+                        writer.write(self.__fetch_message(message, sequence_number, items, is_uid_command))
+                    else:
+                        flags = arguments[2] if isinstance(arguments[2], list) else [arguments[2]]
+                        operation = arguments[1].upper()
+                        if operation.startswith("+"):
+                            message['flags'].update(flags)
+                        elif operation.startswith("-"):
+                            message['flags'].difference_update(flags)
+                        else:
+                            message['flags'] = set(flags)
+                        if ".SILENT" not in operation:
+                            writer.write(self.__fetch_message(message, sequence_number, ["FLAGS"], is_uid_command))
+                reply(f"{tag} OK {command} completed")
+            elif command == "NOOP":
+                reply(f"{tag} OK NOOP completed")
+            elif command == "LOGOUT":
+                reply("* BYE Logging out")
+                reply(f"{tag} OK LOGOUT completed")
+                await writer.drain()
+                break
+            else:
+                reply(f"{tag} BAD Command not implemented")
+            await writer.drain()
+        writer.close()
@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class InterfaceCampaignsConfig(AppConfig):
+    name = "embermail.interface.campaigns"
+    label = "interface_campaigns"
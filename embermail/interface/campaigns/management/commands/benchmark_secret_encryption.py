@@ -0,0 +1,39 @@
+import time
+
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.data_manipulation.encryption import SecretEncryption, derive_fernet_key
+
+
+class Command(BaseCommand):
+    help = "Compare per-call cost of App Password Decryption with and without the cached Fernet Key."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10000,
+                            help="Number of decryptions measured with the cached key.")
+        parser.add_argument("--uncached-iterations", type=int, default=3,
+                            help="Number of decryptions measured with a freshly derived key per call.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        uncached_iterations = options["uncached_iterations"]
+        encrypted_app_password = SecretEncryption().encrypt_secret_string(string="benchmark-app-password")
+
+        # Before: PBKDF2 Key Derivation runs on every SecretEncryption instantiation
+        start_time = time.perf_counter()
+        for _ in range(uncached_iterations):
+            key = derive_fernet_key.__wrapped__(passcode=getattr(settings, "PASSCODE", None))
+            Fernet(key).decrypt(encrypted_app_password)
+        uncached_per_call = (time.perf_counter() - start_time) / uncached_iterations
+
+        # After: Derived Key is Cached for the Process
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            SecretEncryption().decrypt_secret_string(encrypted_string=encrypted_app_password)
+        cached_per_call = (time.perf_counter() - start_time) / iterations
+
+        self.stdout.write(f"Uncached : {uncached_per_call * 1000:.2f} ms per decryption ({uncached_iterations} calls)")
+        self.stdout.write(f"Cached   : {cached_per_call * 1000000:.2f} us per decryption ({iterations} calls)")
+        self.stdout.write(self.style.SUCCESS(f"Speedup  : {uncached_per_call / cached_per_call:.0f}x"))
@@ -0,0 +1,89 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from kombu.serialization import dumps, loads
+
+from embermail.interface.campaigns.tasks import send_warmup_send
+from embermail.application.campaigns.services import CampaignAppServices
+
+
+class Command(BaseCommand):
+    help = "Compare Broker Bytes per Warmup Thread of the retired Scheduler Chain Payloads and of WarmupSend IDs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=6, help="Mails in a Warmup Thread.")
+        parser.add_argument("--body-size", type=int, default=2000, help="Characters in a Thread Body.")
+        parser.add_argument("--iterations", type=int, default=200,
+                            help="Encodings and Decodings measured per Warmup Thread.")
+
+    def measure_messages(self, messages: list, iterations: int) -> tuple:
+        """
+        Returns Broker Bytes of the Task Messages and Seconds to Encode and Decode them once
+        """
+        app = send_warmup_send.app
+        encoded_bytes = 0
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            encoded_bytes = 0
+            for task_name, args, kwargs in messages:
+                task_message = app.amqp.as_task_v2(str(uuid.uuid4()), task_name, args=args, kwargs=kwargs)
+                for payload in (task_message.headers, task_message.body):
+                    content_type, content_encoding, data = dumps(payload, serializer="json")
+                    loads(data, content_type, content_encoding)
+                    encoded_bytes += len(data)
+        return encoded_bytes, (time.perf_counter() - start_time) / iterations
+
+    def build_scheduler_chain_messages(self, threads: int, body_size: int) -> list:
+        """
+        Messages of one Warmup Thread as Sent by the retired send_email_task_schedular Chain, every Hop carried
+        every Body, Sender Data with the Decrypted App Password and the Mail it Sent twice more
+        """
+        campaign_app_services = CampaignAppServices()
+        thread_list = ["x" * body_size for _ in range(threads)]
+        sender_data_dict = {"email": "warmup.email@gmail.com", "email_service_provider": "gmail",
+                            "app_password": "abcdabcdabcdabcd", "mails_to_be_sent": 20}
+        receiver_app_password = campaign_app_services.encrypt_app_password(app_password="abcdabcdabcdabcd")
+        message_id = f"<{uuid.uuid4().hex}@gmail.com>"
+        messages = list()
+        for thread_to_send in range(threads):
+            messages.append(("embermail.interface.campaigns.tasks.send_email_task_schedular", (
+                900, "sender" if thread_to_send % 2 == 0 else "receiver", sender_data_dict, thread_list,
+                thread_to_send, "Warmup Template Subject", 1200, "domain.email@outlook.com", receiver_app_password,
+                "outlook", message_id, 20, uuid.uuid4().hex, "Warmup"), {}))
+            mail_data = {"email_provider": "gmail", "username": "warmup.email@gmail.com",
+                         "app_password": "abcdabcdabcdabcd", "subject": "Warmup Template Subject",
+                         "to": "domain.email@outlook.com"}
+            messages.append(("embermail.interface.campaigns.tasks.send_mail_and_creates_attribute_logs", (), {
+                **mail_data, "updated_body": thread_list[thread_to_send],
+                "sender_data": {"name": "Warmup", "email": "warmup.email@gmail.com", "email_provider": "gmail",
+                                "send_max_emails_per_day": 20, "total_number_of_sent_mails": 1},
+                "receiver_data": {"name": "domain.email", "email": "domain.email@outlook.com",
+                                  "email_provider": "outlook"},
+                "thread_to_send": thread_to_send, "log_message": "Mail Sent Successfully from Warmup Email to User.",
+                "message_id_for_mail": message_id, "new_message_id": message_id}))
+            messages.append(("embermail.interface.campaigns.tasks.send_email_async", (), {
+                **mail_data, "body": thread_list[thread_to_send], "message_id": message_id,
+                "new_message_id": message_id}))
+        return messages
+
+    def build_warmup_send_messages(self, threads: int) -> list:
+        """
+        Messages of one Warmup Thread as Dispatched now, one WarmupSend ID per Mail
+        """
+        return [(send_warmup_send.name, (), {"warmup_send_id": str(uuid.uuid4())}) for _ in range(threads)]
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        iterations = options["iterations"]
+        before_bytes, before_seconds = self.measure_messages(
+            messages=self.build_scheduler_chain_messages(threads=threads, body_size=options["body_size"]),
+            iterations=iterations)
+        after_bytes, after_seconds = self.measure_messages(
+            messages=self.build_warmup_send_messages(threads=threads), iterations=iterations)
+
+        self.stdout.write(f"Scheduler Chain : {before_bytes} bytes per Warmup Thread, "
+                          f"{before_seconds * 1000000:.0f} us to Encode and Decode")
+        self.stdout.write(f"WarmupSend IDs  : {after_bytes} bytes per Warmup Thread, "
+                          f"{after_seconds * 1000000:.0f} us to Encode and Decode")
+        self.stdout.write(self.style.SUCCESS(f"Reduction       : {before_bytes / after_bytes:.0f}x fewer Broker Bytes"))
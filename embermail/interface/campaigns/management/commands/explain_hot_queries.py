@@ -0,0 +1,80 @@
+import re
+import uuid
+import datetime
+
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+
+from embermail.application.campaigns.services import CampaignAppServices
+from embermail.application.payments.services import PaymentAppServices
+from embermail.application.templates.services import TemplateAppServices
+
+# Full Table Scans in EXPLAIN Output of PostgreSQL ("Seq Scan on campaign") and SQLite ("SCAN campaign")
+SEQUENTIAL_SCAN_PATTERNS = (
+    re.compile(r"Seq Scan on (\w+)"),
+    re.compile(r"\bSCAN (?:TABLE )?(\w+)\s*$", re.MULTILINE),
+)
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on every hot Campaign, Report, Template, Thread and Payment Query and fail on a " \
+           "Sequential Scan of a large Table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-rows", type=int, default=10000,
+                            help="Sequential Scans of Tables with fewer Rows are allowed.")
+
+    def get_hot_queries(self) -> dict:
+        campaign_app_services = CampaignAppServices()
+        template_app_services = TemplateAppServices()
+        sample_uuid = uuid.uuid4()
+        sample_email = "explain@example.com"
+        today = datetime.date.today()
+        return {
+            "campaigns to warmup": campaign_app_services.list_campaigns_to_warmup(),
+            "campaigns by master user": campaign_app_services.list_campaigns_by_master_user_id(
+                master_user_id=sample_uuid),
+            "campaigns by user": campaign_app_services.list_campaigns_by_user_id(user_id=sample_uuid),
+            "campaign reports by date": campaign_app_services.list_campaign_reports().filter(report_date=today),
+            "campaign report by email and date": campaign_app_services.list_campaign_reports().filter(
+                email=sample_email, report_date=today),
+            "templates by warmup email": template_app_services.list_templates().filter(warmup_email=sample_email),
+            "general templates": template_app_services.list_templates().filter(is_general=True),
+            "threads by template": template_app_services.list_threads_by_template_id(
+                template_id=sample_uuid).order_by('thread_ordering_number'),
+            "active domain lists": campaign_app_services.list_domain_lists_by_is_active(),
+            "latest payment by warmup email": PaymentAppServices().list_payments().filter(
+                warmup_email=sample_email).order_by('-created_at')[:1],
+        }
+
+    def count_table_rows(self, table_name: str) -> int:
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Planner Estimate, Counting Rows of a large Table is a Sequential Scan itself
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table_name])
+            else:
+                cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table_name)}")
+            row = cursor.fetchone()
+        return max(int(row[0]), 0) if row else 0
+
+    def handle(self, *args, **options):
+        min_rows = options["min_rows"]
+        failed_queries = list()
+        for query_name, queryset in self.get_hot_queries().items():
+            plan = queryset.explain()
+            scanned_tables = {table_name for pattern in SEQUENTIAL_SCAN_PATTERNS for table_name in
+                              pattern.findall(plan)}
+            large_scanned_tables = [table_name for table_name in sorted(scanned_tables)
+                                    if self.count_table_rows(table_name=table_name) >= min_rows]
+            if options["verbosity"] > 1:
+                self.stdout.write(plan)
+            if large_scanned_tables:
+                failed_queries.append(query_name)
+                self.stdout.write(self.style.ERROR(
+                    f"{query_name} : Sequential Scan on {', '.join(large_scanned_tables)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{query_name} : OK"))
+
+        if failed_queries:
+            raise CommandError(f"Sequential Scans on large Tables in {len(failed_queries)} hot Queries: "
+                               f"{', '.join(failed_queries)}")
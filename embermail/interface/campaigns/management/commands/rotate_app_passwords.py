@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from embermail.application.campaigns.services import CampaignAppServices
+
+
+class Command(BaseCommand):
+    help = "Re-encrypt App Passwords of Campaigns and Domain Lists with the current PASSCODE."
+
+    def handle(self, *args, **options):
+        total_rotated_app_passwords = CampaignAppServices().rotate_app_passwords()
+        self.stdout.write(self.style.SUCCESS(f"{total_rotated_app_passwords} App Passwords Rotated."))
@@ -0,0 +1,37 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from embermail.infrastructure.mailer_sevices.stub.services import StubMailStore, StubSMTPServer, StubIMAPServer
+
+
+class Command(BaseCommand):
+    help = "Run local Stub SMTP and IMAP Servers for exercising the asyncio Mail Transports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--smtp-port", type=int, default=2525)
+        parser.add_argument("--imap-port", type=int, default=1143)
+        parser.add_argument("--spam-sender", action="append", default=[],
+                            help="Deliver Mails of this Sender to the Spam folder, may be repeated.")
+
+    async def serve(self, options: dict) -> None:
+        mail_store = StubMailStore()
+        mail_store.spam_senders.update(sender.lower() for sender in options["spam_sender"])
+        smtp_server = StubSMTPServer(mail_store=mail_store, host=options["host"], port=options["smtp_port"])
+        imap_server = StubIMAPServer(mail_store=mail_store, host=options["host"], port=options["imap_port"])
+        await smtp_server.start()
+        await imap_server.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"Stub SMTP on {options['host']}:{smtp_server.port}, Stub IMAP on {options['host']}:{imap_server.port}"))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await smtp_server.stop()
+            await imap_server.stop()
+
+    def handle(self, *args, **options):
+        try:
+            asyncio.run(self.serve(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Stub Mail Servers Stopped.")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from embermail.application.templates.services import TemplateAppServices
+
+
+class Command(BaseCommand):
+    help = "Backfill thread_count of Templates from their Threads, or only Verify them with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true",
+                            help="Report Templates with a wrong thread_count and fail instead of Correcting them.")
+
+    def handle(self, *args, **options):
+        template_app_services = TemplateAppServices()
+        if options["verify"]:
+            thread_count_mismatches = template_app_services.list_template_thread_count_mismatches()
+        else:
+            thread_count_mismatches = template_app_services.sync_template_thread_counts()
+
+        for template_id, (thread_count, threads) in thread_count_mismatches.items():
+            self.stdout.write(f"{template_id} : thread_count {thread_count}, Threads {threads}")
+
+        if options["verify"] and thread_count_mismatches:
+            raise CommandError(f"{len(thread_count_mismatches)} Templates have a wrong thread_count.")
+        action = "Verified" if options["verify"] else f"{len(thread_count_mismatches)} Corrected"
+        self.stdout.write(self.style.SUCCESS(f"Template Thread Counts {action}."))
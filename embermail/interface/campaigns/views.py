@@ -1,7 +1,6 @@
 import datetime
 import uuid
 import json
-import random
 import logging
 
 import pandas as pd
@@ -9,20 +8,16 @@ from django.views import View
 from django.conf import settings
 from django.contrib import messages
 from django.shortcuts import render, redirect
-from django.db.models import Subquery, OuterRef
 from django.http import JsonResponse, HttpResponse
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.sites.shortcuts import get_current_site
 
 from embermail.domain.campaigns.models import Campaign
 from embermail.domain.templates.models import Template, Thread
-from embermail.domain.templates.services import ThreadServices, TemplateServices
-from utils.data_manipulation.encryption import SecretEncryption
 from embermail.infrastructure.logger.models import AttributeLogger
-from embermail.domain.text_choices import CampaignActionRequiredChoices
 from embermail.application.campaigns.services import CampaignAppServices
 from embermail.application.payments.services import PaymentAppServices, StripeAppServices
-from embermail.interface.campaigns.tasks import send_email_task_schedular, time_counter, \
+from embermail.interface.campaigns.tasks import main_algorithm, \
     create_campaign_reports_by_log_records
 from utils.django.exceptions import CampaignDataValidation, CampaignDoesNotExist, InvalidCredentialsException, \
     ValidationException, CampaignAlreadyExist, \
@@ -683,104 +678,20 @@ class SendInvitationLinkView(LoginRequiredMixin, View):
 
 class CeleryMailView(View):
     def get(self, request):
-        # Initialize Thread and Template Repo
-        thread_repo = ThreadServices().get_thread_repo()
-        template_repo = TemplateServices().get_template_repo()
-
-        # Start Time Counter
-        time_counter.delay()
-
-        # Get All Campaign Which is Going to be Warmup
-        all_campaigns = CampaignAppServices().list_campaigns().filter(is_stopped=False, app_password__isnull=False,
-                                                                      action_required=CampaignActionRequiredChoices.NONE)
-        for campaign in all_campaigns:
-            # Get Encrypted App Password and Checking App Password, Plan ID, Email Service Provider are available
-            app_password = SecretEncryption().decrypt_secret_string(encrypted_string=campaign.app_password)
-            if campaign.plan_id and app_password and campaign.email_service_provider in ['gmail', 'outlook']:
-                # Get Total mails to be sent and update it by step up
-                total_mails_to_send = campaign.mails_to_be_sent
-                if int(campaign.mails_to_be_sent) < int(campaign.max_email_per_day):
-                    total_mails_to_send = int(campaign.mails_to_be_sent) + int(
-                        campaign.email_step_up)
-                    campaign.mails_to_be_sent = total_mails_to_send
-                    campaign.save()
-
-                domain_list = CampaignAppServices().list_domain_lists().filter(is_active=True)
-                receivers_data_dict_list = [email for email in
-                                            domain_list.values('email', 'app_password', 'email_service_provider')]
-
-                thread_subquery = thread_repo.filter(template_id=OuterRef("id")).order_by("-thread_ordering_number")
-
-                templates_list = list(template_repo.filter(warmup_email=campaign.email).annotate(
-                    total_threads=Subquery(thread_subquery.values("thread_ordering_number")[:1])))
-                if not templates_list:
-                    templates_list = list(template_repo.filter(is_general=True).annotate(
-                        total_threads=Subquery(thread_subquery.values("thread_ordering_number")[:1])))
-                random_templates = random.sample(templates_list, len(templates_list))
-
-                total_threads = 0
-                max_threads_in_template = 0
-                finalized_templates = []
-
-                template_number = 0
-                while True:
-                    if total_threads < (2 * total_mails_to_send) and total_threads - (2 * total_mails_to_send) <= -2:
-                        finalized_templates.append(random_templates[template_number])
-                        template_number += 1
-                        if template_number == len(random_templates):
-                            template_number = 0
-                        if random_templates[template_number].total_threads > max_threads_in_template:
-                            max_threads_in_template = random_templates[template_number].total_threads
-                        total_threads += random_templates[template_number].total_threads
-                    else:
-                        break
-
-                if len(receivers_data_dict_list) < len(finalized_templates):
-                    finalized_templates = finalized_templates[:len(receivers_data_dict_list)]
-                finalized_receivers_dict = random.sample(receivers_data_dict_list, len(finalized_templates))
-
-                template_fixture = list()
-                for index in range(len(finalized_templates)):
-                    data_dict = dict()
-                    # Receivers
-                    data_dict["receiver_email"] = finalized_receivers_dict[index].get('email')
-                    data_dict["app_password"] = finalized_receivers_dict[index].get('app_password')
-                    data_dict["email_provider"] = finalized_receivers_dict[index].get('email_service_provider')
-                    data_dict["template_name"] = finalized_templates[index].name
-                    data_dict["template_subject"] = finalized_templates[index].subject
-
-                    threads = (
-                        thread_repo.filter(template_id=finalized_templates[index].id)
-                        .order_by("thread_ordering_number")
-                        .values_list("body", flat=True)
-                    )
-                    data_dict["thread_list"] = list(threads)
-                    data_dict["thread_count"] = len(data_dict["thread_list"])
-                    template_fixture.append(data_dict)
-
-                # Email Data
-                sender_data_dict = dict()
-                sender_data_dict['email'] = campaign.email
-                sender_data_dict['email_service_provider'] = campaign.email_service_provider
-                sender_data_dict['app_password'] = app_password
-
-                for template in template_fixture:
-                    max_time_to_complete_all_process = int(getattr(settings, "MAX_TIME_TO_COMPLETE_ALGORITHM", "72000"))
-                    time_to_be_sent_one_mail = int(max_time_to_complete_all_process / max_threads_in_template * 0.98)
-                    delay_for_sending_mail = random.randint(3, time_to_be_sent_one_mail)
-                    message_id = 0
-                    send_email_task_schedular.apply_async(
-                        (delay_for_sending_mail, "sender", sender_data_dict, template.get('thread_list'), 0,
-                         template.get('template_subject'), time_to_be_sent_one_mail, template.get('receiver_email'),
-                         template.get('app_password'), template.get('email_provider'), message_id, total_mails_to_send),
-                        countdown=delay_for_sending_mail,
-                    )
+        # Plan Warmup Sends of All Campaigns by Sharded Planner Tasks
+        main_algorithm.delay()
         return HttpResponse("All Campaign Algorithm Completed Successfully.")
 
 
 class CeleryMailDataView(View):
     def get(self, request):
-        file_date = datetime.datetime.now().strftime("%Y-%m-%d")
+        # File Paths are Built only from the Parsed Date, never from the Raw Query Value
+        try:
+            file_date = datetime.datetime.strptime(
+                request.GET.get("date") or datetime.date.today().strftime("%Y-%m-%d"), "%Y-%m-%d").strftime("%Y-%m-%d")
+        except ValueError:
+            return HttpResponse("Date must be in YYYY-MM-DD Format.", status=400)
+        # Closed Days are Read from their Compacted Files
         df = CampaignAppServices().read_record_file_to_list_of_dict(file_date=file_date)
 
         df.to_excel(f"utils/embermail_data_excels/{file_date}.xlsx",
@@ -790,6 +701,13 @@ class CeleryMailDataView(View):
 
 class CampaignReportView(View):
     def get(self, request):
+        # Invalid Dates are Rejected here instead of Failing inside the Worker
+        report_date_string = request.GET.get("date")
+        if report_date_string:
+            try:
+                report_date_string = datetime.datetime.strptime(report_date_string, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                return HttpResponse("Date must be in YYYY-MM-DD Format.", status=400)
         # CampaignAppServices().create_campaign_reports_by_log_records()
-        create_campaign_reports_by_log_records.delay()
+        create_campaign_reports_by_log_records.delay(report_date_string=report_date_string)
         return HttpResponse("Campaign Report Success")
@@ -49,6 +49,8 @@ INSTALLED_APPS = [
     "customadmin",
     # Apps.py files for Signals
     "embermail.application.users.apps.ApplicationUsersConfig",
+    # Apps.py files for Management Commands
+    "embermail.interface.campaigns.apps.InterfaceCampaignsConfig",
     # Third Party Apps
     "debug_toolbar",
     "widget_tweaks",
@@ -184,6 +186,8 @@ SYSTEM_MAIL_APP_PASSWORD = config("SYSTEM_MAIL_APP_PASSWORD")
 
 # App Password Encoding
 PASSCODE = config("PASSCODE")
+# Comma Separated Previous Passcodes, still accepted for Decryption while App Passwords are Rotated
+PREVIOUS_PASSCODES = [passcode for passcode in config("PREVIOUS_PASSCODES", "").split(",") if passcode]
 
 # Enable to Send Mails Using SMTP for Warmup
 ENABLE_SEND_MAILS_FOR_WARMUP = (
@@ -269,8 +273,8 @@ LOGGING = {
         },
         "record_file": {
             "level": "FATAL",
-            "class": "logging.FileHandler",
-            "filename": f"logs/records/{date.today()}_records.log",
+            "class": "embermail.infrastructure.logger.services.DailyFileHandler",
+            "filename_pattern": "logs/records/{date}_records.log",
             "formatter": "record_data",
         },
     },
@@ -1,21 +1,88 @@
-import os
+import time
 import base64
-from cryptography.fernet import Fernet
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Iterable, List, Union
+
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from django.conf import settings
 
+KEY_DERIVATION_SALT = b"123456789"
+KEY_DERIVATION_ITERATIONS = 390000
+
+
+@functools.lru_cache(maxsize=None)
+def derive_fernet_key(passcode: str, salt: bytes = KEY_DERIVATION_SALT) -> bytes:
+    """
+    Derive Fernet Key from Passcode and Salt using PBKDF2HMAC-SHA256
+    Derived keys are cached for the lifetime of the process, keyed by passcode and salt
+    """
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KEY_DERIVATION_ITERATIONS, )
+    return base64.urlsafe_b64encode(kdf.derive(bytes(passcode, 'utf-8')))
+
+
+@functools.lru_cache(maxsize=None)
+def get_fernet_suite(passcodes: Tuple[str, ...], salt: bytes = KEY_DERIVATION_SALT) -> MultiFernet:
+    """
+    Build MultiFernet Suite from Passcodes, the first passcode is used for encryption and
+    all passcodes are tried for decryption
+    """
+    return MultiFernet([Fernet(derive_fernet_key(passcode=passcode, salt=salt)) for passcode in passcodes])
+
+
+class DecryptedSecretCache:
+    """
+    Process-wide Cache of Decrypted Secrets keyed by Encrypted String, entries expire after TTL seconds
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__lock = threading.Lock()
+        self.__secrets = dict()
+
+    def get(self, encrypted_string: str) -> Union[str, None]:
+        with self.__lock:
+            cached_secret = self.__secrets.get(encrypted_string)
+            if cached_secret is None:
+                return None
+            secret, expires_at = cached_secret
+            if expires_at < time.monotonic():
+                del self.__secrets[encrypted_string]
+                return None
+            return secret
+
+    def set(self, encrypted_string: str, secret: str) -> None:
+        with self.__lock:
+            if len(self.__secrets) >= self.max_size:
+                # Evict Expired Secrets first, then the Oldest ones
+                now = time.monotonic()
+                for key in [key for key, (_, expires_at) in self.__secrets.items() if expires_at < now]:
+                    del self.__secrets[key]
+                while len(self.__secrets) >= self.max_size:
+                    del self.__secrets[next(iter(self.__secrets))]
+            self.__secrets[encrypted_string] = (secret, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__secrets.clear()
+
+
+decrypted_secret_cache = DecryptedSecretCache(ttl=int(getattr(settings, "DECRYPTED_SECRET_CACHE_TTL", 3600)),
+                                              max_size=int(getattr(settings, "DECRYPTED_SECRET_CACHE_SIZE", 50000)))
+
 
 class SecretEncryption:
 
     def __init__(self):
-        __passcode = bytes(getattr(settings, "PASSCODE", None), 'utf-8')
-        __kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=b"123456789", iterations=390000, )
-
-        __key = base64.urlsafe_b64encode(__kdf.derive(__passcode))
+        __passcode = getattr(settings, "PASSCODE", None)
+        __previous_passcodes = getattr(settings, "PREVIOUS_PASSCODES", [])
 
-        self.__suite = Fernet(__key)
+        self.__suite = get_fernet_suite(passcodes=(__passcode, *__previous_passcodes))
 
     def __encode_secret(self, string):
         __encoded = base64.b64encode(string.encode('utf-8'))
@@ -37,3 +104,40 @@ class SecretEncryption:
         __decrypted_token = (str(self.__suite.decrypt(encrypted_string)).split("'"))[1]
         __decoded_password = self.__decode_secret(string=__decrypted_token)
         return __decoded_password
+
+    def rotate_secret_string(self, encrypted_string: str):
+        """
+        Re-encrypt Secret String, encrypted by any of the previous passcodes, with the current passcode
+        """
+        __rotated = self.__suite.rotate(bytes(encrypted_string, 'utf-8'))
+        __rotated_password = str(__rotated).split("'")[1].strip()
+        return __rotated_password
+
+    def decrypt_many(self, encrypted_strings: Iterable[str], max_workers: int = None) -> List[Union[str, None]]:
+        """
+        Decrypt Multiple Secret Strings in one pass, optionally across a Thread Pool
+        Returns decrypted secrets in the order of encrypted strings, None for empty encrypted strings
+        """
+        encrypted_strings = list(encrypted_strings)
+        decrypted_secrets = dict()
+        encrypted_strings_to_decrypt = list()
+        for encrypted_string in dict.fromkeys(encrypted_strings):
+            if not encrypted_string:
+                continue
+            secret = decrypted_secret_cache.get(encrypted_string)
+            if secret is None:
+                encrypted_strings_to_decrypt.append(encrypted_string)
+            else:
+                decrypted_secrets[encrypted_string] = secret
+
+        if max_workers and max_workers > 1 and len(encrypted_strings_to_decrypt) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                secrets = list(executor.map(lambda string: self.decrypt_secret_string(encrypted_string=string),
+                                            encrypted_strings_to_decrypt))
+        else:
+            secrets = [self.decrypt_secret_string(encrypted_string=string) for string in encrypted_strings_to_decrypt]
+
+        for encrypted_string, secret in zip(encrypted_strings_to_decrypt, secrets):
+            decrypted_secret_cache.set(encrypted_string, secret)
+            decrypted_secrets[encrypted_string] = secret
+        return [decrypted_secrets.get(encrypted_string) for encrypted_string in encrypted_strings]
@@ -228,6 +228,24 @@ class CampaignReportDoesNotExist(CampaignException):
         return "{}: {}".format(self.message, self.item)
 
 
+@dataclass(frozen=True)
+class CampaignReportRefreshException(CampaignException):
+    message: str
+    item: dict
+
+    def __str__(self):
+        return "{}: {}".format(self.message, self.item)
+
+
+@dataclass(frozen=True)
+class MailPlacementScanException(CampaignException):
+    message: str
+    item: dict
+
+    def __str__(self):
+        return "{}: {}".format(self.message, self.item)
+
+
 @dataclass(frozen=True)
 class DomainListDoesNotExist(CampaignException):
     message: str
@@ -246,6 +264,15 @@ class DomainEmailCreationException(CampaignException):
         return "{}: {}".format(self.message, self.item)
 
 
+@dataclass(frozen=True)
+class WarmupSendDoesNotExist(CampaignException):
+    message: str
+    item: dict
+
+    def __str__(self):
+        return "{}: {}".format(self.message, self.item)
+
+
 # =================================================================================================
 # PAYMENT EXCEPTIONS
 # =================================================================================================